@@ -1821,17 +1821,48 @@
 #     print("📊 Features: Modern Dashboard + Simplified Processing")
     
 #     app.run(host=host, port=port, debug=False)
-from flask import Flask, request, jsonify, render_template_string, send_file
+from flask import Flask, Response, g, request, jsonify, send_file, stream_with_context
 import json
 from datetime import datetime
 import os
 import tempfile
+import time
 import io
 import base64
 from PIL import Image
 import pytesseract
 from docx import Document
 import re
+import queue
+import threading
+import uuid
+from image_admission import (
+    CLIENT_IMAGE_QUALITY, TARGET_IMAGE_PIXELS, ImageAdmission, estimate_archive_work, estimate_image_work,
+    estimate_document_work
+)
+from ocr_concurrency import OCRConcurrencyController
+from single_flight import SingleFlight, content_key
+from load_shedding import LoadShedder, RequestShed
+from job_store import JobStore
+from result_store import ResultStore
+from zip_stream import iter_zip_members
+from system_of_record import (create_system_hours_client, timesheet_week, normalize_consultant,
+                              SystemHoursBatcher, SystemOfRecordError)
+from consultant_roster import load_roster_from_config
+from excel_export import write_timesheet_workbook, EXCEL_MIMETYPE
+from export_cache import ExportCache, EXPORT_CACHE_VERSION
+from static_assets import StaticAssets
+from json_provider import FastJSONProvider, compress_response
+from stage_timings import StageTimings
+from structured_logging import configure_logging, correlation, correlation_id, debug_sampled, fields, get_logger, logging_status
+from metrics import (CHECK_ENTRIES, ENTRIES_PARSED, IMAGES_PER_DOCUMENT, OCR_SECONDS, metrics_response,
+                     track_requests)
+from stream_export import iter_csv, iter_ndjson, CSV_MIMETYPE, NDJSON_MIMETYPE
+from columnar_export import write_columnar_entries, COLUMNAR_FORMATS
+
+# JSON logs to stdout through a background writer (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE_RATE)
+configure_logging()
+log = get_logger('app')
 
 # Enhanced Tesseract configuration for different environments
 def configure_tesseract():
@@ -1839,7 +1870,7 @@ def configure_tesseract():
     import os
     import pytesseract
     
-    print("🔧 Configuring Tesseract OCR...")
+    log.info("Configuring Tesseract OCR")
     
     # Ubuntu/Linux environment (OpenShift)
     linux_paths = [
@@ -1851,12 +1882,12 @@ def configure_tesseract():
     for path in linux_paths:
         if os.path.exists(path):
             pytesseract.pytesseract.tesseract_cmd = path
-            print(f"✅ Tesseract found at {path}")
+            log.info("Tesseract found", extra=fields(path=path))
             
             # Test Tesseract functionality
             try:
                 version = pytesseract.get_tesseract_version()
-                print(f"✅ Tesseract version: {version}")
+                log.info("Tesseract version", extra=fields(version=str(version)))
                 
                 # Test tessdata path
                 tessdata_paths = [
@@ -1869,82 +1900,138 @@ def configure_tesseract():
                 for tessdata_path in tessdata_paths:
                     if os.path.exists(tessdata_path):
                         os.environ['TESSDATA_PREFIX'] = tessdata_path
-                        print(f"✅ Tessdata found at: {tessdata_path}")
+                        log.info("Tessdata found", extra=fields(path=tessdata_path))
                         break
                 
                 return True
                 
             except Exception as e:
-                print(f"❌ Tesseract test failed: {e}")
+                log.warning("Tesseract test failed", extra=fields(path=path, error=str(e)))
                 continue
                 
     # Windows environment (local development)
     windows_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
     if os.path.exists(windows_path):
         pytesseract.pytesseract.tesseract_cmd = windows_path
-        print("✅ Tesseract found at Windows path")
+        log.info("Tesseract found", extra=fields(path=windows_path))
         return True
     
-    print("⚠️ Tesseract not found - OCR functionality will be limited")
+    log.warning("Tesseract not found - OCR functionality will be limited")
     return False
 
 # Configure Tesseract at startup
 tesseract_available = configure_tesseract()
 
-app = Flask(__name__)
+# Size the OCR pool and Tesseract's OpenMP threads from the container CPU quota
+ocr_controller = OCRConcurrencyController().apply()
+
+# Turn away work that cannot finish within its latency objective
+load_shedder = LoadShedder(ocr_controller)
+
+app = Flask(__name__, static_folder=None)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024
+# orjson-backed jsonify, and gzip/brotli for large JSON responses
+app.json = FastJSONProvider(app)
+app.after_request(compress_response)
+# Request counts, latencies and upload bytes for /metrics
+track_requests(app)
+
+@app.before_request
+def assign_request_id():
+    """Correlate a request's log lines by the caller's X-Request-ID, or a fresh one"""
+    g.correlation_token = correlation_id.set(request.headers.get('X-Request-ID') or uuid.uuid4().hex[:16])
+
+@app.after_request
+def echo_request_id(response):
+    response.headers['X-Request-ID'] = correlation_id.get() or ''
+    return response
+
+@app.teardown_request
+def clear_request_id(exc):
+    # Worker threads are reused; don't let this ID tag the next thing they log
+    token = g.pop('correlation_token', None)
+    if token is not None:
+        correlation_id.reset(token)
+
+# Dashboard CSS/JS served from memory, precompressed and fingerprinted for long-lived caching
+static_assets = StaticAssets(app)
 
 class EnhancedTimesheetProcessor:
     def __init__(self):
         self.timesheet_data = []
         self.tesseract_available = tesseract_available
+        self.system_hours_client = create_system_hours_client()
+        self.roster = load_roster_from_config()
 
-    def extract_images_from_word_file(self, word_file_path):
-        """Extract images from Word document"""
+    def extract_images_from_word_file(self, word_file_path, admission=None, timings=None):
+        """Extract images from Word document, admitting each one by header before decoding"""
         images = []
+        if admission is None:
+            admission = ImageAdmission()
+        if timings is None:
+            timings = StageTimings()
         try:
-            doc = Document(word_file_path)
-            for rel in doc.part.rels.values():
+            with timings.stage('docx_extract'):
+                doc = Document(word_file_path)
+                rels = list(doc.part.rels.values())
+            for rel in rels:
                 if "image" in rel.target_ref:
                     try:
-                        image_data = rel.target_part.blob
-                        image = Image.open(io.BytesIO(image_data))
-                        if image.mode != 'RGB':
-                            image = image.convert('RGB')
-                        images.append(image)
+                        with timings.stage('docx_extract'):
+                            image_data = rel.target_part.blob
+                        with timings.stage('decode'):
+                            image = admission.admit(image_data, label=rel.target_ref)
+                        if image is not None:
+                            images.append(image)
                     except Exception as e:
-                        print(f"❌ Error processing image: {e}")
+                        log.warning("Error processing image", extra=fields(image=rel.target_ref, error=str(e)))
                         continue
         except Exception as e:
-            print(f"❌ Error with document: {e}")
+            log.error("Error with document", extra=fields(error=str(e)))
+        IMAGES_PER_DOCUMENT.observe(len(images))
         return images
 
     def extract_name_from_filename(self, filename):
         """Extract name from filename"""
         name = filename.replace('.docx', '').replace('.doc', '')
+        name = re.sub(r'\.(png|jpe?g|gif|bmp|tiff?|webp)$', '', name, flags=re.IGNORECASE)
         name = re.sub(r'-\d{4}', '', name)  # Remove year
         name = re.sub(r'[_-]', ' ', name)   # Replace underscores/dashes with spaces
         name = name.strip()
         return name if name else "Unknown"
 
-    def extract_text_from_image(self, image):
+    def extract_text_from_image(self, image, priority='interactive'):
         """Extract text using OCR with robust error handling and multiple configurations"""
+        return self.extract_text_with_confidence(image, priority)[0]
+
+    def extract_text_with_confidence(self, image, priority='interactive', timings=None):
+        """OCR an image; returns (text, estimated confidence 0-1 of the text kept).
+
+        priority is the scheduling class ('interactive' or 'batch'); each OCR attempt
+        takes its own slot so batch work yields to interactive work between attempts.
+        Time spent preprocessing, queued for a slot and in each OCR config is
+        recorded in `timings`.
+        """
         if not self.tesseract_available:
-            return "OCR_ERROR: Tesseract not available in this environment"
+            return "OCR_ERROR: Tesseract not available in this environment", 0.0
+        if timings is None:
+            timings = StageTimings()
             
         try:
-            print(f"🔍 OCR Debug: Image mode={image.mode}, size={image.size}")
+            log.debug("OCR image", extra=fields(mode=image.mode, size=image.size))
             
             # Verify Tesseract is working
             try:
-                version = pytesseract.get_tesseract_version()
-                print(f"✅ Tesseract version: {version}")
+                with timings.stage('ocr_version_check'):
+                    version = pytesseract.get_tesseract_version()
+                log.debug("Tesseract version", extra=fields(version=str(version)))
             except Exception as version_error:
-                print(f"❌ Tesseract version check failed: {version_error}")
-                return f"OCR_ERROR: Tesseract not accessible - {version_error}"
+                log.error("Tesseract version check failed", extra=fields(error=str(version_error)))
+                return f"OCR_ERROR: Tesseract not accessible - {version_error}", 0.0
             
             # Preprocess image for better OCR
-            processed_image = self.preprocess_image_for_ocr(image)
+            with timings.stage('preprocess'):
+                processed_image = self.preprocess_image_for_ocr(image)
             
             # Try multiple OCR configurations
             ocr_configs = [
@@ -1961,13 +2048,20 @@ class EnhancedTimesheetProcessor:
             
             for config in ocr_configs:
                 try:
-                    print(f"🔍 Trying OCR config: {config}")
-                    text = pytesseract.image_to_string(processed_image, config=config)
+                    debug_sampled(log, "Trying OCR config", config=config)
+                    queued = ocr_controller.thread_wait_seconds()
+                    with ocr_controller.slot(priority):
+                        timings.record('ocr_queue_wait', ocr_controller.thread_wait_seconds() - queued)
+                        started = time.perf_counter()
+                        text = pytesseract.image_to_string(processed_image, config=config)
+                        elapsed = time.perf_counter() - started
+                    timings.record(f"ocr[{config}]", elapsed)
+                    OCR_SECONDS.labels(config=config).observe(elapsed)
                     
                     if text and text.strip():
                         # Simple confidence estimation based on text quality
                         confidence = self.estimate_text_confidence(text)
-                        print(f"✅ OCR extracted {len(text)} chars with estimated confidence: {confidence}")
+                        debug_sampled(log, "OCR attempt", config=config, chars=len(text), confidence=confidence)
                         
                         if confidence > best_confidence:
                             best_text = text
@@ -1978,20 +2072,26 @@ class EnhancedTimesheetProcessor:
                             break
                             
                 except Exception as config_error:
-                    print(f"❌ OCR config {config} failed: {config_error}")
+                    log.warning("OCR config failed", extra=fields(config=config, error=str(config_error)))
                     continue
             
             if best_text and best_text.strip():
-                print(f"✅ OCR Success: Best text with confidence {best_confidence}")
-                return best_text
+                log.debug("OCR success", extra=fields(confidence=best_confidence))
+                return best_text, best_confidence
             else:
-                print("⚠️ OCR Warning: No readable text found in image")
-                return "OCR_WARNING: No readable text found in image"
+                log.warning("OCR found no readable text in image")
+                return "OCR_WARNING: No readable text found in image", 0.0
                 
         except Exception as e:
             error_msg = f"OCR_ERROR: {str(e)}"
-            print(f"❌ OCR Failed: {error_msg}")
-            return error_msg
+            log.error("OCR failed", extra=fields(error=str(e)))
+            return error_msg, 0.0
+
+    def tag_confidence(self, entries, confidence):
+        """Record the OCR confidence of the image each entry was read from"""
+        for entry in entries:
+            entry['confidence'] = round(confidence, 3)
+        return entries
 
     def preprocess_image_for_ocr(self, image):
         """Preprocess image to improve OCR accuracy"""
@@ -2007,12 +2107,12 @@ class EnhancedTimesheetProcessor:
                 new_width = int(width * scale_factor)
                 new_height = int(height * scale_factor)
                 image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                print(f"🔍 Resized image to {new_width}x{new_height} for better OCR")
+                log.debug("Resized image for OCR", extra=fields(width=new_width, height=new_height))
             
             return image
             
         except Exception as e:
-            print(f"❌ Image preprocessing failed: {e}")
+            log.warning("Image preprocessing failed", extra=fields(error=str(e)))
             return image  # Return original if preprocessing fails
 
     def estimate_text_confidence(self, text):
@@ -2037,12 +2137,11 @@ class EnhancedTimesheetProcessor:
         """Parse timesheet entries from text with enhanced error handling"""
         entries = []
         if not text or text.startswith("OCR_ERROR") or text.startswith("OCR_WARNING"):
-            print(f"⚠️ Skipping parsing due to OCR issue: {text[:50]}...")
+            log.warning("Skipping parsing due to OCR issue", extra=fields(text=text[:50]))
             return entries
             
-        print(f"🔍 Parsing text for {employee_name}: {len(text)} characters")
+        log.debug("Parsing text", extra=fields(consultant=employee_name, chars=len(text)))
         lines = [line.strip() for line in text.split('\n') if line.strip()]
-        print(f"🔍 Found {len(lines)} non-empty lines")
         
         for i, line in enumerate(lines):
             try:
@@ -2062,7 +2161,7 @@ class EnhancedTimesheetProcessor:
                 
                 if date_match:
                     date = date_match.group(1)
-                    print(f"🔍 Found date in line {i}: {date}")
+                    debug_sampled(log, "Found date", line=i, date=date)
                     
                     # Format date properly
                     try:
@@ -2113,11 +2212,11 @@ class EnhancedTimesheetProcessor:
                                     'Hours': hours
                                 }
                                 entries.append(entry)
-                                print(f"✅ Added entry: {formatted_date} - {hours} hours")
+                                debug_sampled(log, "Added entry", date=formatted_date, hours=hours)
                             else:
-                                print(f"⚠️ Invalid hours value: {hours}")
+                                debug_sampled(log, "Invalid hours value", line=i, hours=hours)
                         except ValueError as e:
-                            print(f"❌ Error parsing hours: {e}")
+                            log.warning("Error parsing hours", extra=fields(line=i, error=str(e)))
                     else:
                         # Create entry with CHECK status for manual review
                         entry = {
@@ -2126,1327 +2225,176 @@ class EnhancedTimesheetProcessor:
                             'Hours': "CHECK"
                         }
                         entries.append(entry)
-                        print(f"⚠️ Added CHECK entry for: {formatted_date}")
+                        debug_sampled(log, "Added CHECK entry", date=formatted_date)
                         
             except Exception as e:
-                print(f"❌ Error parsing line {i}: {e}")
+                log.warning("Error parsing line", extra=fields(line=i, error=str(e)))
                 continue
         
-        print(f"✅ Parsed {len(entries)} total entries")
+        log.debug("Parsed entries", extra=fields(lines=len(lines), entries=len(entries)))
+        ENTRIES_PARSED.inc(len(entries))
+        CHECK_ENTRIES.inc(sum(1 for entry in entries if entry['Hours'] == "CHECK"))
         return entries
 
-    def process_screenshot_from_bytes(self, image_bytes, consultant_name):
-        """Process screenshot from bytes with enhanced error handling"""
+    def process_screenshot_from_bytes(self, image_bytes, consultant_name, admission=None, priority='interactive',
+                                      timings=None, check_hours=True):
+        """Process screenshot from bytes with enhanced error handling.
+
+        Batch callers pass check_hours=False and look system hours up for the
+        whole job at once (see apply_system_hours).
+        """
+        if admission is None:
+            admission = ImageAdmission()
+        if timings is None:
+            timings = StageTimings()
         try:
-            print(f"🔍 Processing screenshot for: {consultant_name}")
-            print(f"🔍 Image size: {len(image_bytes)} bytes")
-            
-            # Load and process image
-            image = Image.open(io.BytesIO(image_bytes))
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            print(f"🔍 Image loaded: {image.size}, mode: {image.mode}")
+            consultant_name, consultant_match = self.resolve_consultant(consultant_name)
+            log.debug("Processing screenshot", extra=fields(consultant=consultant_name, bytes=len(image_bytes)))
+            
+            # Admit by header, then decode (downsampled if oversized)
+            with timings.stage('decode'):
+                image = admission.admit(image_bytes, label='screenshot')
+            if image is None:
+                return {
+                    'error': admission.rejections[-1]['reason'],
+                    'status': 'rejected',
+                    'admission': admission.summary(),
+                    'tesseract_available': self.tesseract_available,
+                    'timings': timings.summary()
+                }
+            log.debug("Image loaded", extra=fields(size=image.size, mode=image.mode))
             
             # Extract text using OCR
-            print("🔍 Starting OCR extraction...")
-            text = self.extract_text_from_image(image)
-            print(f"🔍 OCR completed, text length: {len(text) if text else 0}")
+            text, confidence = self.extract_text_with_confidence(image, priority, timings)
+            log.debug("OCR completed", extra=fields(text_length=len(text) if text else 0))
             
             # Parse timesheet entries
-            print("🔍 Starting timesheet parsing...")
-            entries = self.parse_timesheet_entries(text, consultant_name)
+            with timings.stage('parse'):
+                entries = self.tag_confidence(self.parse_timesheet_entries(text, consultant_name), confidence)
             
             # Calculate total hours
             total_hours = sum(entry['Hours'] for entry in entries 
                             if isinstance(entry['Hours'], (int, float)))
             
-            # Simulate system check
-            system_hours = self.simulate_system_check(consultant_name)
+            # Check against the system of record
+            system_hours = None
+            if check_hours:
+                with timings.stage('system_check'):
+                    system_hours = self.check_system_hours(consultant_name, entries)
             
             result = {
                 'consultant_name': consultant_name,
+                'consultant_match': consultant_match,
                 'total_entries': len(entries),
                 'screenshot_hours': total_hours,
+                'week': timesheet_week(entries),
                 'system_hours': system_hours,
-                'discrepancy_detected': total_hours != system_hours,
+                'discrepancy_detected': system_hours is not None and total_hours != system_hours,
                 'entries': entries,
                 'ocr_text_length': len(text) if text else 0,
                 'tesseract_available': self.tesseract_available,
-                'status': 'success'
+                'admission': admission.summary(),
+                'status': 'success',
+                'timings': timings.summary()
             }
             
-            print(f"✅ Processing complete: {len(entries)} entries, {total_hours} hours")
+            log.info("Screenshot processed", extra=fields(consultant=consultant_name, entries=len(entries), hours=total_hours))
             return result
             
         except Exception as e:
             error_result = {
                 'error': str(e), 
                 'status': 'error',
-                'tesseract_available': self.tesseract_available
+                'tesseract_available': self.tesseract_available,
+                'timings': timings.summary()
             }
-            print(f"❌ Screenshot processing failed: {e}")
+            log.error("Screenshot processing failed", extra=fields(error=str(e)))
             return error_result
 
-    def simulate_system_check(self, consultant_name):
-        """Simulate system lookup"""
-        demo_data = {
-            'john smith': 38,
-            'jane doe': 40,
-            'mike johnson': 35,
-            'sarah wilson': 40,
-            'alex chen': 38
-        }
-        return demo_data.get(consultant_name.lower().strip(), 40)
+    def resolve_consultant(self, consultant_name):
+        """Roster name for a raw (filename-derived) name; returns (name_to_use, match or None)"""
+        if self.roster is None or not consultant_name:
+            return consultant_name, None
+        match = self.roster.resolve(consultant_name)
+        if match and match['matched']:
+            return match['matched'], match
+        return consultant_name, match
+
+    def check_system_hours(self, consultant_name, entries=None):
+        """Billed hours for the consultant in the week of `entries`, or None if unknown/unavailable"""
+        try:
+            return self.system_hours_client.get_hours(consultant_name, timesheet_week(entries or []))
+        except SystemOfRecordError as e:
+            log.warning("System of record lookup failed", extra=fields(consultant=consultant_name, error=str(e)))
+            return None
 
 # Create processor instance
 processor = EnhancedTimesheetProcessor()
 
+# Coalesces concurrent identical uploads onto one in-flight computation
+single_flight = SingleFlight()
+
+# Checkpoints bulk jobs so interrupted or resubmitted batches resume where they stopped
+job_store = JobStore()
+
+# Finished results, kept for a while so exports can be generated by ID instead of re-posting them
+result_store = ResultStore()
+
+# Generated export files, so repeat downloads of the same result are served from disk
+export_cache = ExportCache()
+
+def retain_result(result_id, kind, result):
+    """Store an exportable result (one with entries) under `result_id` and tag it with that ID"""
+    if 'entries' in result:
+        result['result_id'] = result_id
+        result_store.save(result_id, result, kind)
+    return result
+
+def shed_response(decision):
+    """Fast 429/503 with a Retry-After hint for a shed request"""
+    response = jsonify(decision.to_dict())
+    response.status_code = decision.status_code
+    response.headers['Retry-After'] = str(decision.retry_after)
+    return response
+
+def warmup_ocr():
+    """Run a tiny OCR so Tesseract binaries and language data are hot before real traffic"""
+    if not processor.tesseract_available:
+        log.warning("Skipping OCR warmup - Tesseract not available")
+        return False
+    try:
+        from PIL import ImageDraw
+        image = Image.new('RGB', (200, 40), 'white')
+        ImageDraw.Draw(image).text((5, 10), "12/01/2024 8h", fill='black')
+        pytesseract.image_to_string(image, config=r'--oem 3 --psm 7')
+        log.info("OCR warmup complete")
+        return True
+    except Exception as e:
+        log.warning("OCR warmup failed", extra=fields(error=str(e)))
+        return False
+
 @app.route('/')
 def dashboard():
-    return render_template_string('''
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>TimeVerify AI Dashboard</title>
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-                background: #f8f9fc;
-                color: #1e1e2e;
-                overflow-x: hidden;
-            }
-            
-            .sidebar {
-                position: fixed;
-                left: 0;
-                top: 0;
-                width: 260px;
-                height: 100vh;
-                background: #ffffff;
-                border-right: 1px solid #e3e6f0;
-                z-index: 1000;
-                transition: transform 0.3s ease;
-            }
-            
-            .sidebar-header {
-                padding: 24px 20px;
-                border-bottom: 1px solid #e3e6f0;
-                display: flex;
-                align-items: center;
-                gap: 12px;
-            }
-            
-            .logo {
-                width: 36px;
-                height: 36px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                border-radius: 8px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-size: 18px;
-                font-weight: bold;
-            }
-            
-            .logo-text {
-                font-size: 20px;
-                font-weight: 600;
-                color: #1e1e2e;
-            }
-            
-            .nav-menu {
-                padding: 20px 0;
-            }
-            
-            .nav-item {
-                display: flex;
-                align-items: center;
-                padding: 12px 20px;
-                color: #8b949e;
-                text-decoration: none;
-                transition: all 0.2s ease;
-                border-left: 3px solid transparent;
-            }
-            
-            .nav-item:hover, .nav-item.active {
-                color: #667eea;
-                background: #f8f9ff;
-                border-left-color: #667eea;
-            }
-            
-            .nav-item i {
-                width: 20px;
-                margin-right: 12px;
-                font-size: 16px;
-            }
-            
-            .main-content {
-                margin-left: 260px;
-                min-height: 100vh;
-            }
-            
-            .header {
-                background: white;
-                padding: 20px 32px;
-                border-bottom: 1px solid #e3e6f0;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            
-            .header h1 {
-                font-size: 28px;
-                font-weight: 600;
-                color: #1e1e2e;
-            }
-            
-            .user-info {
-                display: flex;
-                align-items: center;
-                gap: 12px;
-                color: #8b949e;
-            }
-            
-            .dashboard-grid {
-                padding: 32px;
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
-                gap: 24px;
-            }
-            
-            .stats-row {
-                grid-column: 1 / -1;
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
-                gap: 24px;
-                margin-bottom: 8px;
-            }
-            
-            .stat-card {
-                background: white;
-                border-radius: 12px;
-                padding: 24px;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                position: relative;
-                overflow: hidden;
-            }
-            
-            .stat-card::before {
-                content: '';
-                position: absolute;
-                top: 0;
-                left: 0;
-                right: 0;
-                height: 4px;
-            }
-            
-            .stat-card.processed::before { background: linear-gradient(90deg, #4facfe, #00f2fe); }
-            .stat-card.hours::before { background: linear-gradient(90deg, #43e97b, #38f9d7); }
-            .stat-card.accuracy::before { background: linear-gradient(90deg, #fa709a, #fee140); }
-            .stat-card.savings::before { background: linear-gradient(90deg, #a8edea, #fed6e3); }
-            
-            .stat-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: flex-start;
-                margin-bottom: 16px;
-            }
-            
-            .stat-title {
-                font-size: 14px;
-                color: #8b949e;
-                font-weight: 500;
-            }
-            
-            .stat-icon {
-                width: 40px;
-                height: 40px;
-                border-radius: 8px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 18px;
-                color: white;
-            }
-            
-            .stat-icon.processed { background: linear-gradient(135deg, #4facfe, #00f2fe); }
-            .stat-icon.hours { background: linear-gradient(135deg, #43e97b, #38f9d7); }
-            .stat-icon.accuracy { background: linear-gradient(135deg, #fa709a, #fee140); }
-            .stat-icon.savings { background: linear-gradient(135deg, #a8edea, #fed6e3); }
-            
-            .stat-value {
-                font-size: 32px;
-                font-weight: 700;
-                color: #1e1e2e;
-                margin-bottom: 8px;
-            }
-            
-            .stat-change {
-                font-size: 12px;
-                color: #22c55e;
-                display: flex;
-                align-items: center;
-                gap: 4px;
-            }
-            
-            .upload-card {
-                background: white;
-                border-radius: 12px;
-                padding: 32px;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                text-align: center;
-                border: 2px dashed #e3e6f0;
-                transition: all 0.3s ease;
-            }
-            
-            .upload-card:hover {
-                border-color: #667eea;
-                background: #f8f9ff;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(102, 126, 234, 0.15);
-            }
-            
-            .upload-area {
-                border: 2px dashed #d1d5db;
-                border-radius: 8px;
-                padding: 24px;
-                margin-bottom: 20px;
-                cursor: pointer;
-                transition: all 0.3s ease;
-                background: #f9fafb;
-            }
-            
-            .upload-area:hover {
-                border-color: #667eea;
-                background: #f0f4ff;
-            }
-            
-            .upload-area.dragover {
-                border-color: #667eea;
-                background: #e0e7ff;
-                transform: scale(1.02);
-            }
-            
-            .upload-icon {
-                width: 64px;
-                height: 64px;
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                border-radius: 16px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-size: 28px;
-                margin: 0 auto 20px;
-            }
-            
-            .upload-title {
-                font-size: 20px;
-                font-weight: 600;
-                color: #1e1e2e;
-                margin-bottom: 8px;
-            }
-            
-            .upload-subtitle {
-                color: #8b949e;
-                margin-bottom: 24px;
-            }
-            
-            .file-input {
-                display: none;
-            }
-            
-            .input-group {
-                margin: 16px 0;
-                text-align: left;
-            }
-            
-            .input-group input {
-                width: 100%;
-                padding: 12px 16px;
-                border: 2px solid #e3e6f0;
-                border-radius: 8px;
-                font-size: 14px;
-                transition: border-color 0.2s ease;
-            }
-            
-            .input-group input:focus {
-                outline: none;
-                border-color: #667eea;
-            }
-            
-            .btn {
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: 500;
-                cursor: pointer;
-                transition: all 0.2s ease;
-                display: inline-flex;
-                align-items: center;
-                gap: 8px;
-            }
-            
-            .btn:hover {
-                transform: translateY(-1px);
-                box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3);
-            }
-            
-            .btn-secondary {
-                background: linear-gradient(135deg, #f093fb, #f5576c);
-            }
-            
-            .processing-card {
-                background: white;
-                border-radius: 12px;
-                padding: 24px;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                display: none;
-                grid-column: 1 / -1;
-            }
-            
-            .processing-header {
-                display: flex;
-                align-items: center;
-                gap: 12px;
-                margin-bottom: 20px;
-            }
-            
-            .spinner {
-                width: 20px;
-                height: 20px;
-                border: 2px solid #e3e6f0;
-                border-top: 2px solid #667eea;
-                border-radius: 50%;
-                animation: spin 1s linear infinite;
-            }
-            
-            @keyframes spin {
-                0% { transform: rotate(0deg); }
-                100% { transform: rotate(360deg); }
-            }
-            
-            .processing-steps {
-                background: #f8f9fc;
-                border-radius: 8px;
-                padding: 16px;
-                margin-top: 16px;
-            }
-            
-            .processing-step {
-                display: flex;
-                align-items: center;
-                padding: 8px 0;
-                color: #8b949e;
-                font-size: 14px;
-                border-bottom: 1px solid #e3e6f0;
-            }
-            
-            .processing-step:last-child {
-                border-bottom: none;
-            }
-            
-            .processing-step.active {
-                color: #667eea;
-                font-weight: 500;
-            }
-            
-            .processing-step.completed {
-                color: #22c55e;
-            }
-            
-            .processing-step i {
-                width: 20px;
-                margin-right: 8px;
-            }
-            
-            .results-card {
-                background: white;
-                border-radius: 12px;
-                padding: 24px;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                display: none;
-                grid-column: 1 / -1;
-            }
-            
-            .results-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 24px;
-            }
-            
-            .results-title {
-                font-size: 18px;
-                font-weight: 600;
-                color: #1e1e2e;
-            }
-            
-            .download-buttons {
-                display: flex;
-                gap: 8px;
-            }
-            
-            .btn-small {
-                padding: 8px 16px;
-                font-size: 12px;
-            }
-            
-            .status-badge {
-                display: inline-flex;
-                align-items: center;
-                gap: 6px;
-                padding: 6px 12px;
-                border-radius: 6px;
-                font-size: 12px;
-                font-weight: 500;
-            }
-            
-            .status-success {
-                background: #dcfce7;
-                color: #16a34a;
-            }
-            
-            .status-warning {
-                background: #fef3c7;
-                color: #d97706;
-            }
-            
-            .results-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 16px;
-                margin: 20px 0;
-            }
-            
-            .result-metric {
-                text-align: center;
-                padding: 16px;
-                background: #f8f9fc;
-                border-radius: 8px;
-            }
-            
-            .result-value {
-                font-size: 24px;
-                font-weight: 700;
-                color: #1e1e2e;
-            }
-            
-            .result-label {
-                font-size: 12px;
-                color: #8b949e;
-                margin-top: 4px;
-            }
-            
-            /* Separate table section */
-            .table-section {
-                background: white;
-                border-radius: 12px;
-                padding: 24px;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                margin: 32px;
-                display: none;
-            }
-            
-            .table-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 20px;
-                padding-bottom: 16px;
-                border-bottom: 2px solid #e3e6f0;
-            }
-            
-            .table-title {
-                font-size: 20px;
-                font-weight: 600;
-                color: #1e1e2e;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            
-            .data-table {
-                background: #f8f9fc;
-                border-radius: 8px;
-                padding: 16px;
-                max-height: 400px;
-                overflow-y: auto;
-            }
-            
-            .data-table table {
-                width: 100%;
-                border-collapse: collapse;
-                font-size: 13px;
-            }
-            
-            .data-table th {
-                background: #667eea;
-                color: white;
-                padding: 12px 8px;
-                text-align: left;
-                font-weight: 600;
-                border: 1px solid #5a6fd8;
-                position: sticky;
-                top: 0;
-                z-index: 10;
-            }
-            
-            .data-table td {
-                padding: 10px 8px;
-                border: 1px solid #e3e6f0;
-                background: white;
-            }
-            
-            .data-table tr:hover td {
-                background: #f8f9ff;
-            }
-            
-            .check-value {
-                color: #dc3545;
-                font-weight: bold;
-                background: #ffe6e6 !important;
-            }
-            
-            .table-stats {
-                margin-top: 16px;
-                padding: 12px;
-                background: #f0f4ff;
-                border-radius: 6px;
-                font-size: 12px;
-                color: #667eea;
-                display: flex;
-                justify-content: space-between;
-                flex-wrap: wrap;
-                gap: 16px;
-            }
-            
-            .table-stat {
-                display: flex;
-                align-items: center;
-                gap: 4px;
-            }
-            
-            @media (max-width: 768px) {
-                .sidebar {
-                    transform: translateX(-100%);
-                }
-                
-                .main-content {
-                    margin-left: 0;
-                }
-                
-                .dashboard-grid {
-                    padding: 16px;
-                    grid-template-columns: 1fr;
-                }
-                
-                .stats-row {
-                    grid-template-columns: 1fr;
-                }
-                
-                .table-section {
-                    margin: 16px;
-                }
-            }
-        </style>
-    </head>
-    <body>
-        <div class="sidebar">
-            <div class="sidebar-header">
-                <div class="logo">T</div>
-                <div class="logo-text">TimeVerify</div>
-            </div>
-            <nav class="nav-menu">
-                <a href="#" class="nav-item active">
-                    <i class="fas fa-chart-line"></i>
-                    Dashboard
-                </a>
-                <a href="#" class="nav-item">
-                    <i class="fas fa-upload"></i>
-                    Upload
-                </a>
-                <a href="#" class="nav-item">
-                    <i class="fas fa-file-alt"></i>
-                    Reports
-                </a>
-                <a href="#" class="nav-item">
-                    <i class="fas fa-cog"></i>
-                    Settings
-                </a>
-            </nav>
-        </div>
-        
-        <div class="main-content">
-            <div class="header">
-                <h1>Dashboard</h1>
-                <div class="user-info">
-                    <span>Last updated: <span id="lastUpdate">Never</span></span>
-                    <div style="width: 2px; height: 20px; background: #e3e6f0;"></div>
-                    <i class="fas fa-user-circle" style="font-size: 24px; color: #667eea;"></i>
-                </div>
-            </div>
-            
-            <div class="dashboard-grid">
-                <div class="stats-row">
-                    <div class="stat-card processed">
-                        <div class="stat-header">
-                            <div class="stat-title">Documents Processed</div>
-                            <div class="stat-icon processed">
-                                <i class="fas fa-file-check"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value" id="processedCount">0</div>
-                        <div class="stat-change">
-                            <i class="fas fa-arrow-up"></i>
-                            <span>Today</span>
-                        </div>
-                    </div>
-                    
-                    <div class="stat-card hours">
-                        <div class="stat-header">
-                            <div class="stat-title">Hours Extracted</div>
-                            <div class="stat-icon hours">
-                                <i class="fas fa-clock"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value" id="hoursCount">0</div>
-                        <div class="stat-change">
-                            <i class="fas fa-arrow-up"></i>
-                            <span>This session</span>
-                        </div>
-                    </div>
-                    
-                    <div class="stat-card accuracy">
-                        <div class="stat-header">
-                            <div class="stat-title">Accuracy Rate</div>
-                            <div class="stat-icon accuracy">
-                                <i class="fas fa-bullseye"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value">95%</div>
-                        <div class="stat-change">
-                            <i class="fas fa-arrow-up"></i>
-                            <span>OCR Quality</span>
-                        </div>
-                    </div>
-                    
-                    <div class="stat-card savings">
-                        <div class="stat-header">
-                            <div class="stat-title">Time Savings</div>
-                            <div class="stat-icon savings">
-                                <i class="fas fa-stopwatch"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value" id="timeSaved">0min</div>
-                        <div class="stat-change">
-                            <i class="fas fa-arrow-up"></i>
-                            <span>vs Manual</span>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="upload-card">
-                    <div class="upload-icon">
-                        <i class="fas fa-camera"></i>
-                    </div>
-                    <div class="upload-title">Upload Screenshot</div>
-                    <div class="upload-subtitle">PNG, JPG files supported</div>
-                    <form id="screenshotForm" enctype="multipart/form-data">
-                        <div class="upload-area" onclick="document.getElementById('screenshotFile').click()">
-                            <i class="fas fa-cloud-upload-alt" style="font-size: 24px; color: #667eea; margin-bottom: 8px;"></i>
-                            <p style="margin: 0; color: #6b7280;">Click to select file or drag & drop</p>
-                            <p id="screenshotFileName" style="margin: 8px 0 0 0; font-size: 12px; color: #667eea; font-weight: 500;"></p>
-                        </div>
-                        <input type="file" id="screenshotFile" name="screenshot" accept="image/*" class="file-input" required>
-                        <div class="input-group">
-                            <input type="text" name="consultant_name" placeholder="Consultant Name" required onclick="event.stopPropagation();">
-                        </div>
-                        <button type="submit" class="btn">
-                            <i class="fas fa-upload"></i>
-                            Process Screenshot
-                        </button>
-                    </form>
-                </div>
-                
-                <div class="upload-card">
-                    <div class="upload-icon">
-                        <i class="fas fa-file-word"></i>
-                    </div>
-                    <div class="upload-title">Upload Document</div>
-                    <div class="upload-subtitle">DOCX, DOC files supported</div>
-                    <form id="documentForm" enctype="multipart/form-data">
-                        <div class="upload-area" onclick="document.getElementById('documentFile').click()">
-                            <i class="fas fa-file-upload" style="font-size: 24px; color: #667eea; margin-bottom: 8px;"></i>
-                            <p style="margin: 0; color: #6b7280;">Click to select file or drag & drop</p>
-                            <p id="documentFileName" style="margin: 8px 0 0 0; font-size: 12px; color: #667eea; font-weight: 500;"></p>
-                        </div>
-                        <input type="file" id="documentFile" name="document" accept=".docx,.doc" class="file-input" required>
-                        <div class="input-group">
-                            <input type="text" name="consultant_name" placeholder="Consultant Name (optional)" onclick="event.stopPropagation();">
-                        </div>
-                        <button type="submit" class="btn btn-secondary">
-                            <i class="fas fa-file-upload"></i>
-                            Extract & Process
-                        </button>
-                    </form>
-                </div>
-                
-                <div class="upload-card">
-                    <div class="upload-icon">
-                        <i class="fas fa-folder-open"></i>
-                    </div>
-                    <div class="upload-title">Bulk Upload</div>
-                    <div class="upload-subtitle">Multiple DOCX files at once</div>
-                    <form id="bulkForm" enctype="multipart/form-data">
-                        <div class="upload-area" onclick="document.getElementById('bulkFiles').click()">
-                            <i class="fas fa-files" style="font-size: 24px; color: #667eea; margin-bottom: 8px;"></i>
-                            <p style="margin: 0; color: #6b7280;">Select multiple documents</p>
-                            <p id="bulkFileName" style="margin: 8px 0 0 0; font-size: 12px; color: #667eea; font-weight: 500;"></p>
-                        </div>
-                        <input type="file" id="bulkFiles" name="documents" accept=".docx,.doc" class="file-input" multiple required>
-                        <button type="submit" class="btn" style="background: linear-gradient(135deg, #43e97b, #38f9d7);">
-                            <i class="fas fa-cogs"></i>
-                            Process All Documents
-                        </button>
-                    </form>
-                </div>
-                
-                <div class="processing-card" id="processingCard">
-                    <div class="processing-header">
-                        <div class="spinner"></div>
-                        <span id="processingTitle">Processing your request...</span>
-                    </div>
-                    <div class="processing-steps">
-                        <div class="processing-step" id="step1">
-                            <i class="fas fa-circle-notch"></i>
-                            <span id="step1Text">Initializing...</span>
-                        </div>
-                        <div class="processing-step" id="step2">
-                            <i class="fas fa-circle-notch"></i>
-                            <span id="step2Text">Waiting...</span>
-                        </div>
-                        <div class="processing-step" id="step3">
-                            <i class="fas fa-circle-notch"></i>
-                            <span id="step3Text">Waiting...</span>
-                        </div>
-                        <div class="processing-step" id="step4">
-                            <i class="fas fa-circle-notch"></i>
-                            <span id="step4Text">Waiting...</span>
-                        </div>
-                        <div class="processing-step" id="step5">
-                            <i class="fas fa-circle-notch"></i>
-                            <span id="step5Text">Waiting...</span>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="results-card" id="resultsCard">
-                    <div class="results-header">
-                        <div class="results-title">Processing Results</div>
-                        <div class="download-buttons">
-                            <button onclick="downloadData('excel')" class="btn btn-small">
-                                <i class="fas fa-file-excel"></i>
-                                Excel
-                            </button>
-                            <button onclick="downloadData('json')" class="btn btn-small btn-secondary">
-                                <i class="fas fa-download"></i>
-                                JSON
-                            </button>
-                        </div>
-                    </div>
-                    <div id="resultsStatus"></div>
-                    <div class="results-grid" id="resultsMetrics"></div>
-                </div>
-            </div>
-            
-            <!-- Separate Table Section -->
-            <div class="table-section" id="tableSection">
-                <div class="table-header">
-                    <div class="table-title">
-                        <i class="fas fa-table"></i>
-                        Extracted Timesheet Data
-                    </div>
-                    <div class="download-buttons">
-                        <button onclick="downloadData('excel')" class="btn btn-small">
-                            <i class="fas fa-file-excel"></i>
-                            Export Excel
-                        </button>
-                        <button onclick="downloadData('json')" class="btn btn-small btn-secondary">
-                            <i class="fas fa-download"></i>
-                            Export JSON
-                        </button>
-                    </div>
-                </div>
-                <div class="data-table" id="dataTable"></div>
-            </div>
-        </div>
-        
-        <script>
-            let currentResults = null;
-            let sessionStats = {
-                processed: 0,
-                hours: 0,
-                timeSaved: 0
-            };
-            
-            // Form handlers
-            document.getElementById('screenshotForm').onsubmit = async function(e) {
-                e.preventDefault();
-                const fileName = document.getElementById('screenshotFile').files[0]?.name || 'screenshot';
-                await processForm(this, '/api/process-screenshot', fileName);
-            };
-            
-            document.getElementById('documentForm').onsubmit = async function(e) {
-                e.preventDefault();
-                const fileName = document.getElementById('documentFile').files[0]?.name || 'document';
-                await processForm(this, '/api/process-document', fileName);
-            };
-            
-            document.getElementById('bulkForm').onsubmit = async function(e) {
-                e.preventDefault();
-                const files = document.getElementById('bulkFiles').files;
-                const fileNames = Array.from(files).map(f => f.name);
-                await processForm(this, '/api/process-bulk', fileNames);
-            };
-            
-            // File input handlers with filename display
-            document.getElementById('screenshotFile').onchange = function() {
-                const fileName = this.files[0] ? this.files[0].name : '';
-                document.getElementById('screenshotFileName').textContent = fileName ? `Selected: ${fileName}` : '';
-            };
-            
-            document.getElementById('documentFile').onchange = function() {
-                const fileName = this.files[0] ? this.files[0].name : '';
-                document.getElementById('documentFileName').textContent = fileName ? `Selected: ${fileName}` : '';
-            };
-            
-            document.getElementById('bulkFiles').onchange = function() {
-                const fileCount = this.files.length;
-                if (fileCount > 0) {
-                    document.getElementById('bulkFileName').textContent = `Selected: ${fileCount} file(s)`;
-                } else {
-                    document.getElementById('bulkFileName').textContent = '';
-                }
-            };
-            
-            // Enhanced drag and drop functionality
-            setupDragAndDrop('screenshotFile', document.querySelector('#screenshotForm .upload-area'));
-            setupDragAndDrop('documentFile', document.querySelector('#documentForm .upload-area'));
-            setupDragAndDrop('bulkFiles', document.querySelector('#bulkForm .upload-area'));
-            
-            function setupDragAndDrop(inputId, dropArea) {
-                const input = document.getElementById(inputId);
-                
-                ['dragenter', 'dragover', 'dragleave', 'drop'].forEach(eventName => {
-                    dropArea.addEventListener(eventName, preventDefaults, false);
-                });
-                
-                function preventDefaults(e) {
-                    e.preventDefault();
-                    e.stopPropagation();
-                }
-                
-                ['dragenter', 'dragover'].forEach(eventName => {
-                    dropArea.addEventListener(eventName, () => dropArea.classList.add('dragover'), false);
-                });
-                
-                ['dragleave', 'drop'].forEach(eventName => {
-                    dropArea.addEventListener(eventName, () => dropArea.classList.remove('dragover'), false);
-                });
-                
-                dropArea.addEventListener('drop', function(e) {
-                    const files = e.dataTransfer.files;
-                    if (files.length > 0) {
-                        input.files = files;
-                        input.dispatchEvent(new Event('change'));
-                    }
-                });
-            }
-            
-            async function processForm(form, endpoint, fileNames) {
-                showProcessing(fileNames);
-                
-                try {
-                    const formData = new FormData(form);
-                    const response = await fetch(endpoint, {
-                        method: 'POST',
-                        body: formData
-                    });
-                    
-                    const result = await response.json();
-                    
-                    if (result.error) {
-                        throw new Error(result.error);
-                    }
-                    
-                    currentResults = result;
-                    updateSessionStats(result);
-                    showResults(result);
-                    showTable(result);
-                    updateLastUpdated();
-                    
-                } catch (error) {
-                    showError(error.message);
-                } finally {
-                    hideProcessing();
-                }
-            }
-            
-            function showProcessing(fileNames) {
-                document.getElementById('processingCard').style.display = 'block';
-                document.getElementById('resultsCard').style.display = 'none';
-                document.getElementById('tableSection').style.display = 'none';
-                
-                // Reset all steps
-                for (let i = 1; i <= 5; i++) {
-                    const step = document.getElementById(`step${i}`);
-                    step.className = 'processing-step';
-                    step.querySelector('i').className = 'fas fa-circle-notch';
-                }
-                
-                // Update title based on file type
-                let title = 'Processing your request...';
-                if (Array.isArray(fileNames)) {
-                    title = `Processing ${fileNames.length} files...`;
-                    document.getElementById('processingTitle').textContent = title;
-                    simulateBulkProcessing(fileNames);
-                } else {
-                    title = `Processing ${fileNames}...`;
-                    document.getElementById('processingTitle').textContent = title;
-                    simulateProcessing(fileNames);
-                }
-            }
-            
-            function simulateProcessing(fileName) {
-                const steps = [
-                    { id: 'step1', text: `Reading file: ${fileName}`, delay: 500 },
-                    { id: 'step2', text: 'Extracting images and text...', delay: 1000 },
-                    { id: 'step3', text: 'Running OCR analysis...', delay: 1500 },
-                    { id: 'step4', text: 'Parsing timesheet entries...', delay: 2000 },
-                    { id: 'step5', text: 'Validating and generating results...', delay: 2500 }
-                ];
-                
-                steps.forEach((step, index) => {
-                    setTimeout(() => {
-                        const stepElement = document.getElementById(step.id);
-                        stepElement.className = 'processing-step active';
-                        stepElement.querySelector('i').className = 'fas fa-spinner fa-spin';
-                        document.getElementById(`${step.id}Text`).textContent = step.text;
-                        
-                        // Mark previous steps as completed
-                        for (let i = 1; i < index + 1; i++) {
-                            const prevStep = document.getElementById(`step${i}`);
-                            if (prevStep && i < index + 1) {
-                                prevStep.className = 'processing-step completed';
-                                prevStep.querySelector('i').className = 'fas fa-check-circle';
-                            }
-                        }
-                    }, step.delay);
-                });
-            }
-            
-            function simulateBulkProcessing(fileNames) {
-                const steps = [
-                    { id: 'step1', text: `Preparing ${fileNames.length} documents...`, delay: 300 },
-                    { id: 'step2', text: `Processing: ${fileNames[0] || 'first file'}`, delay: 800 },
-                    { id: 'step3', text: 'Running OCR on multiple images...', delay: 1500 },
-                    { id: 'step4', text: `Processing: ${fileNames[1] || 'additional files'}...`, delay: 2200 },
-                    { id: 'step5', text: 'Consolidating all results...', delay: 3000 }
-                ];
-                
-                // Show more files being processed if available
-                if (fileNames.length > 2) {
-                    steps[3].text = `Processing remaining ${fileNames.length - 1} files...`;
-                }
-                
-                steps.forEach((step, index) => {
-                    setTimeout(() => {
-                        const stepElement = document.getElementById(step.id);
-                        stepElement.className = 'processing-step active';
-                        stepElement.querySelector('i').className = 'fas fa-spinner fa-spin';
-                        document.getElementById(`${step.id}Text`).textContent = step.text;
-                        
-                        // Mark previous steps as completed
-                        for (let i = 1; i < index + 1; i++) {
-                            const prevStep = document.getElementById(`step${i}`);
-                            if (prevStep && i < index + 1) {
-                                prevStep.className = 'processing-step completed';
-                                prevStep.querySelector('i').className = 'fas fa-check-circle';
-                            }
-                        }
-                    }, step.delay);
-                });
-            }
-            
-            function hideProcessing() {
-                document.getElementById('processingCard').style.display = 'none';
-            }
-            
-            function showResults(result) {
-                const resultsCard = document.getElementById('resultsCard');
-                const statusDiv = document.getElementById('resultsStatus');
-                const metricsDiv = document.getElementById('resultsMetrics');
-                
-                // Check if this is bulk processing results
-                if (result.results && Array.isArray(result.results)) {
-                    // Bulk processing results
-                    showBulkResults(result);
-                    return;
-                }
-                
-                // Single file results
-                const hasDiscrepancy = result.discrepancy_detected;
-                statusDiv.innerHTML = `
-                    <div class="status-badge ${hasDiscrepancy ? 'status-warning' : 'status-success'}">
-                        <i class="fas ${hasDiscrepancy ? 'fa-exclamation-triangle' : 'fa-check-circle'}"></i>
-                        ${hasDiscrepancy ? 'Discrepancy Detected' : 'All Verified'}
-                    </div>
-                `;
-                
-                // Metrics
-                metricsDiv.innerHTML = `
-                    <div class="result-metric">
-                        <div class="result-value">${result.consultant_name || 'N/A'}</div>
-                        <div class="result-label">Consultant</div>
-                    </div>
-                    <div class="result-metric">
-                        <div class="result-value">${result.total_entries || 0}</div>
-                        <div class="result-label">Entries Found</div>
-                    </div>
-                    <div class="result-metric">
-                        <div class="result-value">${result.screenshot_hours || 0}</div>
-                        <div class="result-label">Screenshot Hours</div>
-                    </div>
-                    <div class="result-metric">
-                        <div class="result-value">${result.system_hours || 0}</div>
-                        <div class="result-label">System Hours</div>
-                    </div>
-                `;
-                
-                resultsCard.style.display = 'block';
-            }
-            
-            function showBulkResults(result) {
-                const resultsCard = document.getElementById('resultsCard');
-                const statusDiv = document.getElementById('resultsStatus');
-                const metricsDiv = document.getElementById('resultsMetrics');
-                
-                const summary = result.summary || {};
-                const discrepancies = summary.discrepancies_found || 0;
-                
-                // Status for bulk processing
-                statusDiv.innerHTML = `
-                    <div class="status-badge ${discrepancies > 0 ? 'status-warning' : 'status-success'}">
-                        <i class="fas ${discrepancies > 0 ? 'fa-exclamation-triangle' : 'fa-check-circle'}"></i>
-                        Bulk Processing: ${discrepancies > 0 ? `${discrepancies} Discrepancies Found` : 'All Verified'}
-                    </div>
-                `;
-                
-                // Bulk metrics
-                metricsDiv.innerHTML = `
-                    <div class="result-metric">
-                        <div class="result-value">${summary.successful_documents || 0}</div>
-                        <div class="result-label">Documents Processed</div>
-                    </div>
-                    <div class="result-metric">
-                        <div class="result-value">${summary.total_images || 0}</div>
-                        <div class="result-label">Images Processed</div>
-                    </div>
-                    <div class="result-metric">
-                        <div class="result-value">${summary.total_entries || 0}</div>
-                        <div class="result-label">Total Entries</div>
-                    </div>
-                    <div class="result-metric">
-                        <div class="result-value">${discrepancies}</div>
-                        <div class="result-label">Discrepancies</div>
-                    </div>
-                `;
-                
-                resultsCard.style.display = 'block';
-            }
-            
-            function showTable(result) {
-                const tableSection = document.getElementById('tableSection');
-                const dataTable = document.getElementById('dataTable');
-                
-                let entries = [];
-                let isMultipleFiles = false;
-                
-                // Get entries based on result type
-                if (result.results && Array.isArray(result.results)) {
-                    // Bulk processing - combine all entries
-                    entries = result.entries || [];
-                    isMultipleFiles = true;
-                } else {
-                    // Single file processing
-                    entries = result.entries || [];
-                }
-                
-                if (entries.length === 0) {
-                    dataTable.innerHTML = '<p style="text-align: center; color: #8b949e; padding: 40px;">No timesheet entries found</p>';
-                    tableSection.style.display = 'block';
-                    return;
-                }
-                
-                // Build table HTML
-                let tableHTML = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Name</th>
-                                <th>Date</th>
-                                <th>Hours</th>
-                                ${isMultipleFiles ? '<th>Source</th>' : ''}
-                            </tr>
-                        </thead>
-                        <tbody>
-                `;
-                
-                entries.forEach((entry, index) => {
-                    const hoursClass = entry.Hours === "CHECK" ? "check-value" : "";
-                    const sourceFile = isMultipleFiles ? (entry.source_file || 'Unknown') : '';
-                    
-                    tableHTML += `
-                        <tr>
-                            <td>${entry.Name || 'N/A'}</td>
-                            <td>${entry.Date || 'N/A'}</td>
-                            <td class="${hoursClass}">${entry.Hours !== undefined ? entry.Hours : 'N/A'}</td>
-                            ${isMultipleFiles ? `<td style="font-size: 11px;">${sourceFile}</td>` : ''}
-                        </tr>
-                    `;
-                });
-                
-                tableHTML += `
-                        </tbody>
-                    </table>
-                `;
-                
-                // Add statistics
-                const validHours = entries.filter(e => typeof e.Hours === 'number').length;
-                const checkEntries = entries.filter(e => e.Hours === 'CHECK').length;
-                const totalHours = entries.reduce((sum, e) => sum + (typeof e.Hours === 'number' ? e.Hours : 0), 0);
-                
-                tableHTML += `
-                    <div class="table-stats">
-                        <div class="table-stat">
-                            <i class="fas fa-list"></i>
-                            <span>Total Entries: ${entries.length}</span>
-                        </div>
-                        <div class="table-stat">
-                            <i class="fas fa-check-circle"></i>
-                            <span>Valid Hours: ${validHours}</span>
-                        </div>
-                        <div class="table-stat">
-                            <i class="fas fa-exclamation-triangle"></i>
-                            <span>Needs Review: ${checkEntries}</span>
-                        </div>
-                        <div class="table-stat">
-                            <i class="fas fa-clock"></i>
-                            <span>Total Hours: ${totalHours}</span>
-                        </div>
-                    </div>
-                `;
-                
-                dataTable.innerHTML = tableHTML;
-                tableSection.style.display = 'block';
-            }
-            
-            function showError(message) {
-                document.getElementById('resultsCard').style.display = 'block';
-                document.getElementById('resultsStatus').innerHTML = `
-                    <div class="status-badge status-warning">
-                        <i class="fas fa-exclamation-triangle"></i>
-                        Error: ${message}
-                    </div>
-                `;
-                document.getElementById('resultsMetrics').innerHTML = '';
-            }
-            
-            function updateSessionStats(result) {
-                sessionStats.processed++;
-                
-                if (result.results && Array.isArray(result.results)) {
-                    // Bulk processing
-                    sessionStats.hours += result.summary?.total_entries || 0;
-                    sessionStats.timeSaved += (result.results.length * 10);
-                } else {
-                    // Single file
-                    sessionStats.hours += result.screenshot_hours || 0;
-                    sessionStats.timeSaved += 10;
-                }
-                
-                document.getElementById('processedCount').textContent = sessionStats.processed;
-                document.getElementById('hoursCount').textContent = sessionStats.hours;
-                document.getElementById('timeSaved').textContent = sessionStats.timeSaved + 'min';
-            }
-            
-            function updateLastUpdated() {
-                const now = new Date();
-                document.getElementById('lastUpdate').textContent = now.toLocaleTimeString();
-            }
-            
-            async function downloadData(format) {
-                if (!currentResults) return;
-                
-                try {
-                    if (format === 'excel') {
-                        // Send data to backend for proper Excel generation
-                        const response = await fetch('/api/download/excel', {
-                            method: 'POST',
-                            headers: { 'Content-Type': 'application/json' },
-                            body: JSON.stringify(currentResults)
-                        });
-                        
-                        if (response.ok) {
-                            const blob = await response.blob();
-                            const url = URL.createObjectURL(blob);
-                            const a = document.createElement('a');
-                            a.href = url;
-                            a.download = `timesheet_${new Date().toISOString().split('T')[0]}.xlsx`;
-                            document.body.appendChild(a);
-                            a.click();
-                            document.body.removeChild(a);
-                            URL.revokeObjectURL(url);
-                        } else {
-                            throw new Error('Excel generation failed');
-                        }
-                        
-                    } else if (format === 'json') {
-                        const jsonData = JSON.stringify(currentResults, null, 2);
-                        const blob = new Blob([jsonData], { type: 'application/json' });
-                        const filename = `timesheet_${new Date().toISOString().split('T')[0]}.json`;
-                        
-                        const url = URL.createObjectURL(blob);
-                        const a = document.createElement('a');
-                        a.href = url;
-                        a.download = filename;
-                        document.body.appendChild(a);
-                        a.click();
-                        document.body.removeChild(a);
-                        URL.revokeObjectURL(url);
-                    }
-                    
-                } catch (error) {
-                    alert('Download failed: ' + error.message);
-                }
-            }
-            
-            // Initialize dashboard
-            updateLastUpdated();
-        </script>
-    </body>
-    </html>
-    ''')
+    return static_assets.page(
+        'dashboard.html', client_image_max_pixels=TARGET_IMAGE_PIXELS, client_image_quality=CLIENT_IMAGE_QUALITY
+    )
+
+def client_normalization(form, uploaded_bytes):
+    """Describe the browser-side downscale/re-encode recorded in the upload form, or None if it was skipped"""
+    if form.get('client_normalized') != '1':
+        return None
+    def form_int(field):
+        try:
+            return int(form.get(field, ''))
+        except ValueError:
+            return None
+    return {
+        'applied': True,
+        'original_bytes': form_int('original_bytes'),
+        'original_width': form_int('original_width'),
+        'original_height': form_int('original_height'),
+        'uploaded_bytes': uploaded_bytes
+    }
 
 @app.route('/api/process-screenshot', methods=['POST'])
 def process_screenshot():
@@ -3460,17 +2408,122 @@ def process_screenshot():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        print(f"Processing screenshot for: {consultant_name}")
+        log.info("Processing screenshot", extra=fields(consultant=consultant_name))
+        
+        # Process using enhanced logic (identical concurrent uploads share one run)
+        timings = StageTimings()
+        with timings.stage('upload_read'):
+            image_bytes = file.read()
+        # Normalized uploads still go through admission checks; the flag only records what the browser did
+        normalization = client_normalization(request.form, len(image_bytes))
+        key = content_key('screenshot', image_bytes, consultant_name)
+        
+        def process():
+            result = processor.process_screenshot_from_bytes(image_bytes, consultant_name, timings=timings)
+            if normalization:
+                result['client_normalization'] = normalization
+            return retain_result(key, 'screenshot', result)
         
-        # Process using enhanced logic
-        result = processor.process_screenshot_from_bytes(file.read(), consultant_name)
+        result, shared = single_flight.do(key, lambda: load_shedder.run(
+            *estimate_image_work(image_bytes), 'interactive', process
+        ))
+        if shared:
+            result = dict(result, coalesced=True)
+        
+        if result.get('status') == 'rejected':
+            return jsonify(result), 413
         
         return jsonify(result)
         
+    except RequestShed as e:
+        return shed_response(e.decision)
     except Exception as e:
-        print(f"Error: {str(e)}")
+        log.error("Screenshot request failed", extra=fields(error=str(e)))
         return jsonify({'error': str(e)}), 500
 
+def process_document_bytes(document_bytes, filename, consultant_name, timings=None):
+    """Run the OCR pipeline on one uploaded Word document; returns (result, status_code)"""
+    if timings is None:
+        timings = StageTimings()
+    # Save uploaded file temporarily
+    with timings.stage('docx_extract'), tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
+        temp_file.write(document_bytes)
+        temp_path = temp_file.name
+    
+    try:
+        # Extract consultant name from filename if not provided
+        if not consultant_name:
+            consultant_name = processor.extract_name_from_filename(filename)
+        consultant_name, consultant_match = processor.resolve_consultant(consultant_name)
+        
+        log.info("Processing document", extra=fields(filename=filename, consultant=consultant_name))
+        
+        # Extract images from Word document
+        admission = ImageAdmission()
+        images = processor.extract_images_from_word_file(temp_path, admission, timings)
+        
+        if not images:
+            if admission.rejections:
+                return {
+                    'error': 'All images in the document were rejected by admission checks',
+                    'consultant_name': consultant_name,
+                    'filename': filename,
+                    'admission': admission.summary(),
+                    'timings': timings.summary()
+                }, 413
+            return {
+                'error': 'No images found in the document',
+                'consultant_name': consultant_name,
+                'filename': filename,
+                'timings': timings.summary()
+            }, 200
+        
+        # Process each image with OCR
+        all_entries = []
+        
+        for idx, image in enumerate(images, 1):
+            log.debug("Processing image", extra=fields(image=idx, images=len(images)))
+            
+            # Extract text using OCR
+            image_timings = StageTimings()
+            text, confidence = processor.extract_text_with_confidence(image, timings=image_timings)
+            
+            # Parse entries
+            with image_timings.stage('parse'):
+                entries = processor.tag_confidence(processor.parse_timesheet_entries(text, consultant_name), confidence)
+            all_entries.extend(entries)
+            timings.add_image(image_timings)
+        
+        # Calculate totals
+        total_hours = sum(entry['Hours'] for entry in all_entries 
+                        if isinstance(entry['Hours'], (int, float)))
+        
+        # Check against the system of record
+        with timings.stage('system_check'):
+            system_hours = processor.check_system_hours(consultant_name, all_entries)
+        
+        result = {
+            'consultant_name': consultant_name,
+            'consultant_match': consultant_match,
+            'filename': filename,
+            'total_images': len(images),
+            'total_entries': len(all_entries),
+            'screenshot_hours': total_hours,
+            'system_hours': system_hours,
+            'discrepancy_detected': system_hours is not None and total_hours != system_hours,
+            'entries': all_entries,
+            'admission': admission.summary(),
+            'status': 'success',
+            'timings': timings.summary()
+        }
+        
+        log.info("Document processed", extra=fields(filename=filename, images=len(images), hours=total_hours))
+        return result, 200
+        
+    finally:
+        # Clean up temporary file
+        os.unlink(temp_path)
+
 @app.route('/api/process-document', methods=['POST'])
 def process_document():
     try:
@@ -3483,70 +2536,276 @@ def process_document():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
+        timings = StageTimings()
+        with timings.stage('upload_read'):
+            document_bytes = file.read()
+        key = content_key('document', document_bytes, file.filename, consultant_name)
+        
+        def process():
+            result, status_code = process_document_bytes(document_bytes, file.filename, consultant_name, timings)
+            return retain_result(key, 'document', result), status_code
+        
+        (result, status_code), shared = single_flight.do(key, lambda: load_shedder.run(
+            *estimate_document_work(document_bytes), 'interactive', process
+        ))
+        if shared:
+            result = dict(result, coalesced=True)
+        
+        return jsonify(result), status_code
+            
+    except RequestShed as e:
+        return shed_response(e.decision)
+    except Exception as e:
+        log.error("Document request failed", extra=fields(error=str(e)))
+        return jsonify({'error': str(e)}), 500
+
+# Per-file outcomes checkpointed as failed, so a resubmitted job tries them again
+RETRY_STATUSES = ('Processing failed', 'Images rejected')
+
+def process_bulk_document(filename, document_bytes, admission, timings=None):
+    """Run the OCR pipeline on one document of a bulk job; returns its per-file result"""
+    if timings is None:
+        timings = StageTimings()
+    try:
         # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-            file.save(temp_file.name)
+        with timings.stage('docx_extract'), tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
+            temp_file.write(document_bytes)
             temp_path = temp_file.name
         
         try:
-            # Extract consultant name from filename if not provided
-            if not consultant_name:
-                consultant_name = processor.extract_name_from_filename(file.filename)
+            # Extract consultant name from filename
+            consultant_name, consultant_match = processor.resolve_consultant(
+                processor.extract_name_from_filename(filename)
+            )
             
-            print(f"Processing document: {file.filename} for consultant: {consultant_name}")
+            log.info("Processing bulk document", extra=fields(filename=filename, consultant=consultant_name))
             
             # Extract images from Word document
-            images = processor.extract_images_from_word_file(temp_path)
+            rejected_before = len(admission.rejections)
+            images = processor.extract_images_from_word_file(temp_path, admission, timings)
             
             if not images:
-                return jsonify({
-                    'error': 'No images found in the document',
+                rejected = len(admission.rejections) > rejected_before
+                return {
                     'consultant_name': consultant_name,
-                    'filename': file.filename
-                })
-            
-            # Process each image with OCR
-            all_entries = []
-            
-            for idx, image in enumerate(images, 1):
-                print(f"Processing image {idx}/{len(images)}")
-                
-                # Extract text using OCR
-                text = processor.extract_text_from_image(image)
-                
-                # Parse entries
-                entries = processor.parse_timesheet_entries(text, consultant_name)
-                all_entries.extend(entries)
-            
-            # Calculate totals
-            total_hours = sum(entry['Hours'] for entry in all_entries 
-                            if isinstance(entry['Hours'], (int, float)))
-            
-            # Simulate system check
-            system_hours = processor.simulate_system_check(consultant_name)
+                    'filename': filename,
+                    'status': 'Images rejected' if rejected else 'No images found',
+                    'error': ('All images were rejected by admission checks' if rejected
+                              else 'Document contains no embedded images'),
+                    'images_processed': 0,
+                    'screenshot_hours': 0,
+                    'system_hours': 0,
+                    'discrepancy_detected': False
+                }
             
-            result = {
+            # Process all images in this document
+            file_entries = []
+            for image in images:
+                image_timings = StageTimings()
+                text, confidence = processor.extract_text_with_confidence(image, 'batch', image_timings)
+                with image_timings.stage('parse'):
+                    entries = processor.tag_confidence(
+                        processor.parse_timesheet_entries(text, consultant_name), confidence
+                    )
+                # Add source file info to each entry
+                for entry in entries:
+                    entry['source_file'] = filename
+                file_entries.extend(entries)
+                timings.add_image(image_timings)
+            
+            # Calculate hours for this consultant
+            consultant_hours = sum(entry['Hours'] for entry in file_entries 
+                                 if isinstance(entry['Hours'], (int, float)))
+            
+            # System hours are looked up for the whole job at once (see apply_system_hours)
+            return {
                 'consultant_name': consultant_name,
-                'filename': file.filename,
-                'total_images': len(images),
-                'total_entries': len(all_entries),
-                'screenshot_hours': total_hours,
-                'system_hours': system_hours,
-                'discrepancy_detected': total_hours != system_hours,
-                'entries': all_entries,
-                'status': 'success'
+                'consultant_match': consultant_match,
+                'filename': filename,
+                'images_processed': len(images),
+                'entries_found': len(file_entries),
+                'screenshot_hours': consultant_hours,
+                'week': timesheet_week(file_entries),
+                'system_hours': None,
+                'discrepancy_detected': False,
+                'status': 'Processed successfully',
+                'entries': file_entries  # Include entries for this file
             }
             
-            print(f"Processing complete: {total_hours} hours extracted from {len(images)} images")
-            return jsonify(result)
-            
         finally:
             # Clean up temporary file
             os.unlink(temp_path)
             
     except Exception as e:
-        print(f"Error processing document: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        return {
+            'consultant_name': processor.extract_name_from_filename(filename),
+            'filename': filename,
+            'status': 'Processing failed',
+            'error': str(e),
+            'images_processed': 0,
+            'screenshot_hours': 0,
+            'system_hours': 0,
+            'discrepancy_detected': False
+        }
+
+def queue_system_lookup(lookups, file_result):
+    """Queue the system-hours lookup for a processed bulk file on the job's batcher"""
+    if file_result.get('status') == 'Processed successfully':
+        week = file_result.get('week') or timesheet_week(file_result['entries'])
+        file_result['week'] = week
+        lookups.add(file_result['consultant_name'], week)
+
+def apply_system_hours(all_results, lookups):
+    """Wait for the job's batched system-hours lookups and fill in discrepancies"""
+    hours = lookups.resolve()
+    for file_result in all_results:
+        if file_result.get('status') != 'Processed successfully':
+            continue
+        system_hours = hours.get((normalize_consultant(file_result['consultant_name']), file_result['week']))
+        file_result['system_hours'] = system_hours
+        file_result['discrepancy_detected'] = (
+            system_hours is not None and file_result['screenshot_hours'] != system_hours
+        )
+
+def build_bulk_response(all_results, admission, timings, **summary_extra):
+    """Summary and combined entries for a list of per-file bulk results.
+
+    `timings` are the job's own StageTimings; the per-file timings in the
+    results are folded into them.
+    """
+    all_entries = []  # For combined Excel export
+    total_images = 0
+    total_entries = 0
+    for file_result in all_results:
+        if file_result.get('status') == 'Processed successfully':
+            all_entries.extend(file_result['entries'])
+            total_images += file_result['images_processed']
+            total_entries += file_result['entries_found']
+    
+    # Summary statistics
+    successful_files = [r for r in all_results if r.get('status') == 'Processed successfully']
+    discrepancies = [r for r in successful_files if r.get('discrepancy_detected')]
+    
+    summary = {
+        'total_documents': len(all_results),
+        'successful_documents': len(successful_files),
+        'total_images': total_images,
+        'total_entries': total_entries,
+        'discrepancies_found': len(discrepancies),
+        'processing_time': f"{timings.elapsed():.1f} seconds",
+        'manual_equivalent': f"{len(all_results) * 15} minutes"
+    }
+    summary.update(summary_extra)
+    
+    # Prepare response with combined entries for Excel export
+    return {
+        'summary': summary,
+        'results': all_results,
+        'entries': all_entries,  # Combined entries from all files
+        'total_images': total_images,
+        'total_entries': total_entries,
+        'processing_timestamp': datetime.now().isoformat(),
+        'admission': admission.summary(),
+        'bulk_processing': True,
+        'timings': timings.summary(documents=len(all_results))
+    }
+
+def compact_bulk_response(response):
+    """Lean form of a bulk response: per-file results without their entries, and the combined
+    entries as columns in which files and consultants are referenced by index"""
+    results = response.get('results', [])
+    entries = response.get('entries', [])
+    file_index = {file_result.get('filename'): position for position, file_result in enumerate(results)}
+    consultants = {}
+    keys = []
+    for entry in entries:
+        for key in entry:
+            if key not in ('Name', 'source_file') and key not in keys:
+                keys.append(key)
+    columns = {'file': [], 'consultant': []}
+    columns.update((key, []) for key in keys)
+    for entry in entries:
+        columns['file'].append(file_index.get(entry.get('source_file')))
+        name = entry.get('Name')
+        columns['consultant'].append(consultants.setdefault(name, len(consultants)))
+        for key in keys:
+            columns[key].append(entry.get(key))
+    
+    compact = {key: value for key, value in response.items() if key not in ('results', 'entries')}
+    compact.update({
+        'response_format': 'compact',
+        'results': [{key: value for key, value in file_result.items() if key != 'entries'}
+                    for file_result in results],
+        'consultants': list(consultants),
+        'entries': {'count': len(entries), 'columns': columns}
+    })
+    return compact
+
+def bulk_json_response(response):
+    """The compact bulk response, or the verbose one (entries per file and combined) with ?verbose=1"""
+    if query_flag(request.args.get('verbose')):
+        return jsonify(response)
+    return jsonify(compact_bulk_response(response))
+
+def process_bulk_documents(documents, job_id, timings=None):
+    """Run the OCR pipeline over a batch of (filename, bytes) Word documents.
+
+    Each document's result is checkpointed to the job store as it finishes, so a
+    resubmitted or interrupted job only reprocesses unfinished documents (whose
+    bytes may be None when resuming from the store).
+    """
+    if timings is None:
+        timings = StageTimings()
+    log.info("Processing bulk job", extra=fields(job_id=job_id, documents=len(documents)))
+    
+    job_store.start_job(job_id, documents)
+    completed = job_store.completed_documents(job_id)
+    if completed:
+        log.info("Resuming bulk job", extra=fields(job_id=job_id, done=len(completed), documents=len(documents)))
+    
+    all_results = []
+    admission = ImageAdmission()  # Bounds pixels decoded at once; each document releases its own
+    
+    # Batched system-of-record lookups run in the background while OCR continues
+    lookups = SystemHoursBatcher(processor.system_hours_client)
+    for file_result in completed.values():
+        queue_system_lookup(lookups, file_result)
+    
+    # Keeps the job's lease alive however long a single document takes
+    with job_store.keepalive(job_id):
+        for position, (filename, document_bytes) in enumerate(documents):
+            file_result = completed.get(position)
+            if file_result is None:
+                document_timings = StageTimings()
+                with admission.document():
+                    file_result = process_bulk_document(filename, document_bytes, admission, document_timings)
+                file_result['timings'] = document_timings.summary()
+                timings.merge(file_result['timings'])
+                failed = file_result.get('status') in RETRY_STATUSES
+                job_store.save_document(job_id, position, file_result, status='failed' if failed else 'done')
+                queue_system_lookup(lookups, file_result)
+            all_results.append(file_result)
+    
+    job_store.finish_job(job_id)
+    with timings.stage('system_check'):
+        apply_system_hours(all_results, lookups)
+    
+    response = build_bulk_response(all_results, admission, timings, resumed_documents=len(completed))
+    response['job_id'] = job_id
+    retain_result(job_id, 'bulk', response)
+    
+    successful = response['summary']['successful_documents']
+    log.info("Bulk processing complete", extra=fields(successful=successful, documents=len(documents)))
+    return response
+
+def estimate_bulk_work(documents):
+    """Header-only (image_count, pixels) estimate for a batch of (filename, bytes) documents"""
+    images = pixels = 0
+    for filename, document_bytes in documents:
+        doc_images, doc_pixels = estimate_document_work(document_bytes)
+        images += doc_images
+        pixels += doc_pixels
+    return images, pixels
 
 @app.route('/api/process-bulk', methods=['POST'])
 def process_bulk():
@@ -3559,287 +2818,490 @@ def process_bulk():
         if not files:
             return jsonify({'error': 'No files selected'}), 400
         
-        print(f"Processing {len(files)} documents in bulk...")
+        timings = StageTimings()
+        with timings.stage('upload_read'):
+            documents = [(file.filename, file.read()) for file in files if file.filename != '']
+        
+        # The content hash doubles as the job ID, so resubmitting a batch resumes it
+        job_id = content_key('bulk', *[part for filename, data in documents for part in (filename, data)])
+        response, shared = single_flight.do(job_id, lambda: load_shedder.run(
+            *estimate_bulk_work(documents), 'batch',
+            lambda: process_bulk_documents(documents, job_id, timings)
+        ))
+        if shared:
+            response = dict(response, coalesced=True)
         
-        all_results = []
-        total_images = 0
-        total_entries = 0
-        all_entries = []  # For combined Excel export
+        return bulk_json_response(response)
         
-        for file in files:
-            if file.filename == '':
+    except RequestShed as e:
+        return shed_response(e.decision)
+    except Exception as e:
+        log.error("Bulk request failed", extra=fields(error=str(e)))
+        return jsonify({'error': str(e)}), 500
+
+ZIP_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff', '.webp')
+ZIP_PREFETCH_MEMBERS = 4
+
+def process_zip_member(name, data, admission):
+    """Run one archive member through the OCR pipeline; returns a bulk-style per-file result"""
+    filename = os.path.basename(name)
+    timings = StageTimings()
+    if filename.lower().endswith('.docx'):
+        file_result = process_bulk_document(filename, data, admission, timings)
+    elif filename.lower().endswith(ZIP_IMAGE_EXTENSIONS):
+        consultant_name = processor.extract_name_from_filename(filename)
+        result = processor.process_screenshot_from_bytes(data, consultant_name, admission, 'batch', timings,
+                                                         check_hours=False)
+        if result.get('status') != 'success':
+            file_result = {
+                'consultant_name': consultant_name,
+                'filename': filename,
+                'status': 'Images rejected' if result.get('status') == 'rejected' else 'Processing failed',
+                'error': result.get('error'),
+                'images_processed': 0,
+                'screenshot_hours': 0,
+                'system_hours': 0,
+                'discrepancy_detected': False
+            }
+        else:
+            for entry in result['entries']:
+                entry['source_file'] = filename
+            file_result = {
+                'consultant_name': result['consultant_name'],
+                'consultant_match': result['consultant_match'],
+                'filename': filename,
+                'images_processed': 1,
+                'entries_found': result['total_entries'],
+                'screenshot_hours': result['screenshot_hours'],
+                # System hours are looked up for the whole job at once (see apply_system_hours)
+                'week': result['week'],
+                'system_hours': None,
+                'discrepancy_detected': False,
+                'status': 'Processed successfully',
+                'entries': result['entries']
+            }
+    else:
+        file_result = {
+            'filename': filename,
+            'status': 'Skipped',
+            'error': 'Unsupported file type (expected .docx or an image)'
+        }
+    file_result['member'] = name
+    file_result['timings'] = timings.summary()
+    return file_result
+
+def process_archive_members(members, job_id, timings=None):
+    """OCR archive members as they arrive, checkpointing each to the job store.
+
+    `members` yields (name, bytes) - or an exception if the archive could not
+    be read further, which ends the job with what was read so far. Resumed
+    jobs pass the stored members, whose bytes are None once finished.
+    """
+    if timings is None:
+        timings = StageTimings()
+    job_store.start_job(job_id, [], kind='zip')
+    completed = job_store.completed_documents(job_id)
+    if completed:
+        log.info("Resuming archive job", extra=fields(job_id=job_id, done=len(completed)))
+    
+    all_results = []
+    admission = ImageAdmission()  # Bounds pixels decoded at once; each member releases its own
+    lookups = SystemHoursBatcher(processor.system_hours_client)
+    archive_error = None
+    # Keeps the job's lease alive however long a single document takes
+    with job_store.keepalive(job_id):
+        for position, item in enumerate(members):
+            if isinstance(item, Exception):
+                archive_error = str(item)
+                break
+            name, data = item
+            file_result = completed.get(position)
+            if file_result is None:
+                job_store.add_document(job_id, position, name, data)
+                log.info("Processing archive member", extra=fields(member=name, position=position + 1))
+                with admission.document():
+                    file_result = process_zip_member(name, data, admission)
+                timings.merge(file_result['timings'])
+                failed = file_result.get('status') in RETRY_STATUSES
+                job_store.save_document(job_id, position, file_result, status='failed' if failed else 'done')
+            queue_system_lookup(lookups, file_result)
+            all_results.append(file_result)
+    
+    job_store.finish_job(job_id)
+    with timings.stage('system_check'):
+        apply_system_hours(all_results, lookups)
+    
+    response = build_bulk_response(all_results, admission, timings, archive_members=len(all_results),
+                                   resumed_documents=len(completed))
+    response['zip_processing'] = True
+    response['job_id'] = job_id
+    if archive_error:
+        response['archive_error'] = archive_error
+    if all_results:
+        retain_result(job_id, 'zip', response)
+    
+    log.info("Archive processing complete", extra=fields(job_id=job_id, members=len(all_results)))
+    return response
+
+def read_zip_members(stream, members, stop):
+    """Reader thread: push archive members onto a bounded queue as they arrive from the client"""
+    try:
+        for name, data in iter_zip_members(stream, max_member_size=app.config['MAX_CONTENT_LENGTH']):
+            if os.path.basename(name).startswith('.') or name.startswith('__MACOSX/'):
                 continue
-                
-            try:
-                # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-                    file.save(temp_file.name)
-                    temp_path = temp_file.name
-                
+            while not stop.is_set():
                 try:
-                    # Extract consultant name from filename
-                    consultant_name = processor.extract_name_from_filename(file.filename)
-                    
-                    print(f"Processing: {file.filename} for {consultant_name}")
-                    
-                    # Extract images from Word document
-                    images = processor.extract_images_from_word_file(temp_path)
-                    
-                    if not images:
-                        all_results.append({
-                            'consultant_name': consultant_name,
-                            'filename': file.filename,
-                            'status': 'No images found',
-                            'error': 'Document contains no embedded images',
-                            'images_processed': 0,
-                            'screenshot_hours': 0,
-                            'system_hours': 0,
-                            'discrepancy_detected': False
-                        })
-                        continue
-                    
-                    # Process all images in this document
-                    file_entries = []
-                    for image in images:
-                        text = processor.extract_text_from_image(image)
-                        entries = processor.parse_timesheet_entries(text, consultant_name)
-                        # Add source file info to each entry
-                        for entry in entries:
-                            entry['source_file'] = file.filename
-                        file_entries.extend(entries)
-                    
-                    # Calculate hours for this consultant
-                    consultant_hours = sum(entry['Hours'] for entry in file_entries 
-                                         if isinstance(entry['Hours'], (int, float)))
-                    
-                    system_hours = processor.simulate_system_check(consultant_name)
-                    
-                    file_result = {
-                        'consultant_name': consultant_name,
-                        'filename': file.filename,
-                        'images_processed': len(images),
-                        'entries_found': len(file_entries),
-                        'screenshot_hours': consultant_hours,
-                        'system_hours': system_hours,
-                        'discrepancy_detected': consultant_hours != system_hours,
-                        'status': 'Processed successfully',
-                        'entries': file_entries  # Include entries for this file
-                    }
-                    
-                    all_results.append(file_result)
-                    all_entries.extend(file_entries)  # Add to combined entries
-                    total_images += len(images)
-                    total_entries += len(file_entries)
-                    
-                finally:
-                    # Clean up temporary file
-                    os.unlink(temp_path)
-                    
-            except Exception as e:
-                all_results.append({
-                    'consultant_name': processor.extract_name_from_filename(file.filename),
-                    'filename': file.filename,
-                    'status': 'Processing failed',
-                    'error': str(e),
-                    'images_processed': 0,
-                    'screenshot_hours': 0,
-                    'system_hours': 0,
-                    'discrepancy_detected': False
-                })
-        
-        # Summary statistics
-        successful_files = [r for r in all_results if r.get('status') == 'Processed successfully']
-        discrepancies = [r for r in successful_files if r.get('discrepancy_detected')]
-        
-        summary = {
-            'total_documents': len(files),
-            'successful_documents': len(successful_files),
-            'total_images': total_images,
-            'total_entries': total_entries,
-            'discrepancies_found': len(discrepancies),
-            'processing_time': f"{len(files) * 2.5:.1f} seconds",
-            'manual_equivalent': f"{len(files) * 15} minutes"
-        }
+                    members.put((name, data), timeout=1)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+    except Exception as e:
+        members.put(e)
+        return
+    members.put(None)
+
+@app.route('/api/process-zip', methods=['POST'])
+def process_zip():
+    """Process a zip of .docx and image timesheets, streaming members into OCR as they are read"""
+    stop = threading.Event()
+    try:
+        # Raw application/zip body streams; a multipart 'archive' field also works but is buffered first
+        if 'archive' in request.files:
+            stream = request.files['archive'].stream
+        else:
+            stream = request.stream
         
-        # Prepare response with combined entries for Excel export
-        response = {
-            'summary': summary,
-            'results': all_results,
-            'entries': all_entries,  # Combined entries from all files
-            'total_images': total_images,
-            'total_entries': total_entries,
-            'processing_timestamp': datetime.now().isoformat(),
-            'bulk_processing': True
-        }
+        timings = StageTimings()
+        members = queue.Queue(maxsize=ZIP_PREFETCH_MEMBERS)
         
-        print(f"Bulk processing complete: {len(successful_files)}/{len(files)} files processed successfully")
-        return jsonify(response)
+        def queued_members():
+            # Start reading only once admitted, so a shed request doesn't consume its upload
+            threading.Thread(target=read_zip_members, args=(stream, members, stop), daemon=True).start()
+            while True:
+                # Time spent waiting here is time OCR sat idle on the upload
+                with timings.stage('upload_read'):
+                    item = members.get()
+                if item is None:
+                    return
+                yield item
         
+        # Members are checkpointed as they arrive, so an interrupted archive resumes like a bulk job.
+        # Its content hash isn't known until the whole upload is read, so each upload gets its own job.
+        job_id = uuid.uuid4().hex
+        response = load_shedder.run(
+            *estimate_archive_work(request.content_length), 'batch',
+            lambda: process_archive_members(queued_members(), job_id, timings)
+        )
+        
+        if 'archive_error' in response and not response['results']:
+            return jsonify({'error': f"Could not read archive: {response['archive_error']}"}), 400
+        return bulk_json_response(response)
+        
+    except RequestShed as e:
+        return shed_response(e.decision)
+    except Exception as e:
+        log.error("Archive request failed", extra=fields(error=str(e)))
+        return jsonify({'error': str(e)}), 500
+    finally:
+        stop.set()
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Progress of a checkpointed bulk job"""
+    status = job_store.job_status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(status)
+
+def resume_interrupted_jobs(interval=60):
+    """Background loop that finishes bulk jobs whose worker died mid-run and purges expired ones"""
+    while True:
+        try:
+            purged = job_store.purge_finished_jobs()
+            if purged:
+                log.info("Purged expired jobs", extra=fields(jobs=purged))
+            job_id = job_store.claim_interrupted_job()
+            if job_id is not None:
+                with correlation(f"job-{job_id[:12]}"):
+                    log.info("Recovering interrupted bulk job", extra=fields(job_id=job_id))
+                    documents = job_store.load_documents(job_id)
+                    if job_store.job_status(job_id)['kind'] == 'zip':
+                        single_flight.do(job_id, lambda: process_archive_members(documents, job_id))
+                    else:
+                        # Resubmissions of the same batch attach to this run instead of duplicating it
+                        single_flight.do(job_id, lambda: process_bulk_documents(documents, job_id))
+                continue
+        except Exception as e:
+            log.error("Job recovery failed", extra=fields(error=str(e)))
+        time.sleep(interval)
+
+def start_job_recovery():
+    """Start the interrupted-job recovery thread (once per worker process)"""
+    thread = threading.Thread(target=resume_interrupted_jobs, name='job-recovery', daemon=True)
+    thread.start()
+    return thread
+
+def start_roster_watcher():
+    """Reload the consultant roster in the background when its file changes (once per worker process)"""
+    if processor.roster is None:
+        return None
+    return processor.roster.start_watching()
+
+def export_entries(data):
+    """Rows to export for a result: its entries, or a single summary row if it has none"""
+    entries = data.get('entries', [])
+    if not entries:
+        # Create single entry from main data
+        entries = [{
+            'Name': data.get('consultant_name', 'Unknown'),
+            'Date': 'N/A',
+            'Hours': data.get('screenshot_hours', 0)
+        }]
+    return entries
+
+def export_file_results(data):
+    """Per-file results carrying system hours for the reconciliation sheets (the result itself for single uploads)"""
+    return data.get('results') or [data]
+
+def export_filename(extension):
+    return f'timesheet_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
+
+@app.route('/api/results/<result_id>', methods=['GET'])
+def get_result(result_id):
+    """A retained processing result"""
+    result = result_store.get(result_id)
+    if result is None:
+        return jsonify({'error': 'Result not found or expired'}), 404
+    return jsonify(result)
+
+def query_flag(value):
+    """True / False for a 1/0 (true/false) query parameter, None when absent"""
+    if value in (None, ''):
+        return None
+    return value.lower() in ('1', 'true', 'yes')
+
+@app.route('/api/results/<result_id>/entries', methods=['GET'])
+def get_result_entries(result_id):
+    """A page of a retained result's entries, filtered and sorted server-side for the results table"""
+    # Metadata columns only; the result itself is never loaded to serve a page
+    described = result_store.describe(result_id)
+    if described is None:
+        return jsonify({'error': 'Result not found or expired'}), 404
+    etag = content_key('entries', described['content_hash'], request.query_string)
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    args = request.args
+    sort = args.get('sort', 'position')
+    offset = max(0, args.get('offset', 0, type=int))
+    try:
+        page = result_store.query_entries(
+            result_id,
+            offset=offset,
+            limit=args.get('limit', 100, type=int),
+            sort=sort,
+            descending=args.get('order', 'asc') == 'desc',
+            consultant=args.get('consultant'),
+            source_file=args.get('source_file'),
+            needs_check=query_flag(args.get('check')),
+            date_from=args.get('date_from'),
+            date_to=args.get('date_to')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    page.update({
+        'result_id': result_id,
+        'offset': offset,
+        'sort': sort,
+        'order': args.get('order', 'asc'),
+        'has_source_file': described['has_source_file']
+    })
+    response = jsonify(page)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def stored_export_entries(result_id, described):
+    """(entries, include_source, file_results) for a retained result described by result_store.describe().
+
+    Entries are streamed from the result store rather than loaded all at once.
+    """
+    file_results = result_store.file_summaries(result_id)
+    if not described['entry_count']:
+        # Nothing large to load: the export is a single summary row
+        return export_entries(result_store.summary(result_id) or {}), False, file_results
+    return result_store.iter_entries(result_id), described['has_source_file'], file_results
+
+def export_etag(file_format, *content):
+    """Cache key / ETag of an export: its format, the export layout version and a hash of the content"""
+    return content_key('export', EXPORT_CACHE_VERSION, file_format, *content)
+
+def not_modified(etag):
+    """304 for a client that already has this export"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+def streamed_download(chunks, mimetype, extension, etag=None):
+    """Attachment response that sends generator output as it is produced"""
+    response = Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={export_filename(extension)}'}
+    )
+    if etag:
+        response.set_etag(etag)
+    return response
+
+def cached_download(etag, extension, mimetype, write):
+    """Serve an export file from the on-disk cache, building it with write(file) only on a miss.
+
+    Concurrent misses for the same export share one build; clients revalidate with If-None-Match.
+    """
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    f = export_cache.open(etag, extension)
+    if f is None:
+        path, _ = single_flight.do(f"export:{etag}", lambda: export_cache.put(etag, extension, write))
+        f = open(path, 'rb')
+    response = send_file(f, mimetype=mimetype, as_attachment=True,
+                         download_name=export_filename(extension), etag=etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@app.route('/api/results/<result_id>/excel', methods=['GET'])
+def export_result_excel(result_id):
+    """Excel export generated from the stored result, so clients only send its ID"""
+    try:
+        described = result_store.describe(result_id)
+        if described is None:
+            return jsonify({'error': 'Result not found or expired'}), 404
+        
+        def write(output):
+            entries, include_source, file_results = stored_export_entries(result_id, described)
+            write_timesheet_workbook(entries, output, include_source, file_results)
+        
+        return cached_download(export_etag('xlsx', described['content_hash']), 'xlsx', EXCEL_MIMETYPE, write)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/results/<result_id>/csv', methods=['GET'])
+def export_result_csv(result_id):
+    """Stream a retained result's entries as CSV"""
+    described = result_store.describe(result_id)
+    if described is None:
+        return jsonify({'error': 'Result not found or expired'}), 404
+    etag = export_etag('csv', described['content_hash'])
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    entries, include_source, _ = stored_export_entries(result_id, described)
+    return streamed_download(iter_csv(entries, include_source), CSV_MIMETYPE, 'csv', etag)
+
+@app.route('/api/results/<result_id>/ndjson', methods=['GET'])
+def export_result_ndjson(result_id):
+    """Stream a retained result's entries as newline-delimited JSON"""
+    described = result_store.describe(result_id)
+    if described is None:
+        return jsonify({'error': 'Result not found or expired'}), 404
+    etag = export_etag('ndjson', described['content_hash'])
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    entries, _, _ = stored_export_entries(result_id, described)
+    return streamed_download(iter_ndjson(entries), NDJSON_MIMETYPE, 'ndjson', etag)
+
+def columnar_download(etag, entries, file_format):
+    """Parquet / Arrow IPC attachment of the entries (typed columns for analytics)"""
+    try:
+        return cached_download(etag, file_format, COLUMNAR_FORMATS[file_format],
+                               lambda output: write_columnar_entries(entries(), output, file_format))
+    except ImportError:
+        return jsonify({'error': f'{file_format} export requires pyarrow to be installed'}), 501
+
+@app.route('/api/results/<result_id>/<any(parquet, arrow):file_format>', methods=['GET'])
+def export_result_columnar(result_id, file_format):
+    """Parquet or Arrow export of a retained result's entries"""
+    try:
+        described = result_store.describe(result_id)
+        if described is None:
+            return jsonify({'error': 'Result not found or expired'}), 404
+        return columnar_download(
+            export_etag(file_format, described['content_hash']),
+            lambda: result_store.iter_entries(result_id) if described['entry_count'] else [],
+            file_format
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/download/<any(parquet, arrow):file_format>', methods=['POST'])
+def download_columnar(file_format):
+    """Parquet or Arrow export from posted results JSON, like /api/download/excel"""
+    try:
+        data = request.json
+        return columnar_download(
+            export_etag(file_format, request.get_data()), lambda: data.get('entries', []), file_format
+        )
     except Exception as e:
-        print(f"Error in bulk processing: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/download/excel', methods=['POST'])
 def download_excel():
+    """Excel export from posted results JSON (kept for clients without a result_id)"""
     try:
         data = request.json
         
         # Prepare entries data
-        entries = data.get('entries', [])
-        if not entries:
-            # Create single entry from main data
-            entries = [{
-                'Name': data.get('consultant_name', 'Unknown'),
-                'Date': 'N/A',
-                'Hours': data.get('screenshot_hours', 0)
-            }]
-        
-        # Create Excel file using openpyxl
+        entries = export_entries(data)
+        
+        # Create Excel file using openpyxl (cached by a hash of the posted results)
         try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Border, Side
-            
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Timesheet Data"
-            
-            # Headers
-            headers = ['Name', 'Date', 'Hours']
-            if any('source_file' in entry for entry in entries):
-                headers.append('Source File')
-            
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-            
-            # Data rows
-            for row_idx, entry in enumerate(entries, 2):
-                name_value = entry.get('Name', '')
-                date_value = entry.get('Date', '')
-                hours_value = entry.get('Hours', '')
-                source_value = entry.get('source_file', '')
-                
-                # Name column (A)
-                cell = ws.cell(row=row_idx, column=1, value=name_value)
-                cell.border = Border(
-                    left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin')
-                )
-                
-                # Date column (B)
-                cell = ws.cell(row=row_idx, column=2, value=date_value)
-                cell.border = Border(
-                    left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin')
-                )
-                
-                # Hours column (C)
-                cell = ws.cell(row=row_idx, column=3, value=hours_value)
-                cell.border = Border(
-                    left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin')
-                )
-                
-                # Source file column (D) if present
-                if 'Source File' in headers:
-                    cell = ws.cell(row=row_idx, column=4, value=source_value)
-                    cell.border = Border(
-                        left=Side(style='thin'), right=Side(style='thin'),
-                        top=Side(style='thin'), bottom=Side(style='thin')
-                    )
-                
-                # Highlight CHECK entries
-                if hours_value == "CHECK":
-                    hours_cell = ws.cell(row=row_idx, column=3)
-                    hours_cell.fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                    hours_cell.font = Font(color="FF0000")
-            
-            # Auto-adjust column widths
-            ws.column_dimensions['A'].width = 25  # Name
-            ws.column_dimensions['B'].width = 15  # Date  
-            ws.column_dimensions['C'].width = 10  # Hours
-            if 'Source File' in headers:
-                ws.column_dimensions['D'].width = 30  # Source File
-            
-            # Add filter
-            filter_range = f"A1:{chr(ord('A') + len(headers) - 1)}{len(entries) + 1}"
-            ws.auto_filter.ref = filter_range
-            
-            # Save to memory
-            output = io.BytesIO()
-            wb.save(output)
-            output.seek(0)
-            
-            return send_file(
-                output,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                as_attachment=True,
-                download_name=f'timesheet_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+            return cached_download(
+                export_etag('xlsx', request.get_data()), 'xlsx', EXCEL_MIMETYPE,
+                lambda output: write_timesheet_workbook(entries, output, file_results=export_file_results(data))
             )
             
         except ImportError:
-            # Fallback: Create proper CSV with Excel-friendly format
-            output = io.StringIO()
-            
-            # Write BOM for Excel UTF-8 compatibility
-            output.write('\ufeff')
-            
-            # Write headers
-            headers = ['Name', 'Date', 'Hours']
-            if any('source_file' in entry for entry in entries):
-                headers.append('Source File')
-            output.write(','.join(headers) + '\n')
-            
-            # Write data
-            for entry in entries:
-                name = str(entry.get('Name', '')).replace('"', '""')
-                date = str(entry.get('Date', '')).replace('"', '""')
-                hours = str(entry.get('Hours', ''))
-                source = str(entry.get('source_file', '')).replace('"', '""')
-                
-                row = f'"{name}","{date}","{hours}"'
-                if 'Source File' in headers:
-                    row += f',"{source}"'
-                output.write(row + '\n')
-            
-            # Create response
-            response_data = output.getvalue()
-            output.close()
-            
-            response = app.response_class(
-                response=response_data,
-                mimetype='text/csv',
-                headers={"Content-disposition": f"attachment; filename=timesheet_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"}
-            )
-            return response
+            # Fallback: stream a CSV with an Excel-friendly format
+            include_source = any('source_file' in entry for entry in entries)
+            return streamed_download(iter_csv(entries, include_source), CSV_MIMETYPE, 'csv')
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics aggregated across all worker processes"""
+    return metrics_response()
+
 @app.route('/health')
 def health():
     return jsonify({
         'status': 'healthy',
         'service': 'TimeVerify AI Dashboard',
+        'ocr_concurrency': ocr_controller.status(),
+        'single_flight': single_flight.stats(),
+        'load_shedding': load_shedder.status(),
+        'system_of_record': processor.system_hours_client.status(),
+        'consultant_roster': processor.roster.status() if processor.roster else None,
+        'result_store': result_store.status(),
+        'export_cache': export_cache.status(),
+        'logging': logging_status(),
         'timestamp': datetime.now().isoformat()
     })
 
+def create_app():
+    """Application factory used by the production WSGI server (see gunicorn.conf.py)"""
+    app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 50 * 1024 * 1024))
+    return app
+
 if __name__ == '__main__':
    import os
    # OpenShift compatibility - use PORT environment variable
    port = int(os.environ.get('PORT', 8080))
    host = os.environ.get('HOST', '0.0.0.0')
    
-   print(f"🚀 TimeVerify AI Dashboard - Starting on {host}:{port}...")
-   print(f"🌐 Server running on {host}:{port}")
-   print("📊 Features: Enhanced OCR Processing + Modern Dashboard")
-   print(f"🔧 Tesseract Available: {tesseract_available}")
+   log.info("Starting TimeVerify AI Dashboard", extra=fields(host=host, port=port, tesseract_available=tesseract_available))
    
+   start_job_recovery()
+   start_roster_watcher()
    app.run(host=host, port=port, debug=False)
\ No newline at end of file
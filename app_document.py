@@ -1,167 +1,34 @@
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify
+from static_assets import StaticAssets
+from stage_timings import StageTimings
+from system_of_record import create_system_hours_client, timesheet_week, SystemOfRecordError
 from timeverify_processor import TimesheetProcessor  # Your OCR class
 import json
 from datetime import datetime
 import os
 import tempfile
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder=None)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size for documents
+static_assets = StaticAssets(app)
 
 # Initialize your OCR processor
 processor = TimesheetProcessor()
 
+# Billed hours per consultant and week (demo data unless SYSTEM_OF_RECORD_URL is set)
+system_hours_client = create_system_hours_client()
+
+def check_system_hours(consultant_name, entries):
+    """Billed hours for the consultant in the week of `entries`, or None if unknown/unavailable"""
+    try:
+        return system_hours_client.get_hours(consultant_name, timesheet_week(entries))
+    except SystemOfRecordError as e:
+        print(f"⚠️ {e}")
+        return None
+
 @app.route('/')
 def home():
-    return render_template_string('''
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>TimeVerify AI - Document Processing</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
-            .container { max-width: 1000px; margin: 0 auto; background: white; padding: 30px; border-radius: 8px; }
-            .header { text-align: center; color: #c00; margin-bottom: 30px; }
-            .section { margin: 20px 0; padding: 20px; border: 1px solid #ddd; border-radius: 8px; }
-            .btn { background: #c00; color: white; padding: 12px 24px; border: none; border-radius: 4px; cursor: pointer; margin: 5px; }
-            .btn:hover { background: #a00; }
-            .upload-area { border: 2px dashed #ccc; padding: 40px; text-align: center; }
-            .results { margin-top: 20px; padding: 20px; background: #f9f9f9; border-radius: 4px; max-height: 400px; overflow-y: auto; }
-            .stats { display: flex; gap: 20px; margin: 20px 0; }
-            .stat-card { flex: 1; padding: 20px; background: #e8f4fd; border-radius: 8px; text-align: center; }
-            .file-info { background: #f0f8ff; padding: 10px; margin: 10px 0; border-radius: 4px; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔴 TimeVerify AI - Document Processing</h1>
-                <p>Enterprise Timesheet Processing Platform</p>
-                <p><strong>Status:</strong> Process Word documents with embedded timesheet images</p>
-            </div>
-            
-            <div class="stats">
-                <div class="stat-card">
-                    <h3>Document Processing</h3>
-                    <p>✅ .docx/.doc Support</p>
-                </div>
-                <div class="stat-card">
-                    <h3>Image Extraction</h3>
-                    <p>✅ Auto Extract from Docs</p>
-                </div>
-                <div class="stat-card">
-                    <h3>OCR Engine</h3>
-                    <p>✅ Your Tesseract Logic</p>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h3>📄 Upload Word Document with Timesheet Screenshots</h3>
-                <div class="file-info">
-                    <strong>Supported formats:</strong> .docx, .doc files<br>
-                    <strong>Process:</strong> Upload → Extract embedded images → OCR processing → Results
-                </div>
-                <form id="uploadForm" enctype="multipart/form-data">
-                    <div class="upload-area">
-                        <input type="file" name="document" accept=".docx,.doc" required>
-                        <br><br>
-                        <input type="text" name="consultant_name" placeholder="Consultant Name (or leave empty to extract from filename)" style="width: 300px;">
-                        <br><br>
-                        <button type="submit" class="btn">📄 Process Document</button>
-                    </div>
-                </form>
-            </div>
-            
-            <div class="section">
-                <h3>🗂️ Bulk Document Processing</h3>
-                <form id="bulkUploadForm" enctype="multipart/form-data">
-                    <div class="upload-area">
-                        <input type="file" name="documents" accept=".docx,.doc" multiple required>
-                        <br><br>
-                        <button type="submit" class="btn">📁 Process Multiple Documents</button>
-                        <p><small>Select multiple .docx files to process in bulk</small></p>
-                    </div>
-                </form>
-            </div>
-            
-            <div class="section">
-                <h3>🎯 Demo Simulation</h3>
-                <button onclick="runDemo()" class="btn">🚀 Run Demo (No Upload Required)</button>
-                <p>Simulate processing for presentation purposes</p>
-            </div>
-            
-            <div id="results" class="results" style="display:none;">
-                <h3>Processing Results:</h3>
-                <div id="processingStatus"></div>
-                <pre id="resultData"></pre>
-            </div>
-        </div>
-        
-        <script>
-            // Single document processing
-            document.getElementById('uploadForm').onsubmit = async function(e) {
-                e.preventDefault();
-                await processDocuments(this, '/api/process-document', false);
-            };
-            
-            // Bulk document processing
-            document.getElementById('bulkUploadForm').onsubmit = async function(e) {
-                e.preventDefault();
-                await processDocuments(this, '/api/process-documents', true);
-            };
-            
-            async function processDocuments(form, endpoint, isBulk) {
-                const formData = new FormData(form);
-                const resultsDiv = document.getElementById('results');
-                const resultData = document.getElementById('resultData');
-                const statusDiv = document.getElementById('processingStatus');
-                
-                try {
-                    const fileCount = isBulk ? form.documents.files.length : 1;
-                    statusDiv.innerHTML = `<strong>Processing ${fileCount} document(s)...</strong><br>Extracting images and running OCR...`;
-                    resultsDiv.style.display = 'block';
-                    resultData.textContent = 'Processing...';
-                    
-                    const response = await fetch(endpoint, {
-                        method: 'POST',
-                        body: formData
-                    });
-                    
-                    const result = await response.json();
-                    
-                    statusDiv.innerHTML = `<strong>✅ Processing Complete!</strong><br>Found ${result.total_images || 0} images, ${result.total_entries || 0} timesheet entries`;
-                    resultData.textContent = JSON.stringify(result, null, 2);
-                } catch (error) {
-                    statusDiv.innerHTML = '<strong>❌ Error occurred</strong>';
-                    resultData.textContent = 'Error: ' + error.message;
-                }
-            }
-            
-            // Demo simulation
-            async function runDemo() {
-                const resultsDiv = document.getElementById('results');
-                const resultData = document.getElementById('resultData');
-                const statusDiv = document.getElementById('processingStatus');
-                
-                statusDiv.innerHTML = '<strong>🎯 Running Demo Simulation...</strong>';
-                resultsDiv.style.display = 'block';
-                resultData.textContent = 'Generating demo data...';
-                
-                try {
-                    const response = await fetch('/api/demo');
-                    const result = await response.json();
-                    
-                    statusDiv.innerHTML = '<strong>✅ Demo Complete!</strong><br>Simulated processing of 5 consultants';
-                    resultData.textContent = JSON.stringify(result, null, 2);
-                } catch (error) {
-                    statusDiv.innerHTML = '<strong>❌ Demo Error</strong>';
-                    resultData.textContent = 'Error: ' + error.message;
-                }
-            }
-        </script>
-    </body>
-    </html>
-    ''')
+    return static_assets.page('document_home.html')
 
 @app.route('/api/process-document', methods=['POST'])
 def process_document():
@@ -177,7 +44,8 @@ def process_document():
             return jsonify({'error': 'No file selected'}), 400
         
         # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
+        timings = StageTimings()
+        with timings.stage('upload_read'), tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
             file.save(temp_file.name)
             temp_path = temp_file.name
         
@@ -189,13 +57,15 @@ def process_document():
             print(f"Processing document: {file.filename} for consultant: {consultant_name}")
             
             # Extract images from Word document using your existing method
-            images = processor.extract_images_from_word_file(temp_path)
+            with timings.stage('docx_extract'):
+                images = processor.extract_images_from_word_file(temp_path)
             
             if not images:
                 return jsonify({
                     'error': 'No images found in the document',
                     'consultant_name': consultant_name,
-                    'filename': file.filename
+                    'filename': file.filename,
+                    'timings': timings.summary()
                 })
             
             # Process each image with OCR
@@ -206,11 +76,15 @@ def process_document():
                 print(f"Processing image {idx}/{len(images)}")
                 
                 # Extract text using your OCR method
-                text = processor.extract_text_from_image(image)
+                image_timings = StageTimings()
+                with image_timings.stage('ocr'):
+                    text = processor.extract_text_from_image(image)
                 
                 # Parse entries using your parsing method
-                entries = processor.parse_timesheet_entries(text, consultant_name)
+                with image_timings.stage('parse'):
+                    entries = processor.parse_timesheet_entries(text, consultant_name)
                 all_entries.extend(entries)
+                timings.add_image(image_timings)
                 
                 image_results.append({
                     'image_number': idx,
@@ -223,8 +97,8 @@ def process_document():
             total_hours = sum(entry['Hours'] for entry in all_entries 
                             if isinstance(entry['Hours'], (int, float)))
             
-            # Simulate IBM system check
-            ibm_hours = processor.simulate_ibm_system_check(consultant_name)
+            with timings.stage('system_check'):
+                ibm_hours = check_system_hours(consultant_name, all_entries)
             
             result = {
                 'consultant_name': consultant_name,
@@ -233,11 +107,12 @@ def process_document():
                 'total_entries': len(all_entries),
                 'screenshot_hours': total_hours,
                 'ibm_system_hours': ibm_hours,
-                'discrepancy_detected': total_hours != ibm_hours,
+                'discrepancy_detected': ibm_hours is not None and total_hours != ibm_hours,
                 'image_results': image_results,
                 'all_entries': all_entries,
                 'processing_timestamp': datetime.now().isoformat(),
-                'status': 'Processed successfully'
+                'status': 'Processed successfully',
+                'timings': timings.summary()
             }
             
             print(f"Processing complete: {total_hours} hours extracted from {len(images)} images")
@@ -266,14 +141,17 @@ def process_documents():
         all_results = []
         total_images = 0
         total_entries = 0
+        timings = StageTimings()
         
         for file in files:
             if file.filename == '':
                 continue
                 
+            document_timings = StageTimings()
             try:
                 # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
+                with document_timings.stage('upload_read'), \
+                        tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
                     file.save(temp_file.name)
                     temp_path = temp_file.name
                 
@@ -284,29 +162,36 @@ def process_documents():
                     print(f"Processing document: {file.filename}")
                     
                     # Extract images from Word document
-                    images = processor.extract_images_from_word_file(temp_path)
+                    with document_timings.stage('docx_extract'):
+                        images = processor.extract_images_from_word_file(temp_path)
                     
                     if not images:
                         all_results.append({
                             'consultant_name': consultant_name,
                             'filename': file.filename,
                             'status': 'No images found',
-                            'error': 'Document contains no embedded images'
+                            'error': 'Document contains no embedded images',
+                            'timings': document_timings.summary()
                         })
                         continue
                     
                     # Process all images in this document
                     file_entries = []
                     for image in images:
-                        text = processor.extract_text_from_image(image)
-                        entries = processor.parse_timesheet_entries(text, consultant_name)
+                        image_timings = StageTimings()
+                        with image_timings.stage('ocr'):
+                            text = processor.extract_text_from_image(image)
+                        with image_timings.stage('parse'):
+                            entries = processor.parse_timesheet_entries(text, consultant_name)
                         file_entries.extend(entries)
+                        document_timings.add_image(image_timings)
                     
                     # Calculate hours for this consultant
                     consultant_hours = sum(entry['Hours'] for entry in file_entries 
                                          if isinstance(entry['Hours'], (int, float)))
                     
-                    ibm_hours = processor.simulate_ibm_system_check(consultant_name)
+                    with document_timings.stage('system_check'):
+                        ibm_hours = check_system_hours(consultant_name, file_entries)
                     
                     file_result = {
                         'consultant_name': consultant_name,
@@ -315,8 +200,9 @@ def process_documents():
                         'entries_found': len(file_entries),
                         'screenshot_hours': consultant_hours,
                         'ibm_system_hours': ibm_hours,
-                        'discrepancy_detected': consultant_hours != ibm_hours,
-                        'status': 'Processed successfully'
+                        'discrepancy_detected': ibm_hours is not None and consultant_hours != ibm_hours,
+                        'status': 'Processed successfully',
+                        'timings': document_timings.summary()
                     }
                     
                     all_results.append(file_result)
@@ -331,8 +217,11 @@ def process_documents():
                 all_results.append({
                     'filename': file.filename,
                     'status': 'Processing failed',
-                    'error': str(e)
+                    'error': str(e),
+                    'timings': document_timings.summary()
                 })
+            finally:
+                timings.merge(document_timings.summary())
         
         # Summary statistics
         successful_files = [r for r in all_results if r.get('status') == 'Processed successfully']
@@ -344,7 +233,7 @@ def process_documents():
             'total_images': total_images,
             'total_entries': total_entries,
             'discrepancies_found': len(discrepancies),
-            'processing_time': f"{len(files) * 2} seconds (estimated)",
+            'processing_time': f"{timings.elapsed():.1f} seconds",
             'manual_equivalent': f"{len(files) * 10} minutes"
         }
         
@@ -353,7 +242,8 @@ def process_documents():
             'results': all_results,
             'total_images': total_images,
             'total_entries': total_entries,
-            'processing_timestamp': datetime.now().isoformat()
+            'processing_timestamp': datetime.now().isoformat(),
+            'timings': timings.summary(documents=len(all_results))
         })
         
     except Exception as e:
@@ -370,7 +260,7 @@ def demo():
             'total_images': 12,
             'total_entries': 89,
             'discrepancies_found': 2,
-            'processing_time': '10 seconds',
+            'processing_time': 'simulated (no documents processed)',
             'manual_equivalent': '3+ hours'
         },
         'results': [
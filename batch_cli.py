@@ -0,0 +1,169 @@
+"""Offline batch processor for folders of timesheets.
+
+Walks a directory for .docx files and screenshots, runs them through the same
+OCR pipeline as /api/process-bulk in parallel across all cores, and writes the
+/api/download/excel workbook layout. Re-running skips files whose content hash
+was already processed.
+
+    python batch_cli.py /mnt/share/timesheets/2024-11 --output november.xlsx
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from cpu_quota import available_cpus
+
+SUPPORTED_EXTENSIONS = ('.docx', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_timesheets(folder):
+    """Supported files under `folder`, in a stable order"""
+    paths = []
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for name in sorted(files):
+            if not name.startswith(('.', '~$')) and name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return paths
+
+
+def load_state(state_path):
+    """Results of previous runs keyed by file hash (append-only JSON lines)"""
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    state[record['sha256']] = record['result']
+                except (ValueError, KeyError):
+                    continue  # Partially written line from an interrupted run
+    return state
+
+
+def _init_worker():
+    """One single-threaded Tesseract per core, whatever OCR_CONCURRENCY_MODE the service is configured with"""
+    os.environ['OCR_CONCURRENCY_MODE'] = 'throughput'
+    # Importing app runs its OCR concurrency setup, which exports its own OMP_THREAD_LIMIT; pin ours after it
+    import app
+    app.ocr_controller.omp_threads = 1
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _process_file(path, relative_path):
+    """Worker: run one file through the app's OCR pipeline"""
+    from app import process_zip_member
+    from image_admission import ImageAdmission
+    with open(path, 'rb') as f:
+        data = f.read()
+    started = time.perf_counter()
+    result = process_zip_member(relative_path, data, ImageAdmission())
+    result['processing_seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run(folder, output, workers, state_path, resume=True):
+    from app import build_bulk_response, processor, queue_system_lookup, apply_system_hours
+    from excel_export import write_timesheet_workbook
+    from image_admission import ImageAdmission
+    from stage_timings import StageTimings
+    from system_of_record import SystemHoursBatcher
+
+    started = time.perf_counter()
+    timings = StageTimings()
+    paths = find_timesheets(folder)
+    state = load_state(state_path) if resume else {}
+    print(f"🔍 Found {len(paths)} timesheet files in {folder}")
+
+    results = {}
+    pending = []
+    # System hours for the whole run are fetched in batches alongside OCR
+    lookups = SystemHoursBatcher(processor.system_hours_client)
+    for path in paths:
+        sha256 = file_hash(path)
+        if sha256 in state:
+            results[path] = state[sha256]
+            queue_system_lookup(lookups, results[path])
+        else:
+            pending.append((path, sha256))
+    print(f"♻️ {len(results)} already processed, {len(pending)} to process with {workers} workers")
+
+    failed = 0
+    with open(state_path, 'a', encoding='utf-8') as state_file, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_process_file, path, os.path.relpath(path, folder)): (path, sha256)
+            for path, sha256 in pending
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            path, sha256 = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'filename': os.path.basename(path), 'status': 'Processing failed', 'error': str(e)}
+            results[path] = result
+            timings.merge(result.get('timings'))
+            queue_system_lookup(lookups, result)
+            if result.get('status') == 'Processing failed':
+                failed += 1
+            else:
+                # Checkpoint immediately so an interrupted run resumes from here
+                state_file.write(json.dumps({'sha256': sha256, 'path': path, 'result': result}) + '\n')
+                state_file.flush()
+            print(f"[{done}/{len(pending)}] {result.get('status')}: {os.path.relpath(path, folder)}")
+
+    ordered = [results[path] for path in paths]
+    with timings.stage('system_check'):
+        apply_system_hours(ordered, lookups)
+    response = build_bulk_response(ordered, ImageAdmission(), timings)
+    write_timesheet_workbook(response['entries'], output, file_results=response['results'])
+
+    elapsed = time.perf_counter() - started
+    processed = len(pending)
+    processed_paths = {path for path, sha256 in pending}
+    images = sum(results[path].get('images_processed', 0) for path in processed_paths)
+    summary = response['summary']
+    print("\n📊 Batch complete")
+    print(f"   Files:       {len(paths)} total, {processed} processed, {len(paths) - processed} resumed, {failed} failed")
+    print(f"   Documents:   {summary['successful_documents']} successful, {summary['discrepancies_found']} discrepancies")
+    print(f"   Entries:     {summary['total_entries']} from {summary['total_images']} images")
+    print(f"   Elapsed:     {elapsed:.1f}s")
+    if elapsed > 0 and processed:
+        print(f"   Throughput:  {processed / elapsed:.2f} files/s, {images / elapsed:.2f} images/s")
+    print(f"   Excel:       {output}")
+    return 0 if failed == 0 else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Process a folder of timesheets offline')
+    parser.add_argument('folder', help='directory to scan recursively for .docx files and screenshots')
+    parser.add_argument('--output', default=f"timesheet_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+    parser.add_argument('--workers', type=int, default=available_cpus(), help='parallel processes (default: all cores)')
+    parser.add_argument('--state', help='resume state file (default: next to the output workbook)')
+    parser.add_argument('--no-resume', action='store_true', help='reprocess every file')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        parser.error(f"not a directory: {args.folder}")
+    state_path = args.state or os.path.join(
+        os.path.dirname(os.path.abspath(args.output)), '.timeverify_batch_state.jsonl'
+    )
+    return run(args.folder, args.output, max(1, args.workers), state_path, resume=not args.no_resume)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
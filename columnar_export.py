@@ -0,0 +1,76 @@
+from system_of_record import parse_entry_date
+
+PARQUET_MIMETYPE = 'application/vnd.apache.parquet'
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.file'
+COLUMNAR_FORMATS = {'parquet': PARQUET_MIMETYPE, 'arrow': ARROW_MIMETYPE}
+
+# Entries are converted and written this many rows at a time
+RECORD_BATCH_ROWS = 10000
+
+
+def entry_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('consultant', pa.string()),
+        ('date', pa.date32()),
+        ('hours', pa.float64()),
+        ('needs_check', pa.bool_()),
+        ('source_file', pa.string()),
+        ('confidence', pa.float64()),
+    ])
+
+
+def _parse_date(value, cache):
+    # Same parsing as system-of-record week matching and stored-result date filters
+    if value not in cache:
+        cache[value] = parse_entry_date(value)
+    return cache[value]
+
+
+def _iter_record_batches(entries, schema, batch_rows):
+    """Convert entries column-wise into record batches of `batch_rows`"""
+    import pyarrow as pa
+
+    dates = {}
+    columns = {name: [] for name in schema.names}
+    for entry in entries:
+        hours = entry.get('Hours')
+        numeric = isinstance(hours, (int, float))
+        columns['consultant'].append(entry.get('Name'))
+        columns['date'].append(_parse_date(entry.get('Date'), dates))
+        columns['hours'].append(float(hours) if numeric else None)
+        columns['needs_check'].append(not numeric)
+        columns['source_file'].append(entry.get('source_file'))
+        columns['confidence'].append(entry.get('confidence'))
+        if len(columns['consultant']) >= batch_rows:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+            columns = {name: [] for name in schema.names}
+    if columns['consultant']:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def write_columnar_entries(entries, output, file_format='parquet', batch_rows=RECORD_BATCH_ROWS):
+    """Write entries as typed Parquet or Arrow IPC (file format) to a path or binary file object.
+
+    Rows are converted and written in record batches, so memory is bounded by
+    `batch_rows` rather than the number of entries. Returns the row count.
+    """
+    import pyarrow as pa
+
+    schema = entry_schema()
+    rows = 0
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(output, schema, compression='zstd')
+    elif file_format == 'arrow':
+        writer = pa.ipc.new_file(output, schema)
+    else:
+        raise ValueError(f"Unsupported columnar format: {file_format}")
+    try:
+        for batch in _iter_record_batches(entries, schema, batch_rows):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        writer.close()
+    return rows
@@ -0,0 +1,196 @@
+import csv
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+from structured_logging import fields, get_logger
+
+log = get_logger('consultant_roster')
+
+CONSULTANT_ROSTER_PATH = os.environ.get('CONSULTANT_ROSTER_PATH', '')
+ROSTER_MATCH_THRESHOLD = float(os.environ.get('ROSTER_MATCH_THRESHOLD', 0.5))
+ROSTER_RELOAD_INTERVAL = float(os.environ.get('ROSTER_RELOAD_INTERVAL', 30))
+
+NAME_COLUMNS = ('name', 'consultant', 'consultant_name', 'full_name')
+ID_COLUMNS = ('id', 'consultant_id', 'employee_id')
+ALIAS_COLUMNS = ('aliases', 'alias')
+
+# Filename noise that never belongs to a person's name ("john smith week49 final")
+NOISE_TOKENS = {
+    'week', 'wk', 'final', 'timesheet', 'timesheets', 'ts', 'draft', 'copy', 'signed',
+    'hours', 'v', 'rev', 'updated', 'new', 'screenshot', 'doc', 'docx'
+}
+
+
+def normalize_name(name):
+    """Lowercase, strip punctuation/digits and filename noise words"""
+    tokens = re.split(r'[^a-z]+', str(name).lower())
+    return ' '.join(t for t in tokens if t and t not in NOISE_TOKENS and not re.match(r'^(week|wk)\d*$', t))
+
+
+def trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _RosterIndex:
+    """Immutable trigram index over one roster snapshot"""
+
+    def __init__(self, consultants):
+        self.consultants = consultants          # [(display_name, consultant_id, aliases)]
+        self.keys = []                          # [(trigram set, consultant index)]
+        self.postings = defaultdict(list)       # trigram -> [key index]
+        self.exact = {}                         # normalized name -> consultant index
+        for consultant_index, (display_name, consultant_id, aliases) in enumerate(consultants):
+            for variant in [display_name, *aliases]:
+                normalized = normalize_name(variant)
+                if not normalized:
+                    continue
+                grams = frozenset(trigrams(normalized))
+                key_index = len(self.keys)
+                self.keys.append((grams, consultant_index))
+                self.exact.setdefault(normalized, consultant_index)
+                for gram in grams:
+                    self.postings[gram].append(key_index)
+
+    def lookup(self, normalized, threshold):
+        if normalized in self.exact:
+            return self.exact[normalized], 1.0
+        grams = trigrams(normalized)
+        # Prefix filtering: a key scoring at least `floor` shares >= floor*|A|/(2-floor) trigrams, so
+        # it must contain one of the rarest (|A| - needed + 1). The floor rises as better matches are
+        # found, so the very common grams (first names) are usually never probed.
+        rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+        seen = set()
+        best_key, best_score = None, 0.0
+        position = 0
+        while True:
+            floor = max(threshold, best_score)
+            needed = max(1, math.ceil(floor * len(grams) / (2 - floor)))
+            if position >= len(grams) - needed + 1:
+                break
+            for key_index in self.postings.get(rarest[position], ()):
+                if key_index in seen:
+                    continue
+                seen.add(key_index)
+                key_grams = self.keys[key_index][0]
+                # Dice coefficient over trigram sets
+                score = 2.0 * len(grams & key_grams) / (len(grams) + len(key_grams))
+                if score > best_score:
+                    best_key, best_score = key_index, score
+            position += 1
+        if best_key is None or best_score < threshold:
+            return None, best_score
+        return self.keys[best_key][1], best_score
+
+
+class ConsultantRoster:
+    """Consultant roster loaded from CSV/XLSX with trigram-indexed fuzzy name resolution.
+
+    The file is re-read in a background thread whenever its modification time changes.
+    """
+
+    def __init__(self, path, threshold=None, reload_interval=None):
+        self.path = path
+        self.threshold = ROSTER_MATCH_THRESHOLD if threshold is None else threshold
+        self.reload_interval = ROSTER_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        self._index = _RosterIndex([])
+        self._mtime = None
+        self.loaded_at = None
+        self.reload()
+
+    def _read_rows(self):
+        if self.path.lower().endswith(('.xlsx', '.xlsm')):
+            from openpyxl import load_workbook
+            wb = load_workbook(self.path, read_only=True, data_only=True)
+            try:
+                rows = wb.active.iter_rows(values_only=True)
+                headers = [str(h or '').strip().lower() for h in next(rows, [])]
+                return [dict(zip(headers, row)) for row in rows]
+            finally:
+                wb.close()
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            return [{(k or '').strip().lower(): v for k, v in row.items()} for row in csv.DictReader(f)]
+
+    @staticmethod
+    def _first(row, columns):
+        for column in columns:
+            value = row.get(column)
+            if value not in (None, ''):
+                return str(value).strip()
+        return None
+
+    def reload(self):
+        """Rebuild the index from the roster file and swap it in; returns True if reloaded"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            consultants = []
+            for row in self._read_rows():
+                name = self._first(row, NAME_COLUMNS)
+                if not name:
+                    continue
+                aliases = [a.strip() for a in (self._first(row, ALIAS_COLUMNS) or '').split(';') if a.strip()]
+                consultants.append((name, self._first(row, ID_COLUMNS), aliases))
+            started = time.perf_counter()
+            index = _RosterIndex(consultants)
+            self._index = index  # Atomic swap; lookups in flight keep the old snapshot
+            self._mtime = mtime
+            self.loaded_at = time.time()
+            log.info("Roster loaded", extra=fields(
+                consultants=len(consultants), path=self.path,
+                index_ms=round((time.perf_counter() - started) * 1000)))
+            return True
+        except Exception as e:
+            log.error("Roster load failed", extra=fields(path=self.path, error=str(e)))
+            return False
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            try:
+                if os.path.getmtime(self.path) != self._mtime:
+                    self.reload()
+            except OSError:
+                continue
+
+    def start_watching(self):
+        """Reload in the background when the roster file changes"""
+        thread = threading.Thread(target=self._watch, name='roster-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def resolve(self, raw_name):
+        """Best roster match for a free-form name: {'input', 'matched', 'consultant_id', 'score'} or None"""
+        normalized = normalize_name(raw_name)
+        if not normalized:
+            return None
+        index = self._index
+        consultant_index, score = index.lookup(normalized, self.threshold)
+        match = {'input': raw_name, 'score': round(score, 3)}
+        if consultant_index is None:
+            match.update({'matched': None, 'consultant_id': None})
+        else:
+            name, consultant_id, _ = index.consultants[consultant_index]
+            match.update({'matched': name, 'consultant_id': consultant_id})
+        return match
+
+    def status(self):
+        return {
+            'path': self.path,
+            'consultants': len(self._index.consultants),
+            'threshold': self.threshold,
+            'loaded_at': self.loaded_at
+        }
+
+
+def load_roster_from_config():
+    """Roster from CONSULTANT_ROSTER_PATH, or None if not configured.
+
+    Call start_watching() in each worker process to pick up file changes.
+    """
+    if not CONSULTANT_ROSTER_PATH:
+        return None
+    return ConsultantRoster(CONSULTANT_ROSTER_PATH)
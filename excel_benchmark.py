@@ -0,0 +1,107 @@
+"""Benchmark for the Excel export.
+
+Compares the original in-memory workbook (fresh Border objects on every cell)
+with the streaming write-only export at several row counts. Each run happens
+in its own process so peak RSS is measured independently:
+
+    python excel_benchmark.py --rows 10000 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def make_entries(rows):
+    """Synthetic bulk-job entries; every 20th row needs checking"""
+    for i in range(rows):
+        yield {
+            'Name': f"Consultant {i % 500}",
+            'Date': f"12/{i % 28 + 1:02d}/2024",
+            'Hours': 'CHECK' if i % 20 == 0 else 8,
+            'source_file': f"consultant_{i % 500}_week49.docx"
+        }
+
+
+def legacy_workbook(entries, output):
+    """The export as it was before streaming: a full Workbook with per-cell styles"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Border, Side
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Timesheet Data"
+    headers = ['Name', 'Date', 'Hours', 'Source File']
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                             top=Side(style='thin'), bottom=Side(style='thin'))
+    rows = 0
+    for row_idx, entry in enumerate(entries, 2):
+        values = [entry['Name'], entry['Date'], entry['Hours'], entry['source_file']]
+        for col, value in enumerate(values, 1):
+            cell = ws.cell(row=row_idx, column=col, value=value)
+            cell.border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                                 top=Side(style='thin'), bottom=Side(style='thin'))
+        if entry['Hours'] == "CHECK":
+            hours_cell = ws.cell(row=row_idx, column=3)
+            hours_cell.fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+            hours_cell.font = Font(color="FF0000")
+        rows += 1
+    ws.auto_filter.ref = f"A1:D{rows + 1}"
+    wb.save(output)
+    return rows
+
+
+def run_one(mode, rows):
+    """Generate one workbook in this process and report time, peak RSS and file size"""
+    from excel_export import write_timesheet_workbook
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'benchmark.xlsx')
+        started = time.perf_counter()
+        if mode == 'legacy':
+            legacy_workbook(make_entries(rows), path)
+        else:
+            write_timesheet_workbook(make_entries(rows), path, include_source=True)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+    # ru_maxrss is KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {'mode': mode, 'rows': rows, 'seconds': round(elapsed, 2),
+            'peak_rss_mb': round(peak_mb, 1), 'file_mb': round(size / 1024 / 1024, 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Excel export')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--modes', nargs='+', default=['legacy', 'streaming'], choices=['legacy', 'streaming'])
+    parser.add_argument('--single', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(run_one(args.single[0], int(args.single[1]))))
+        return 0
+
+    print(f"{'mode':<10} {'rows':>8} {'seconds':>8} {'rows/s':>9} {'peak MB':>8} {'file MB':>8}")
+    for rows in args.rows:
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, __file__, '--single', mode, str(rows)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            rate = result['rows'] / result['seconds'] if result['seconds'] else 0
+            print(f"{result['mode']:<10} {result['rows']:>8} {result['seconds']:>8} {rate:>9.0f} "
+                  f"{result['peak_rss_mb']:>8} {result['file_mb']:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+EXCEL_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+HEADER_STYLE = 'Timesheet Header'
+CELL_STYLE = 'Timesheet Cell'
+
+COLUMN_WIDTHS = {'Name': 25, 'Date': 15, 'Hours': 10, 'Source File': 30}
+
+# Reconciliation sheets: (title, headers, column widths)
+CONSULTANT_SHEET = ("By Consultant", ['Consultant', 'Week', 'Entries', 'Timesheet Hours', 'System Hours',
+                                      'Difference', 'CHECK Entries', 'Status'], [25, 12, 10, 16, 14, 12, 14, 22])
+WEEK_SHEET = ("By Week", ['Week', 'Consultants', 'Entries', 'Hours', 'CHECK Entries'], [12, 12, 10, 10, 14])
+DISCREPANCY_SHEET = ("Discrepancies", CONSULTANT_SHEET[1], CONSULTANT_SHEET[2])
+
+
+def _named_styles():
+    from openpyxl.styles import NamedStyle, Font, PatternFill, Border, Side
+
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header = NamedStyle(
+        name=HEADER_STYLE,
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+        border=border
+    )
+    cell = NamedStyle(name=CELL_STYLE, border=border)
+    return header, cell
+
+
+def _check_highlight(value='CHECK'):
+    """Red highlight for cells equal to `value`; replaces the per-cell fill on CHECK hours"""
+    from openpyxl.formatting.rule import CellIsRule
+    from openpyxl.styles import Font, PatternFill
+
+    return CellIsRule(
+        operator='equal',
+        formula=[f'"{value}"'],
+        font=Font(color="FF0000"),
+        fill=PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+    )
+
+
+def _column_letter(index):
+    from openpyxl.utils import get_column_letter
+    return get_column_letter(index)
+
+
+def _write_table(wb, sheet, rows, styled):
+    """Write a small summary sheet (title, headers, widths) with the shared styles"""
+    title, headers, widths = sheet
+    ws = wb.create_sheet(title)
+    for index, width in enumerate(widths, 1):
+        ws.column_dimensions[_column_letter(index)].width = width
+    ws.append([styled(ws, header, HEADER_STYLE) for header in headers])
+    for row in rows:
+        ws.append([styled(ws, value, CELL_STYLE) for value in row])
+    ws.auto_filter.ref = f"A1:{_column_letter(len(headers))}{len(rows) + 1}"
+    return ws
+
+
+def write_timesheet_workbook(entries, output, include_source=None, file_results=()):
+    """Stream entries into the "Timesheet Data" workbook layout; returns the number of rows written.
+
+    Uses openpyxl's write-only mode: rows are serialized as they are appended, every
+    cell shares one of two named styles, and CHECK hours are highlighted by a single
+    conditional formatting rule, so memory doesn't grow with the row count.
+    `entries` may be any iterable when `include_source` is given; `output` is a
+    path or binary file object.
+
+    The same pass accumulates the reconciliation sheets (per consultant and week
+    against the system hours in `file_results`, per ISO week, and discrepancies).
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from reconciliation import Reconciliation
+
+    if include_source is None:
+        entries = entries if isinstance(entries, list) else list(entries)
+        include_source = any('source_file' in entry for entry in entries)
+
+    headers = ['Name', 'Date', 'Hours']
+    if include_source:
+        headers.append('Source File')
+    last_column = _column_letter(len(headers))
+
+    wb = Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+    ws = wb.create_sheet("Timesheet Data")
+
+    # Column widths are written ahead of the rows, so they must be set first
+    for index, header in enumerate(headers, 1):
+        ws.column_dimensions[_column_letter(index)].width = COLUMN_WIDTHS[header]
+
+    def styled(sheet, value, style):
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.style = style
+        return cell
+
+    ws.append([styled(ws, header, HEADER_STYLE) for header in headers])
+
+    # Each appended row is serialized immediately, so one styled cell per column is reused for every row
+    name_cell, date_cell, hours_cell, source_cell = (styled(ws, None, CELL_STYLE) for _ in range(4))
+    row = [name_cell, date_cell, hours_cell, source_cell] if include_source else [name_cell, date_cell, hours_cell]
+    reconciliation = Reconciliation(file_results)
+    rows = 0
+    for entry in entries:
+        reconciliation.add(entry)
+        name_cell.value = entry.get('Name', '')
+        date_cell.value = entry.get('Date', '')
+        hours_cell.value = entry.get('Hours', '')
+        if include_source:
+            source_cell.value = entry.get('source_file', '')
+        ws.append(row)
+        rows += 1
+
+    # Conditional formatting and the filter are written after the rows, so the final size is known here
+    last_row = rows + 1
+    if rows:
+        ws.conditional_formatting.add(f"C2:C{last_row}", _check_highlight())
+    ws.auto_filter.ref = f"A1:{last_column}{last_row}"
+
+    consultants = _write_table(wb, CONSULTANT_SHEET, reconciliation.consultant_rows(), styled)
+    if reconciliation.by_consultant:
+        consultants.conditional_formatting.add(
+            f"H2:H{len(reconciliation.by_consultant) + 1}", _check_highlight('Discrepancy')
+        )
+    _write_table(wb, WEEK_SHEET, reconciliation.week_rows(), styled)
+    _write_table(wb, DISCREPANCY_SHEET, reconciliation.discrepancy_rows(), styled)
+
+    wb.save(output)
+    return rows
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import threading
+
+from metrics import cache_lookup
+
+EXPORT_CACHE_DIR = os.environ.get('EXPORT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'timeverify_exports'))
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get('EXPORT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+# Bump when an export layout changes so files built by older code are not served
+EXPORT_CACHE_VERSION = '1'
+
+
+class ExportCache:
+    """Size-bounded on-disk LRU of generated export files, keyed by content hash.
+
+    Files are published with an atomic rename, so several worker processes can
+    share the directory; a hit refreshes the file's mtime, which orders eviction.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or EXPORT_CACHE_DIR
+        self.max_bytes = EXPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def open(self, key, extension):
+        """Open a cached export for reading (marking it recently used), or None on a miss"""
+        path = self._path(key, extension)
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            cache_lookup('export', False)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        cache_lookup('export', True)
+        return f
+
+    def put(self, key, extension, write):
+        """Build an export with write(binary_file) and publish it under `key`; returns its path"""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.partial')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            path = self._path(key, extension)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self.evict(keep=path)
+        return path
+
+    def _files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.partial'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def evict(self, keep=None):
+        """Delete least recently used files (except `keep`) until the cache fits in max_bytes"""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def status(self):
+        files = self._files()
+        return {
+            'directory': self.directory,
+            'files': len(files),
+            'bytes': sum(size for _, size, _ in files),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,79 @@
+# Gunicorn configuration for the TimeVerify AI dashboard (production entrypoint)
+#
+#   gunicorn -c gunicorn.conf.py
+#
+import os
+import shutil
+import tempfile
+
+# Prometheus metrics are written per process into this directory and aggregated by /metrics.
+# It must be set before the app (or anything importing metrics.py) loads. Unless configured, each
+# gunicorn master gets its own, so instances sharing a host never mix or wipe each other's files.
+default_metrics_dir = os.path.join(tempfile.gettempdir(), f"timeverify_metrics_{os.getpid()}")
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', default_metrics_dir)
+os.makedirs(metrics_dir, exist_ok=True)
+
+from cpu_quota import available_cpus
+from ocr_concurrency import OCRConcurrencyController
+
+cpus = available_cpus()
+# Node-wide OCR slots for the configured mode (OCR_CONCURRENCY_MODE=throughput|latency)
+ocr_plan = OCRConcurrencyController(cpus=cpus, processes=1)
+
+wsgi_app = "app:create_app()"
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8080)}"
+
+# Import the app (and configure Tesseract) once in the master, then fork
+preload_app = True
+
+# OCR runs in a tesseract subprocess, so threads mostly wait on it; a few per worker keep uploads flowing
+worker_class = 'gthread'
+# Default to one worker per OCR slot; the app's controller splits the slots across workers
+workers = int(os.environ.get('GUNICORN_WORKERS', ocr_plan.pool_size))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+os.environ['GUNICORN_WORKERS'] = str(workers)
+
+# Bulk uploads can legitimately take minutes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers after N jobs to contain Tesseract/PIL memory growth (jitter avoids restarting all at once)
+max_requests = int(os.environ.get('WORKER_MAX_JOBS', 500))
+max_requests_jitter = max(1, max_requests // 10)
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Clear metric files left in the directory by a previous run (once per master, before workers fork)"""
+    for name in os.listdir(metrics_dir):
+        if name.endswith('.db'):
+            os.remove(os.path.join(metrics_dir, name))
+
+
+def on_exit(server):
+    if metrics_dir == default_metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def post_fork(server, worker):
+    """Warm each worker with a tiny OCR so the first real request doesn't pay the startup cost"""
+    from app import warmup_ocr, start_job_recovery, start_roster_watcher
+    warmup_ocr()
+    start_job_recovery()
+    start_roster_watcher()
+    server.log.info(f"Worker {worker.pid} warmed up")
+
+
+def child_exit(server, worker):
+    """Stop reporting a dead worker's live gauges (e.g. its OCR queue depth)"""
+    from metrics import mark_worker_dead
+    mark_worker_dead(worker.pid)
+
+
+def when_ready(server):
+    server.log.info(f"🚀 TimeVerify AI ready: {workers} workers x {threads} threads ({cpus} CPUs available, "
+                    f"OCR mode={ocr_plan.mode}, OMP_THREAD_LIMIT={ocr_plan.omp_threads})")
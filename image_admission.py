@@ -0,0 +1,204 @@
+import io
+import os
+import threading
+import zipfile
+from contextlib import contextmanager
+from PIL import Image
+
+from structured_logging import fields, get_logger
+
+log = get_logger('image_admission')
+
+# Pixel budgets (override via environment for larger/smaller containers)
+MAX_IMAGE_PIXELS = int(os.environ.get('MAX_IMAGE_PIXELS', 40_000_000))      # hard per-image limit
+MAX_REQUEST_PIXELS = int(os.environ.get('MAX_REQUEST_PIXELS', 200_000_000)) # decoded at once per request
+TARGET_IMAGE_PIXELS = int(os.environ.get('TARGET_IMAGE_PIXELS', 12_000_000))  # downsample above this
+# JPEG quality browsers use when re-encoding screenshots down to TARGET_IMAGE_PIXELS before upload
+CLIENT_IMAGE_QUALITY = float(os.environ.get('CLIENT_IMAGE_QUALITY', 0.92))
+MAX_COMPRESSION_RATIO = int(os.environ.get('MAX_COMPRESSION_RATIO', 1500))   # raw bytes / file bytes
+# Streamed archives can't be inspected before OCR starts; assume one image per this many uploaded bytes
+ARCHIVE_BYTES_PER_IMAGE = int(os.environ.get('ARCHIVE_BYTES_PER_IMAGE', 512 * 1024))
+
+ALLOWED_FORMATS = {'PNG', 'JPEG', 'GIF', 'BMP', 'TIFF', 'WEBP'}
+
+# Let PIL's own decompression bomb guard back up the per-image limit
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+
+class ImageRejected(Exception):
+    """Raised when an image fails header-only admission checks"""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ImageAdmission:
+    """Per-request admission stage: inspect image headers and enforce pixel budgets before decoding.
+
+    The request budget bounds pixels held decoded at the same time. Jobs that
+    share one admission across many documents wrap each in document(), which
+    gives its pixels back when the document is finished with.
+    """
+
+    def __init__(self, max_image_pixels=None, max_request_pixels=None, target_pixels=None):
+        self.max_image_pixels = max_image_pixels or MAX_IMAGE_PIXELS
+        self.max_request_pixels = max_request_pixels or MAX_REQUEST_PIXELS
+        self.target_pixels = target_pixels or TARGET_IMAGE_PIXELS
+        self.pixels_admitted = 0  # total over the request, for reporting
+        self.pixels_in_use = 0    # currently decoded, checked against the budget
+        self.decisions = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def document(self):
+        """Scope one document's images: their pixels stop counting against the budget when it finishes.
+
+        Documents sharing an admission are expected to run one at a time.
+        """
+        admitted_before = self.pixels_admitted
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.pixels_in_use -= self.pixels_admitted - admitted_before
+
+    def inspect(self, image_data):
+        """Read only the image header and return (image, format, width, height, bands)"""
+        try:
+            # Image.open is lazy: it parses the header but does not decode pixel data
+            image = Image.open(io.BytesIO(image_data))
+        except Image.DecompressionBombError as e:
+            raise ImageRejected(f"Decompression bomb detected: {e}")
+        except Exception as e:
+            raise ImageRejected(f"Unreadable image header: {e}")
+        width, height = image.size
+        return image, image.format, width, height, len(image.getbands())
+
+    def check(self, image_format, width, height, bands, data_size):
+        """Decide from header facts alone; returns the number of pixels to decode to"""
+        pixels = width * height
+        if image_format not in ALLOWED_FORMATS:
+            raise ImageRejected(f"Unsupported image format: {image_format}")
+        if pixels <= 0:
+            raise ImageRejected("Image has no pixels")
+        if pixels > self.max_image_pixels:
+            raise ImageRejected(
+                f"Image is {width}x{height} ({pixels:,} px), over the per-image limit of {self.max_image_pixels:,} px"
+            )
+        compression_ratio = (pixels * bands) / max(data_size, 1)
+        if pixels > self.target_pixels and compression_ratio > MAX_COMPRESSION_RATIO:
+            raise ImageRejected(
+                f"Suspicious compression ratio {compression_ratio:.0f}:1 for a {width}x{height} image"
+            )
+        admitted_pixels = min(pixels, self.target_pixels)
+        if self.pixels_in_use + admitted_pixels > self.max_request_pixels:
+            raise ImageRejected(
+                f"Request pixel budget of {self.max_request_pixels:,} px exhausted"
+            )
+        return admitted_pixels
+
+    def admit(self, image_data, label=None):
+        """Admit an encoded image and decode it as RGB, downsampling oversized images.
+
+        Returns the decoded image, or None if it was rejected (the reason is recorded).
+        """
+        decision = {'image': label or f"image_{len(self.decisions) + 1}", 'bytes': len(image_data)}
+        self.decisions.append(decision)
+        try:
+            image, image_format, width, height, bands = self.inspect(image_data)
+            decision.update({'format': image_format, 'width': width, 'height': height})
+            admitted_pixels = self.check(image_format, width, height, bands, len(image_data))
+        except ImageRejected as e:
+            decision.update({'action': 'rejected', 'reason': e.reason})
+            log.warning("Image rejected", extra=fields(image=decision['image'], reason=e.reason))
+            return None
+
+        pixels = width * height
+        scale = (admitted_pixels / pixels) ** 0.5
+        target_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        if scale < 1:
+            # JPEG can be decoded directly at a reduced scale; other formats are reduced after decode
+            image.draft('RGB', target_size)
+
+        try:
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            else:
+                image.load()
+        except Exception as e:
+            decision.update({'action': 'rejected', 'reason': f"Decode failed: {e}"})
+            log.warning("Image decode failed", extra=fields(image=decision['image'], error=str(e)))
+            return None
+
+        if scale < 1:
+            if image.size[0] * image.size[1] > admitted_pixels:
+                image = image.resize(target_size, Image.Resampling.LANCZOS)
+            decision.update({
+                'action': 'downsampled',
+                'reason': f"Downsampled from {width}x{height} to {image.size[0]}x{image.size[1]}"
+            })
+        else:
+            decision['action'] = 'admitted'
+
+        with self._lock:
+            self.pixels_admitted += admitted_pixels
+            self.pixels_in_use += admitted_pixels
+        return image
+
+    @property
+    def rejections(self):
+        return [d for d in self.decisions if d.get('action') == 'rejected']
+
+    def summary(self):
+        """Admission report included in API responses"""
+        return {
+            'images_inspected': len(self.decisions),
+            'images_admitted': sum(1 for d in self.decisions if d.get('action') in ('admitted', 'downsampled')),
+            'images_downsampled': sum(1 for d in self.decisions if d.get('action') == 'downsampled'),
+            'images_rejected': len(self.rejections),
+            'pixels_admitted': self.pixels_admitted,
+            'pixel_budget': self.max_request_pixels,
+            'decisions': self.decisions
+        }
+
+
+def estimate_image_work(image_data):
+    """Header-only work estimate for one encoded image: (image_count, pixels to OCR)"""
+    try:
+        width, height = Image.open(io.BytesIO(image_data)).size
+    except Exception:
+        return 1, TARGET_IMAGE_PIXELS
+    return 1, min(width * height, TARGET_IMAGE_PIXELS)
+
+
+def estimate_document_work(document_bytes):
+    """Header-only work estimate for a .docx: (image_count, pixels to OCR) from its word/media parts"""
+    images = 0
+    pixels = 0
+    try:
+        with zipfile.ZipFile(io.BytesIO(document_bytes)) as archive:
+            for member in archive.infolist():
+                if not member.filename.startswith('word/media/'):
+                    continue
+                images += 1
+                try:
+                    with archive.open(member) as f:
+                        # Headers live at the start of the file; a small prefix is enough for PIL
+                        width, height = Image.open(io.BytesIO(f.read(64 * 1024))).size
+                    pixels += min(width * height, TARGET_IMAGE_PIXELS)
+                except Exception:
+                    pixels += TARGET_IMAGE_PIXELS
+    except zipfile.BadZipFile:
+        return 0, 0
+    return images, pixels
+
+
+def estimate_archive_work(content_length):
+    """Work estimate for a streamed zip from its upload size alone: (image_count, pixels to OCR)"""
+    if not content_length:
+        return 0, 0
+    images = -(-content_length // ARCHIVE_BYTES_PER_IMAGE)
+    # The request's pixel budget caps what actually gets OCR'd
+    return images, min(images * TARGET_IMAGE_PIXELS, MAX_REQUEST_PIXELS)
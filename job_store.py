@@ -0,0 +1,270 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from structured_logging import fields, get_logger
+
+log = get_logger('job_store')
+
+# Must be on a persistent volume for jobs to survive a container restart (the Dockerfile mounts /data)
+JOB_STORE_PATH = os.environ.get('JOB_STORE_PATH', os.path.join(tempfile.gettempdir(), 'timeverify_jobs.sqlite3'))
+# A running job whose owner hasn't checkpointed for this long is considered interrupted
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 600))
+# Running jobs refresh their heartbeat this often, however long a single document takes
+JOB_HEARTBEAT_SECONDS = float(os.environ.get('JOB_HEARTBEAT_SECONDS', JOB_LEASE_SECONDS / 4))
+# A job recovered this many times without finishing (e.g. a document that keeps killing its worker) is failed
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+# Finished and failed jobs (results and any retained uploads) are purged this long after ending
+JOB_RETENTION_SECONDS = int(os.environ.get('JOB_RETENTION_SECONDS', 7 * 24 * 3600))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_documents INTEGER NOT NULL,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    heartbeat REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS job_documents (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    document BLOB,
+    result_json TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, position)
+);
+"""
+# Columns added after the first release, migrated in place
+JOB_COLUMNS = (
+    ('attempts', 'INTEGER NOT NULL DEFAULT 0'),  # times the job was recovered from a dead worker
+)
+
+# Job statuses: running -> finished | failed (recovered more than JOB_MAX_ATTEMPTS times)
+# Document statuses: pending -> done | failed (failed documents are retried on resubmission)
+FINISHED_STATUSES = ('done',)
+
+
+class JobStore:
+    """SQLite checkpoint store for bulk jobs: per-document results persisted as they finish"""
+
+    def __init__(self, path=None):
+        self.path = path or JOB_STORE_PATH
+        if path is None and 'JOB_STORE_PATH' not in os.environ:
+            log.warning("JOB_STORE_PATH not set - checkpoints are in container-local temp storage "
+                        "and will not survive a restart", extra=fields(path=self.path))
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @property
+    def owner(self):
+        # Read per call: the store is created in the gunicorn master and used from forked workers
+        return f"{os.uname().nodename if hasattr(os, 'uname') else 'local'}:{os.getpid()}"
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._initialized:
+                with self._init_lock:
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.executescript(SCHEMA)
+                    existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+                    for column, definition in JOB_COLUMNS:
+                        if column not in existing:
+                            conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+                    self._initialized = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def start_job(self, job_id, documents, kind='bulk'):
+        """Register a job and its documents (no-op for documents already recorded); claims the job"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, kind, status, total_documents, owner, created_at, heartbeat) "
+                "VALUES (?, ?, 'running', ?, ?, ?, ?)",
+                (job_id, kind, len(documents), self.owner, now, now)
+            )
+            # Recovery re-enters here for a running job and keeps its attempt count; a resubmission starts afresh
+            conn.execute(
+                "UPDATE jobs SET attempts = CASE WHEN status = 'running' THEN attempts ELSE 0 END, "
+                "status = 'running', owner = ?, heartbeat = ?, finished_at = NULL WHERE job_id = ?",
+                (self.owner, now, job_id)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_documents (job_id, position, filename, status, document, updated_at) "
+                "VALUES (?, ?, ?, 'pending', ?, ?)",
+                [(job_id, position, filename, document_bytes, now)
+                 for position, (filename, document_bytes) in enumerate(documents)]
+            )
+
+    def add_document(self, job_id, position, filename, document_bytes):
+        """Append a document to a job whose documents arrive one at a time (e.g. streamed archive members)"""
+        now = time.time()
+        with self._connect() as conn:
+            added = conn.execute(
+                "INSERT OR IGNORE INTO job_documents (job_id, position, filename, status, document, updated_at) "
+                "VALUES (?, ?, ?, 'pending', ?, ?)",
+                (job_id, position, filename, document_bytes, now)
+            ).rowcount
+            conn.execute(
+                "UPDATE jobs SET total_documents = total_documents + ?, heartbeat = ? WHERE job_id = ?",
+                (added, now, job_id)
+            )
+
+    def completed_documents(self, job_id):
+        """Finished per-document results keyed by position"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT position, result_json FROM job_documents WHERE job_id = ? AND status IN (%s)"
+                % ','.join('?' * len(FINISHED_STATUSES)),
+                (job_id, *FINISHED_STATUSES)
+            ).fetchall()
+        return {position: json.loads(result_json) for position, result_json in rows}
+
+    def save_document(self, job_id, position, result, status='done'):
+        """Checkpoint one document's result; the uploaded bytes are dropped once it is done"""
+        now = time.time()
+        with self._connect() as conn:
+            if status in FINISHED_STATUSES:
+                conn.execute(
+                    "UPDATE job_documents SET status = ?, result_json = ?, document = NULL, updated_at = ? "
+                    "WHERE job_id = ? AND position = ?",
+                    (status, json.dumps(result), now, job_id, position)
+                )
+            else:
+                conn.execute(
+                    "UPDATE job_documents SET status = ?, result_json = ?, updated_at = ? "
+                    "WHERE job_id = ? AND position = ?",
+                    (status, json.dumps(result), now, job_id, position)
+                )
+            conn.execute("UPDATE jobs SET heartbeat = ? WHERE job_id = ?", (now, job_id))
+
+    def heartbeat(self, job_id):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat = ? WHERE job_id = ? AND owner = ? AND status = 'running'",
+                         (time.time(), job_id, self.owner))
+
+    @contextmanager
+    def keepalive(self, job_id, interval=None):
+        """Refresh the job's heartbeat in the background while the block runs.
+
+        Without it a live worker on one slow document would look interrupted
+        and have its job claimed by another worker.
+        """
+        interval = interval or JOB_HEARTBEAT_SECONDS
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval):
+                try:
+                    self.heartbeat(job_id)
+                except sqlite3.Error as e:
+                    log.warning("Job heartbeat failed", extra=fields(job_id=job_id, error=str(e)))
+
+        threading.Thread(target=beat, name='job-heartbeat', daemon=True).start()
+        try:
+            yield
+        finally:
+            stop.set()
+
+    def finish_job(self, job_id):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'finished', heartbeat = ?, finished_at = ? WHERE job_id = ?",
+                (now, now, job_id)
+            )
+
+    def job_status(self, job_id):
+        """Job row plus per-status document counts, or None if unknown"""
+        with self._connect() as conn:
+            job = conn.execute(
+                "SELECT job_id, kind, status, total_documents, created_at, finished_at, attempts "
+                "FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM job_documents WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return {
+            'job_id': job[0],
+            'kind': job[1],
+            'status': job[2],
+            'total_documents': job[3],
+            'created_at': job[4],
+            'finished_at': job[5],
+            'recovery_attempts': job[6],
+            'documents': counts
+        }
+
+    def claim_interrupted_job(self, lease_seconds=None, max_attempts=None):
+        """Atomically take over one running job whose owner stopped checkpointing; returns job_id or None.
+
+        A job already recovered max_attempts times is marked failed instead,
+        along with its unfinished documents, so a document that crashes its
+        worker isn't retried forever (resubmitting the job tries it again).
+        """
+        lease = lease_seconds or JOB_LEASE_SECONDS
+        max_attempts = JOB_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        now = time.time()
+        with self._connect() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT job_id, attempts FROM jobs WHERE status = 'running' AND heartbeat < ? "
+                    "ORDER BY created_at LIMIT 1",
+                    (now - lease,)
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, attempts = row
+                if attempts < max_attempts:
+                    break
+                conn.execute("UPDATE jobs SET status = 'failed', finished_at = ? WHERE job_id = ?", (now, job_id))
+                conn.execute(
+                    "UPDATE job_documents SET status = 'failed', updated_at = ? WHERE job_id = ? AND status = 'pending'",
+                    (now, job_id)
+                )
+                log.error("Giving up on interrupted job", extra=fields(job_id=job_id, attempts=attempts))
+            claimed = conn.execute(
+                "UPDATE jobs SET owner = ?, heartbeat = ?, attempts = attempts + 1 "
+                "WHERE job_id = ? AND status = 'running' AND heartbeat < ?",
+                (self.owner, now, job_id, now - lease)
+            ).rowcount
+        return job_id if claimed else None
+
+    def load_documents(self, job_id):
+        """(filename, bytes) for every document of a job; bytes are None for finished documents"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT filename, document FROM job_documents WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return [(filename, bytes(document) if document is not None else None) for filename, document in rows]
+
+    def purge_finished_jobs(self, retention_seconds=None):
+        """Delete jobs finished or failed more than retention_seconds ago, with their documents; returns the count"""
+        retention = JOB_RETENTION_SECONDS if retention_seconds is None else retention_seconds
+        cutoff = time.time() - retention
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM job_documents WHERE job_id IN "
+                "(SELECT job_id FROM jobs WHERE status IN ('finished', 'failed') AND finished_at < ?)",
+                (cutoff,)
+            )
+            purged = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('finished', 'failed') AND finished_at < ?", (cutoff,)
+            ).rowcount
+        return purged
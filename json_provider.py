@@ -0,0 +1,72 @@
+import gzip
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # The standard library encoder is used instead
+    orjson = None
+
+from static_assets import MIN_COMPRESS_BYTES, brotli
+
+# Dynamic responses are compressed per request, so favour speed over ratio
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSED_MIMETYPES = ('application/json',)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson when it is installed.
+
+    Keys are not sorted (orjson is several times faster without it). Values
+    orjson can't encode natively go through the standard provider's default(),
+    and anything it rejects outright (e.g. integers beyond 64 bits) falls back
+    to the standard encoder.
+    """
+
+    def _encode(self, obj, indent=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=options)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or set(kwargs) - {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._encode(obj, bool(kwargs.get('indent'))).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = self._encode(obj, indent) + b'\n'
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def compress_response(response):
+    """after_request hook: brotli/gzip-encode sizeable JSON bodies for clients that accept it"""
+    if (response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESSED_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_BYTES:
+        return response
+    if brotli is not None and request.accept_encodings['br']:
+        encoding, body = 'br', brotli.compress(body, quality=BROTLI_QUALITY)
+    elif request.accept_encodings['gzip']:
+        encoding, body = 'gzip', gzip.compress(body, compresslevel=GZIP_LEVEL)
+    else:
+        return response
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,153 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import SHED_DECISIONS
+from structured_logging import fields, get_logger
+
+log = get_logger('load_shedding')
+
+# Latency objectives per priority class (seconds until the OCR work would finish)
+OCR_SLO_SECONDS = {
+    'interactive': float(os.environ.get('OCR_SLO_INTERACTIVE', 30)),
+    'batch': float(os.environ.get('OCR_SLO_BATCH', 600)),
+}
+# Initial OCR cost estimate, refined from completed work (seconds per megapixel, all config attempts)
+DEFAULT_SECONDS_PER_MEGAPIXEL = float(os.environ.get('OCR_SECONDS_PER_MEGAPIXEL', 1.0))
+EWMA_ALPHA = 0.2
+
+
+class ShedDecision:
+    """Outcome of an admission check for one request"""
+
+    def __init__(self, priority, images, pixels, admitted, status_code=200, reason=None,
+                 estimated_wait=0.0, retry_after=0):
+        self.priority = priority
+        self.images = images
+        self.pixels = pixels
+        self.admitted = admitted
+        self.status_code = status_code
+        self.reason = reason
+        self.estimated_wait = estimated_wait
+        self.retry_after = retry_after
+
+    def to_dict(self):
+        return {
+            'error': self.reason,
+            'status': 'shed',
+            'priority': self.priority,
+            'estimated_wait_seconds': round(self.estimated_wait, 1),
+            'retry_after': self.retry_after
+        }
+
+
+class RequestShed(Exception):
+    """Raised when a request is turned away by admission control"""
+
+    def __init__(self, decision):
+        super().__init__(decision.reason)
+        self.decision = decision
+
+
+class LoadShedder:
+    """Admission control from OCR queue depth and estimated work (image count x pixels)"""
+
+    def __init__(self, controller, slo_seconds=None, max_queue_depth=None):
+        self.controller = controller
+        self.slo_seconds = dict(slo_seconds or OCR_SLO_SECONDS)
+        self.max_queue_depth = max_queue_depth or int(
+            os.environ.get('OCR_MAX_QUEUE_DEPTH', controller.pool_size * 24)
+        )
+        self.seconds_per_pixel = DEFAULT_SECONDS_PER_MEGAPIXEL / 1_000_000
+        self._lock = threading.Lock()
+        # Estimated pixels admitted but not yet finished, per priority class
+        self.outstanding = {name: 0 for name in self.slo_seconds}
+        self.counters = {}
+
+    def _count(self, priority, outcome):
+        key = (priority, outcome)
+        self.counters[key] = self.counters.get(key, 0) + 1
+        SHED_DECISIONS.labels(priority=priority, outcome=outcome).inc()
+
+    def _backlog_pixels(self, priority):
+        # Interactive work preempts batch, so it only queues behind other interactive work
+        if priority == 'interactive':
+            return self.outstanding['interactive']
+        return sum(self.outstanding.values())
+
+    def estimate_wait(self, priority, pixels):
+        return (self._backlog_pixels(priority) + pixels) * self.seconds_per_pixel / self.controller.pool_size
+
+    def admit(self, images, pixels, priority='interactive'):
+        """Decide whether to accept a request; admitted work is reserved until released"""
+        if priority not in self.slo_seconds:
+            priority = 'interactive'
+        with self._lock:
+            queue_depth = self.controller.waiting
+            estimated_wait = self.estimate_wait(priority, pixels)
+            slo = self.slo_seconds[priority]
+
+            if queue_depth >= self.max_queue_depth:
+                backlog_wait = self.estimate_wait(priority, 0)
+                decision = ShedDecision(
+                    priority, images, pixels, False, 503,
+                    f"OCR queue is full ({queue_depth} waiting); try again shortly",
+                    estimated_wait, max(1, math.ceil(backlog_wait))
+                )
+                self._count(priority, 'shed_queue_full')
+            elif estimated_wait > slo and self._backlog_pixels(priority) > 0:
+                # Retry once enough backlog has drained for this request to fit the SLO
+                drain = estimated_wait - slo
+                decision = ShedDecision(
+                    priority, images, pixels, False, 429,
+                    f"Estimated OCR time {estimated_wait:.0f}s for {images} image(s) exceeds the {slo:.0f}s objective",
+                    estimated_wait, max(1, math.ceil(drain))
+                )
+                self._count(priority, 'shed_slo')
+            else:
+                decision = ShedDecision(priority, images, pixels, True, estimated_wait=estimated_wait)
+                self.outstanding[priority] += pixels
+                self._count(priority, 'admitted')
+
+        if not decision.admitted:
+            log.warning("Shedding request", extra=fields(
+                priority=priority, images=images, pixels=pixels, reason=decision.reason))
+        return decision
+
+    @contextmanager
+    def work(self, decision):
+        """Track an admitted request until it finishes and refine the per-pixel cost estimate"""
+        started = time.perf_counter()
+        waited_before = self.controller.thread_wait_seconds()
+        try:
+            yield
+        finally:
+            # Exclude time spent queued for OCR slots so the estimate reflects processing cost only
+            waited = self.controller.thread_wait_seconds() - waited_before
+            elapsed = max(0.0, time.perf_counter() - started - waited)
+            with self._lock:
+                self.outstanding[decision.priority] = max(0, self.outstanding[decision.priority] - decision.pixels)
+                if decision.pixels > 0:
+                    observed = elapsed / decision.pixels
+                    self.seconds_per_pixel += EWMA_ALPHA * (observed - self.seconds_per_pixel)
+
+    def run(self, images, pixels, priority, fn):
+        """Admit the work and run fn(), or raise RequestShed"""
+        decision = self.admit(images, pixels, priority)
+        if not decision.admitted:
+            raise RequestShed(decision)
+        with self.work(decision):
+            return fn()
+
+    def status(self):
+        with self._lock:
+            return {
+                'slo_seconds': self.slo_seconds,
+                'max_queue_depth': self.max_queue_depth,
+                'queue_depth': self.controller.waiting,
+                'outstanding_pixels': dict(self.outstanding),
+                'seconds_per_megapixel': round(self.seconds_per_pixel * 1_000_000, 3),
+                'decisions': {f"{priority}.{outcome}": n for (priority, outcome), n in self.counters.items()}
+            }
@@ -0,0 +1,142 @@
+"""Load test for the TimeVerify AI API.
+
+Run against an already running server:
+
+    python loadtest.py --url http://localhost:8080 --concurrency 8 --duration 30
+
+Or compare the Flask dev server (python app.py) with the gunicorn entrypoint:
+
+    python loadtest.py --compare
+"""
+import argparse
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image, ImageDraw
+
+
+def make_screenshot():
+    """Render a small synthetic timesheet screenshot"""
+    image = Image.new('RGB', (900, 300), 'white')
+    draw = ImageDraw.Draw(image)
+    for i, day in enumerate(range(2, 7)):
+        draw.text((20, 20 + i * 50), f"12/0{day}/2024    Enterprise Product Work    8 hours", fill='black')
+    buf = io.BytesIO()
+    image.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def run_load(url, endpoint, concurrency, duration):
+    """Hammer one endpoint for `duration` seconds and return throughput/latency stats"""
+    payload = make_screenshot()
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if endpoint == 'health':
+                    response = session.get(f"{url}/health", timeout=60)
+                else:
+                    response = session.post(
+                        f"{url}/api/process-screenshot",
+                        files={'screenshot': ('load.png', payload, 'image/png')},
+                        data={'consultant_name': 'John Smith'},
+                        timeout=300
+                    )
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / wall if wall else 0,
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+    }
+
+
+def wait_until_up(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{url}/health", timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def compare(args):
+    """Start the dev server and gunicorn in turn and run the same load against each"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    servers = [
+        ('flask dev server', [sys.executable, 'app.py'], 8091),
+        ('gunicorn', [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'], 8092),
+    ]
+    rows = []
+    for label, cmd, port in servers:
+        env = dict(os.environ, PORT=str(port), HOST='127.0.0.1')
+        proc = subprocess.Popen(cmd, cwd=here, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        url = f"http://127.0.0.1:{port}"
+        try:
+            if not wait_until_up(url):
+                print(f"❌ {label} did not start")
+                continue
+            print(f"🔍 Loading {label} ({args.endpoint}, c={args.concurrency}, {args.duration}s)...")
+            rows.append((label, run_load(url, args.endpoint, args.concurrency, args.duration)))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+    return rows
+
+
+def print_table(rows):
+    print(f"\n{'server':<20}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, stats in rows:
+        print(f"{label:<20}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.2f}"
+              f"{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='TimeVerify AI load test')
+    parser.add_argument('--url', default='http://localhost:8080')
+    parser.add_argument('--endpoint', choices=['screenshot', 'health'], default='screenshot')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=int, default=30)
+    parser.add_argument('--compare', action='store_true', help='compare dev server vs gunicorn')
+    args = parser.parse_args()
+
+    if args.compare:
+        print_table(compare(args))
+    else:
+        print_table([(args.url, run_load(args.url, args.endpoint, args.concurrency, args.duration))])
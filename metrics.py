@@ -0,0 +1,114 @@
+import os
+import time
+
+from flask import Response, g, request
+
+try:
+    import prometheus_client
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
+except ImportError:  # Metrics become no-ops and /metrics reports that it is unavailable
+    prometheus_client = None
+
+# Under gunicorn every worker writes its samples to files here and /metrics aggregates them
+# (set by gunicorn.conf.py before anything imports this module)
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+OCR_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+REQUEST_SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+IMAGES_PER_DOCUMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+class _NullMetric:
+    """Stand-in when prometheus_client is not installed"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+def _metric(cls_name, name, documentation, labels=(), **kwargs):
+    if prometheus_client is None:
+        return _NullMetric()
+    return getattr(prometheus_client, cls_name)(name, documentation, labels, **kwargs)
+
+
+HTTP_REQUESTS = _metric('Counter', 'timeverify_http_requests_total',
+                        'HTTP requests by endpoint, method and status', ('endpoint', 'method', 'status'))
+HTTP_REQUEST_SECONDS = _metric('Histogram', 'timeverify_http_request_duration_seconds',
+                               'Time to produce a response, by endpoint', ('endpoint',),
+                               buckets=REQUEST_SECONDS_BUCKETS)
+UPLOAD_BYTES = _metric('Counter', 'timeverify_upload_bytes_total',
+                       'Request body bytes received, by endpoint', ('endpoint',))
+OCR_SECONDS = _metric('Histogram', 'timeverify_ocr_duration_seconds',
+                      'Tesseract run time per OCR config attempt', ('config',), buckets=OCR_SECONDS_BUCKETS)
+OCR_QUEUE_DEPTH = _metric('Gauge', 'timeverify_ocr_queue_depth',
+                          'OCR attempts waiting for a slot', multiprocess_mode='livesum')
+IMAGES_PER_DOCUMENT = _metric('Histogram', 'timeverify_images_per_document',
+                              'Images admitted from each Word document', buckets=IMAGES_PER_DOCUMENT_BUCKETS)
+ENTRIES_PARSED = _metric('Counter', 'timeverify_entries_parsed_total', 'Timesheet entries parsed from OCR text')
+CHECK_ENTRIES = _metric('Counter', 'timeverify_check_entries_total',
+                        'Parsed entries whose hours could not be read (marked CHECK)')
+SHED_DECISIONS = _metric('Counter', 'timeverify_shed_decisions_total',
+                         'Load-shedding decisions by priority and outcome (admitted, shed_slo, shed_queue_full)',
+                         ('priority', 'outcome'))
+CACHE_LOOKUPS = _metric('Counter', 'timeverify_cache_lookups_total',
+                        'Cache lookups by cache and result (hit or miss)', ('cache', 'result'))
+
+
+def cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def _endpoint():
+    # The route pattern, not the URL, so result IDs don't explode label cardinality
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def _start_request_timer():
+    g.metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    endpoint = _endpoint()
+    HTTP_REQUESTS.labels(endpoint=endpoint, method=request.method, status=str(response.status_code)).inc()
+    started = g.pop('metrics_started', None)
+    if started is not None:
+        HTTP_REQUEST_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - started)
+    if request.content_length:
+        UPLOAD_BYTES.labels(endpoint=endpoint).inc(request.content_length)
+    return response
+
+
+def track_requests(app):
+    """Count and time every request the app serves"""
+    app.before_request(_start_request_timer)
+    app.after_request(_record_request)
+
+
+def metrics_response():
+    """Prometheus text exposition of all workers' metrics (or this process's outside gunicorn)"""
+    if prometheus_client is None:
+        return Response('prometheus_client is not installed\n', status=501, mimetype='text/plain')
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_dead(pid):
+    """Drop a dead gunicorn worker's live gauges (its counters and histograms are kept)"""
+    if prometheus_client is not None and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,150 @@
+import itertools
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from cpu_quota import available_cpus, cgroup_cpu_limit
+from metrics import OCR_QUEUE_DEPTH
+from structured_logging import fields, get_logger
+
+log = get_logger('ocr_concurrency')
+
+# "throughput": many single-threaded OCRs; "latency": few multi-threaded OCRs
+OCR_CONCURRENCY_MODE = os.environ.get('OCR_CONCURRENCY_MODE', 'throughput').lower()
+LATENCY_MODE_THREADS = int(os.environ.get('OCR_LATENCY_THREADS', 4))
+
+# Interactive work (a reviewer is waiting) is always scheduled before batch work
+PRIORITY_CLASSES = ('interactive', 'batch')
+# Batch work waiting longer than this is promoted so it cannot starve
+BATCH_MAX_WAIT = float(os.environ.get('OCR_BATCH_MAX_WAIT', 30))
+LATENCY_WINDOW = 500
+
+
+class _ClassStats:
+    """Queue-wait and OCR-run latencies for one priority class"""
+
+    def __init__(self):
+        self.count = 0
+        self.waits = deque(maxlen=LATENCY_WINDOW)
+        self.runs = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, wait, run):
+        self.count += 1
+        self.waits.append(wait)
+        self.runs.append(run)
+
+    @staticmethod
+    def _percentile(values, p):
+        if not values:
+            return 0
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 1)
+
+    def summary(self):
+        waits, runs = list(self.waits), list(self.runs)
+        return {
+            'ocr_calls': self.count,
+            'wait_ms_p50': self._percentile(waits, 0.50),
+            'wait_ms_p95': self._percentile(waits, 0.95),
+            'run_ms_p50': self._percentile(runs, 0.50),
+            'run_ms_p95': self._percentile(runs, 0.95)
+        }
+
+
+class OCRConcurrencyController:
+    """Sizes the OCR pool and Tesseract's OpenMP threads together so the node is never oversubscribed"""
+
+    def __init__(self, mode=None, cpus=None, processes=None):
+        self.mode = (mode or OCR_CONCURRENCY_MODE).lower()
+        if self.mode not in ('throughput', 'latency'):
+            log.warning("Unknown OCR_CONCURRENCY_MODE, using 'throughput'", extra=fields(mode=self.mode))
+            self.mode = 'throughput'
+        self.cpus = cpus or available_cpus()
+        # Number of processes sharing the CPU budget (gunicorn workers)
+        self.processes = processes or int(os.environ.get('GUNICORN_WORKERS', os.environ.get('WEB_CONCURRENCY', 1)))
+
+        if self.mode == 'latency':
+            self.omp_threads = max(1, min(LATENCY_MODE_THREADS, self.cpus))
+        else:
+            self.omp_threads = 1
+        node_slots = max(1, self.cpus // self.omp_threads)
+        # Each process gets its share of the node-wide OCR slots
+        self.pool_size = max(1, math.ceil(node_slots / max(1, self.processes)))
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._queue = []  # (priority, seq, enqueued_at) tickets waiting for a slot
+        self.active = 0
+        self.class_stats = {name: _ClassStats() for name in PRIORITY_CLASSES}
+        self._local = threading.local()
+
+    @property
+    def waiting(self):
+        return len(self._queue)
+
+    def apply(self):
+        """Export the OpenMP limit; tesseract subprocesses inherit it from this process"""
+        os.environ['OMP_THREAD_LIMIT'] = str(self.omp_threads)
+        log.info("OCR concurrency configured", extra=fields(
+            mode=self.mode, cpus=self.cpus, pool_size=self.pool_size, omp_threads=self.omp_threads))
+        return self
+
+    def _next_ticket(self, now):
+        """Interactive tickets first, then batch in arrival order (aged batch tickets count as interactive)"""
+        def rank(ticket):
+            priority, seq, enqueued_at = ticket
+            promoted = priority == 'batch' and now - enqueued_at > BATCH_MAX_WAIT
+            return (0 if priority == 'interactive' or promoted else 1, seq)
+        return min(self._queue, key=rank)
+
+    @contextmanager
+    def slot(self, priority='interactive'):
+        """Hold one OCR slot for the duration of a Tesseract call, scheduled by priority class"""
+        if priority not in self.class_stats:
+            priority = 'interactive'
+        enqueued_at = time.perf_counter()
+        ticket = (priority, next(self._seq), enqueued_at)
+        with self._cond:
+            self._queue.append(ticket)
+            OCR_QUEUE_DEPTH.set(len(self._queue))
+            while self.active >= self.pool_size or self._next_ticket(time.perf_counter()) is not ticket:
+                # Time out periodically so batch aging is re-evaluated
+                self._cond.wait(timeout=1.0)
+            self._queue.remove(ticket)
+            OCR_QUEUE_DEPTH.set(len(self._queue))
+            self.active += 1
+            # The queue head changed; let the next waiter re-check for a free slot
+            self._cond.notify_all()
+        started = time.perf_counter()
+        self._local.wait_seconds = self.thread_wait_seconds() + (started - enqueued_at)
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            with self._cond:
+                self.active -= 1
+                self.class_stats[priority].record(started - enqueued_at, finished - started)
+                self._cond.notify_all()
+
+    def thread_wait_seconds(self):
+        """Total time the current thread has spent queued for OCR slots"""
+        return getattr(self._local, 'wait_seconds', 0.0)
+
+    def status(self):
+        return {
+            'mode': self.mode,
+            'cpus': self.cpus,
+            'cgroup_cpu_limit': cgroup_cpu_limit(),
+            'processes': self.processes,
+            'pool_size': self.pool_size,
+            'omp_thread_limit': self.omp_threads,
+            'active': self.active,
+            'waiting': self.waiting,
+            'waiting_by_class': {
+                name: sum(1 for ticket in self._queue if ticket[0] == name) for name in PRIORITY_CLASSES
+            },
+            'classes': {name: stats.summary() for name, stats in self.class_stats.items()}
+        }
@@ -0,0 +1,83 @@
+from system_of_record import iso_week, normalize_consultant
+
+
+class Reconciliation:
+    """Per-consultant and per-week totals for a result, accumulated in one pass over its entries.
+
+    `file_results` are the per-file results (or the single result) carrying
+    consultant_name / week / system_hours, used for the system-of-record side.
+    """
+
+    def __init__(self, file_results=()):
+        self.system_hours = {}   # (normalized consultant, week or None) -> hours
+        for file_result in file_results:
+            name = file_result.get('consultant_name')
+            hours = file_result.get('system_hours')
+            if name and isinstance(hours, (int, float)) and file_result.get('status', 'success') in (
+                    'success', 'Processed successfully'):
+                self.system_hours[(normalize_consultant(name), file_result.get('week'))] = hours
+        self.by_consultant = {}  # (name, week) -> [entries, hours, check entries]
+        self.by_week = {}        # week -> [entries, hours, check entries, consultants]
+        self._weeks = {}         # date string -> ISO week (dates repeat a lot)
+
+    def add(self, entry):
+        date = entry.get('Date', '')
+        week = self._weeks.get(date)
+        if week is None and date not in self._weeks:
+            week = self._weeks[date] = iso_week(date)
+        name = entry.get('Name', '') or 'Unknown'
+        hours = entry.get('Hours')
+        numeric = isinstance(hours, (int, float))
+
+        totals = self.by_consultant.get((name, week))
+        if totals is None:
+            totals = self.by_consultant[(name, week)] = [0, 0.0, 0]
+        totals[0] += 1
+        if numeric:
+            totals[1] += hours
+        else:
+            totals[2] += 1
+
+        week_totals = self.by_week.get(week)
+        if week_totals is None:
+            week_totals = self.by_week[week] = [0, 0.0, 0, set()]
+        week_totals[0] += 1
+        if numeric:
+            week_totals[1] += hours
+        else:
+            week_totals[2] += 1
+        week_totals[3].add(name)
+
+    def _system_hours_for(self, name, week):
+        key = normalize_consultant(name)
+        hours = self.system_hours.get((key, week))
+        return self.system_hours.get((key, None)) if hours is None else hours
+
+    def consultant_rows(self):
+        """[consultant, week, entries, timesheet hours, system hours, difference, CHECK entries, status]"""
+        rows = []
+        for (name, week), (entries, hours, checks) in sorted(
+                self.by_consultant.items(), key=lambda item: (item[0][0].lower(), item[0][1] or '')):
+            system_hours = self._system_hours_for(name, week)
+            if system_hours is None:
+                difference, status = None, 'No system hours'
+            else:
+                difference = round(hours - system_hours, 2)
+                status = 'Match' if difference == 0 else 'Discrepancy'
+            if checks and status == 'Match':
+                status = 'Match (CHECK entries)'
+            rows.append([name, week or 'Unknown', entries, round(hours, 2), system_hours, difference, checks, status])
+        return rows
+
+    def week_rows(self):
+        """[week, consultants, entries, hours, CHECK entries]"""
+        return [
+            [week or 'Unknown', len(consultants), entries, round(hours, 2), checks]
+            for week, (entries, hours, checks, consultants) in sorted(
+                self.by_week.items(), key=lambda item: item[0] or '~')
+        ]
+
+    def discrepancy_rows(self):
+        """Consultant rows whose timesheet total differs from the system of record, largest first"""
+        rows = [row for row in self.consultant_rows() if row[7] == 'Discrepancy']
+        return sorted(rows, key=lambda row: -abs(row[5]))
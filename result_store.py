@@ -0,0 +1,312 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from job_store import JOB_STORE_PATH
+from system_of_record import parse_entry_date
+
+# Results live next to the job checkpoints unless configured otherwise
+RESULT_STORE_PATH = os.environ.get('RESULT_STORE_PATH', JOB_STORE_PATH)
+RESULT_TTL_SECONDS = int(os.environ.get('RESULT_TTL_SECONDS', 24 * 3600))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    result_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    result_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at);
+CREATE TABLE IF NOT EXISTS result_entries (
+    result_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    entry_json TEXT NOT NULL,
+    PRIMARY KEY (result_id, position)
+);
+"""
+# Columns added after the results table was first created
+RESULT_COLUMNS = (
+    ('entry_count', 'INTEGER NOT NULL DEFAULT 0'),
+    ('has_source_file', 'INTEGER NOT NULL DEFAULT 0'),
+    ('content_hash', "TEXT NOT NULL DEFAULT ''"),
+    ('files_json', 'TEXT'),  # per-file summaries for export reconciliation; NULL for rows stored before it
+)
+# Per-file fields exports need (reconciliation against system hours); entries live in result_entries
+FILE_SUMMARY_FIELDS = ('consultant_name', 'filename', 'status', 'week', 'system_hours', 'screenshot_hours',
+                       'discrepancy_detected', 'entries_found')
+# Entry fields copied into their own columns so pages can be filtered and sorted in SQL
+ENTRY_COLUMNS = (
+    ('consultant', 'TEXT'),
+    ('entry_date', 'TEXT'),   # ISO date, so it sorts chronologically
+    ('hours', 'REAL'),        # NULL for CHECK entries
+    ('source_file', 'TEXT'),
+)
+ENTRY_INDEXES = """
+CREATE INDEX IF NOT EXISTS result_entries_consultant ON result_entries (result_id, consultant COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS result_entries_date ON result_entries (result_id, entry_date);
+"""
+ENTRY_SORTS = {
+    'position': 'position',
+    'consultant': 'consultant COLLATE NOCASE',
+    'date': 'entry_date',
+    'hours': 'hours',
+    'source_file': 'source_file COLLATE NOCASE',
+}
+ENTRY_BATCH_SIZE = 1000
+MAX_PAGE_SIZE = 1000
+
+
+def _iso_entry_date(date_value):
+    parsed = parse_entry_date(date_value)
+    return parsed.isoformat() if parsed else None
+
+
+def _file_summary(file_result):
+    return {key: file_result[key] for key in FILE_SUMMARY_FIELDS if key in file_result}
+
+
+def _strip_entries(result, entries):
+    """The result without its entries, which are stored once as rows.
+
+    Per-file entry lists (bulk results) are replaced by their span of the
+    combined entries, so get() can slice them back out.
+    """
+    summary = {key: value for key, value in result.items() if key != 'entries'}
+    if isinstance(result.get('results'), list):
+        files = []
+        offset = 0
+        for file_result in result['results']:
+            file_entries = file_result.get('entries')
+            if file_entries and entries[offset:offset + len(file_entries)] == file_entries:
+                file_result = {key: value for key, value in file_result.items() if key != 'entries'}
+                file_result['entry_span'] = [offset, len(file_entries)]
+                offset += len(file_entries)
+            files.append(file_result)
+        summary['results'] = files
+    return summary
+
+
+def _entry_row(result_id, position, entry):
+    hours = entry.get('Hours')
+    return (
+        result_id, position, json.dumps(entry), entry.get('Name'), _iso_entry_date(entry.get('Date')),
+        hours if isinstance(hours, (int, float)) else None, entry.get('source_file')
+    )
+
+
+class ResultStore:
+    """SQLite store of processing results, kept for a TTL so exports can be generated by ID.
+
+    Entries are stored one row each, so exports can stream them without loading the whole result.
+    """
+
+    def __init__(self, path=None, ttl_seconds=None):
+        self.path = path or RESULT_STORE_PATH
+        self.ttl_seconds = RESULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._initialized:
+                with self._init_lock:
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.executescript(SCHEMA)
+                    existing = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+                    for column, definition in RESULT_COLUMNS:
+                        if column not in existing:
+                            conn.execute(f"ALTER TABLE results ADD COLUMN {column} {definition}")
+                    existing = {row[1] for row in conn.execute("PRAGMA table_info(result_entries)")}
+                    if any(column not in existing for column, _ in ENTRY_COLUMNS):
+                        for column, definition in ENTRY_COLUMNS:
+                            if column not in existing:
+                                conn.execute(f"ALTER TABLE result_entries ADD COLUMN {column} {definition}")
+                        self._backfill_entry_columns(conn)
+                    conn.executescript(ENTRY_INDEXES)
+                    self._initialized = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _backfill_entry_columns(conn):
+        """Fill the query columns of entries stored before they existed"""
+        conn.create_function('iso_entry_date', 1, _iso_entry_date)
+        conn.execute(
+            "UPDATE result_entries SET "
+            "consultant = json_extract(entry_json, '$.Name'), "
+            "entry_date = iso_entry_date(json_extract(entry_json, '$.Date')), "
+            "hours = CASE WHEN json_type(entry_json, '$.Hours') IN ('integer', 'real') "
+            "THEN json_extract(entry_json, '$.Hours') END, "
+            "source_file = json_extract(entry_json, '$.source_file')"
+        )
+
+    def save(self, result_id, result, kind):
+        """Store (or refresh) a result under `result_id`; expired results are purged on the way"""
+        now = time.time()
+        entries = result.get('entries') or []
+        summary = _strip_entries(result, entries)
+        summary_json = json.dumps(summary)
+        files_json = json.dumps([_file_summary(file_result) for file_result in summary.get('results') or [summary]])
+        entry_rows = [_entry_row(result_id, position, entry) for position, entry in enumerate(entries)]
+        # Identifies the stored content, so exports of an unchanged result can be cached and revalidated
+        digest = hashlib.sha256(summary_json.encode('utf-8'))
+        for row in entry_rows:
+            digest.update(b'\n')
+            digest.update(row[2].encode('utf-8'))
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM result_entries WHERE result_id IN (SELECT result_id FROM results WHERE expires_at < ?)",
+                (now,)
+            )
+            conn.execute("DELETE FROM results WHERE expires_at < ?", (now,))
+            conn.execute("DELETE FROM result_entries WHERE result_id = ?", (result_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(result_id, kind, result_json, created_at, expires_at, entry_count, has_source_file, content_hash, "
+                "files_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result_id, kind, summary_json, now, now + self.ttl_seconds,
+                 len(entries), any('source_file' in entry for entry in entries), digest.hexdigest(), files_json)
+            )
+            conn.executemany(
+                "INSERT INTO result_entries "
+                "(result_id, position, entry_json, consultant, entry_date, hours, source_file) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                entry_rows
+            )
+
+    def describe(self, result_id):
+        """{'kind', 'entry_count', 'has_source_file', 'content_hash'}, or None if unknown or expired.
+
+        Reads only the metadata columns, so it stays cheap however large the result is.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT kind, entry_count, has_source_file, content_hash, created_at FROM results "
+                "WHERE result_id = ? AND expires_at >= ?",
+                (result_id, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'kind': row[0],
+            'entry_count': row[1],
+            'has_source_file': bool(row[2]),
+            # Rows stored before content hashes were recorded fall back to their save time
+            'content_hash': row[3] or f"{result_id}@{row[4]}"
+        }
+
+    def summary(self, result_id):
+        """The stored result without its entries, or None if unknown or expired"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result_json FROM results WHERE result_id = ? AND expires_at >= ?", (result_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def file_summaries(self, result_id):
+        """Per-file consultant / week / status / system hours (the result itself for single uploads)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT files_json, result_json FROM results WHERE result_id = ? AND expires_at >= ?",
+                (result_id, time.time())
+            ).fetchone()
+        if row is None:
+            return []
+        if row[0] is not None:
+            return json.loads(row[0])
+        result = json.loads(row[1])
+        return result.get('results') or [result]
+
+    def iter_entries(self, result_id, batch_size=ENTRY_BATCH_SIZE):
+        """Yield a result's entries in order, reading them from the database in batches"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "SELECT entry_json FROM result_entries WHERE result_id = ? ORDER BY position", (result_id,)
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for (entry_json,) in rows:
+                    yield json.loads(entry_json)
+
+    def query_entries(self, result_id, offset=0, limit=100, sort='position', descending=False,
+                      consultant=None, source_file=None, needs_check=None, date_from=None, date_to=None):
+        """One page of a result's entries, filtered and sorted in the database.
+
+        `consultant` matches a case-insensitive substring; `date_from` / `date_to`
+        are inclusive ISO dates. Returns {'total', 'summary', 'entries'} where
+        total and summary cover every matching entry, not just the page.
+        """
+        if sort not in ENTRY_SORTS:
+            raise ValueError(f"Unsupported sort: {sort}")
+        limit = max(0, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+        where = ["result_id = ?"]
+        params = [result_id]
+        if consultant:
+            where.append("consultant LIKE ? ESCAPE '\\'")
+            escaped = consultant.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        if source_file:
+            where.append("source_file = ?")
+            params.append(source_file)
+        if needs_check is not None:
+            where.append("hours IS NULL" if needs_check else "hours IS NOT NULL")
+        if date_from:
+            where.append("entry_date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("entry_date <= ?")
+            params.append(date_to)
+        where_sql = " AND ".join(where)
+        direction = "DESC" if descending else "ASC"
+        order_sql = f"{ENTRY_SORTS[sort]} {direction}, position {direction}"
+        with self._connect() as conn:
+            total, valid, hours = conn.execute(
+                f"SELECT COUNT(*), COUNT(hours), COALESCE(SUM(hours), 0) FROM result_entries WHERE {where_sql}",
+                params
+            ).fetchone()
+            rows = conn.execute(
+                f"SELECT entry_json FROM result_entries WHERE {where_sql} ORDER BY {order_sql} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return {
+            'total': total,
+            'summary': {
+                'total_entries': total,
+                'valid_hours': valid,
+                'check_entries': total - valid,
+                'total_hours': round(hours, 2)
+            },
+            'entries': [json.loads(entry_json) for (entry_json,) in rows]
+        }
+
+    def get(self, result_id):
+        """The stored result with its entries (combined and per file), or None if unknown or expired"""
+        result = self.summary(result_id)
+        if result is None:
+            return None
+        if 'entries' not in result:
+            result['entries'] = list(self.iter_entries(result_id))
+        for file_result in result.get('results') or []:
+            span = file_result.pop('entry_span', None)
+            if span is not None:
+                file_result['entries'] = result['entries'][span[0]:span[0] + span[1]]
+        return result
+
+    def status(self):
+        with self._connect() as conn:
+            stored = conn.execute(
+                "SELECT COUNT(*) FROM results WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()[0]
+        return {'path': self.path, 'ttl_seconds': self.ttl_seconds, 'stored_results': stored}
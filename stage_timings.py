@@ -0,0 +1,61 @@
+import time
+from contextlib import contextmanager
+
+
+class StageTimings:
+    """High-resolution wall-clock time spent in each stage of the OCR pipeline.
+
+    A stage may run many times (every OCR config tried, every image decoded), so
+    each keeps a count, total and maximum. Image timings roll up into their
+    document's with add_image(), and document summaries into their job's with
+    merge(), which also accepts summaries computed in other processes.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}  # stage -> [count, total seconds, max seconds]
+        self.images = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds, count=1, longest=None):
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = [0, 0.0, 0.0]
+        totals[0] += count
+        totals[1] += seconds
+        totals[2] = max(totals[2], seconds if longest is None else longest)
+
+    def add_image(self, image_timings):
+        """Fold one image's timings in, keeping its own breakdown for the per-image list"""
+        summary = image_timings.summary()
+        self.merge(summary)
+        self.images.append(summary)
+
+    def merge(self, summary):
+        """Add the stages of a summary() (e.g. a document's, into its job)"""
+        for name, stage in (summary or {}).get('stages', {}).items():
+            self.record(name, stage['total_ms'] / 1000, stage['count'], stage['max_ms'] / 1000)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self, **extra):
+        """{'total_ms', 'stages': {stage: {'count', 'total_ms', 'max_ms'}}, 'images': [...]} in milliseconds"""
+        summary = {
+            'total_ms': round(self.elapsed() * 1000, 3),
+            'stages': {
+                name: {'count': count, 'total_ms': round(total * 1000, 3), 'max_ms': round(longest * 1000, 3)}
+                for name, (count, total, longest) in self.stages.items()
+            }
+        }
+        if self.images:
+            summary['images'] = self.images
+        summary.update(extra)
+        return summary
@@ -0,0 +1,648 @@
+let currentResults = null;
+let sessionStats = {
+    processed: 0,
+    hours: 0,
+    timeSaved: 0
+};
+
+// Form handlers
+document.getElementById('screenshotForm').onsubmit = async function(e) {
+    e.preventDefault();
+    const file = document.getElementById('screenshotFile').files[0];
+    const fileName = file?.name || 'screenshot';
+    const formData = new FormData(this);
+    const normalized = file ? await normalizeScreenshot(file, this) : null;
+    if (normalized) {
+        formData.set('screenshot', normalized.blob, fileName.replace(/\.[^.]+$/, '') + '.jpg');
+        formData.set('client_normalized', '1');
+        formData.set('original_bytes', file.size);
+        formData.set('original_width', normalized.width);
+        formData.set('original_height', normalized.height);
+    }
+    await processForm(this, '/api/process-screenshot', fileName, formData);
+};
+
+document.getElementById('documentForm').onsubmit = async function(e) {
+    e.preventDefault();
+    const fileName = document.getElementById('documentFile').files[0]?.name || 'document';
+    await processForm(this, '/api/process-document', fileName);
+};
+
+document.getElementById('bulkForm').onsubmit = async function(e) {
+    e.preventDefault();
+    const files = document.getElementById('bulkFiles').files;
+    const fileNames = Array.from(files).map(f => f.name);
+    if (files.length === 1 && files[0].name.toLowerCase().endsWith('.zip')) {
+        // Send the archive as a raw body so the server can stream its members into OCR
+        await processForm(this, '/api/process-zip', fileNames, files[0]);
+        return;
+    }
+    await processForm(this, '/api/process-bulk', fileNames);
+};
+
+// File input handlers with filename display
+document.getElementById('screenshotFile').onchange = function() {
+    const fileName = this.files[0] ? this.files[0].name : '';
+    document.getElementById('screenshotFileName').textContent = fileName ? `Selected: ${fileName}` : '';
+};
+
+document.getElementById('documentFile').onchange = function() {
+    const fileName = this.files[0] ? this.files[0].name : '';
+    document.getElementById('documentFileName').textContent = fileName ? `Selected: ${fileName}` : '';
+};
+
+document.getElementById('bulkFiles').onchange = function() {
+    const fileCount = this.files.length;
+    if (fileCount > 0) {
+        document.getElementById('bulkFileName').textContent = `Selected: ${fileCount} file(s)`;
+    } else {
+        document.getElementById('bulkFileName').textContent = '';
+    }
+};
+
+// Enhanced drag and drop functionality
+setupDragAndDrop('screenshotFile', document.querySelector('#screenshotForm .upload-area'));
+setupDragAndDrop('documentFile', document.querySelector('#documentForm .upload-area'));
+setupDragAndDrop('bulkFiles', document.querySelector('#bulkForm .upload-area'));
+
+function setupDragAndDrop(inputId, dropArea) {
+    const input = document.getElementById(inputId);
+
+    ['dragenter', 'dragover', 'dragleave', 'drop'].forEach(eventName => {
+        dropArea.addEventListener(eventName, preventDefaults, false);
+    });
+
+    function preventDefaults(e) {
+        e.preventDefault();
+        e.stopPropagation();
+    }
+
+    ['dragenter', 'dragover'].forEach(eventName => {
+        dropArea.addEventListener(eventName, () => dropArea.classList.add('dragover'), false);
+    });
+
+    ['dragleave', 'drop'].forEach(eventName => {
+        dropArea.addEventListener(eventName, () => dropArea.classList.remove('dragover'), false);
+    });
+
+    dropArea.addEventListener('drop', function(e) {
+        const files = e.dataTransfer.files;
+        if (files.length > 0) {
+            input.files = files;
+            input.dispatchEvent(new Event('change'));
+        }
+    });
+}
+
+// Downscale to the resolution the server OCRs at (data-max-pixels) and re-encode as JPEG,
+// so large PNG screenshots upload in a fraction of the time. Returns null to upload the original.
+async function normalizeScreenshot(file, form) {
+    const maxPixels = Number(form.dataset.maxPixels) || 0;
+    const quality = Number(form.dataset.quality) || 0.92;
+    if (!maxPixels || !window.createImageBitmap || !file.type.startsWith('image/')) return null;
+
+    let bitmap;
+    try {
+        bitmap = await createImageBitmap(file);
+    } catch (error) {
+        return null;  // Let the server handle formats the browser can't decode
+    }
+    const scale = Math.min(1, Math.sqrt(maxPixels / (bitmap.width * bitmap.height)));
+    const width = Math.max(1, Math.round(bitmap.width * scale));
+    const height = Math.max(1, Math.round(bitmap.height * scale));
+    const canvas = document.createElement('canvas');
+    canvas.width = width;
+    canvas.height = height;
+    const ctx = canvas.getContext('2d');
+    ctx.fillStyle = '#ffffff';  // JPEG has no alpha channel
+    ctx.fillRect(0, 0, width, height);
+    ctx.imageSmoothingQuality = 'high';
+    ctx.drawImage(bitmap, 0, 0, width, height);
+    const original = { width: bitmap.width, height: bitmap.height };
+    bitmap.close();
+
+    const blob = await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', quality));
+    if (!blob || (scale === 1 && blob.size >= file.size)) return null;
+    return { blob, ...original };
+}
+
+async function processForm(form, endpoint, fileNames, body) {
+    showProcessing(fileNames);
+
+    try {
+        const formData = body || new FormData(form);
+        const response = await fetch(endpoint, {
+            method: 'POST',
+            body: formData
+        });
+
+        const result = await response.json();
+
+        if (result.error) {
+            throw new Error(result.error);
+        }
+
+        currentResults = result;
+        updateSessionStats(result);
+        showResults(result);
+        showTable(result);
+        updateLastUpdated();
+
+    } catch (error) {
+        showError(error.message);
+    } finally {
+        hideProcessing();
+    }
+}
+
+function showProcessing(fileNames) {
+    document.getElementById('processingCard').style.display = 'block';
+    document.getElementById('resultsCard').style.display = 'none';
+    document.getElementById('tableSection').style.display = 'none';
+
+    // Reset all steps
+    for (let i = 1; i <= 5; i++) {
+        const step = document.getElementById(`step${i}`);
+        step.className = 'processing-step';
+        step.querySelector('i').className = 'fas fa-circle-notch';
+    }
+
+    // Update title based on file type
+    let title = 'Processing your request...';
+    if (Array.isArray(fileNames)) {
+        title = `Processing ${fileNames.length} files...`;
+        document.getElementById('processingTitle').textContent = title;
+        simulateBulkProcessing(fileNames);
+    } else {
+        title = `Processing ${fileNames}...`;
+        document.getElementById('processingTitle').textContent = title;
+        simulateProcessing(fileNames);
+    }
+}
+
+function simulateProcessing(fileName) {
+    const steps = [
+        { id: 'step1', text: `Reading file: ${fileName}`, delay: 500 },
+        { id: 'step2', text: 'Extracting images and text...', delay: 1000 },
+        { id: 'step3', text: 'Running OCR analysis...', delay: 1500 },
+        { id: 'step4', text: 'Parsing timesheet entries...', delay: 2000 },
+        { id: 'step5', text: 'Validating and generating results...', delay: 2500 }
+    ];
+
+    steps.forEach((step, index) => {
+        setTimeout(() => {
+            const stepElement = document.getElementById(step.id);
+            stepElement.className = 'processing-step active';
+            stepElement.querySelector('i').className = 'fas fa-spinner fa-spin';
+            document.getElementById(`${step.id}Text`).textContent = step.text;
+
+            // Mark previous steps as completed
+            for (let i = 1; i < index + 1; i++) {
+                const prevStep = document.getElementById(`step${i}`);
+                if (prevStep && i < index + 1) {
+                    prevStep.className = 'processing-step completed';
+                    prevStep.querySelector('i').className = 'fas fa-check-circle';
+                }
+            }
+        }, step.delay);
+    });
+}
+
+function simulateBulkProcessing(fileNames) {
+    const steps = [
+        { id: 'step1', text: `Preparing ${fileNames.length} documents...`, delay: 300 },
+        { id: 'step2', text: `Processing: ${fileNames[0] || 'first file'}`, delay: 800 },
+        { id: 'step3', text: 'Running OCR on multiple images...', delay: 1500 },
+        { id: 'step4', text: `Processing: ${fileNames[1] || 'additional files'}...`, delay: 2200 },
+        { id: 'step5', text: 'Consolidating all results...', delay: 3000 }
+    ];
+
+    // Show more files being processed if available
+    if (fileNames.length > 2) {
+        steps[3].text = `Processing remaining ${fileNames.length - 1} files...`;
+    }
+
+    steps.forEach((step, index) => {
+        setTimeout(() => {
+            const stepElement = document.getElementById(step.id);
+            stepElement.className = 'processing-step active';
+            stepElement.querySelector('i').className = 'fas fa-spinner fa-spin';
+            document.getElementById(`${step.id}Text`).textContent = step.text;
+
+            // Mark previous steps as completed
+            for (let i = 1; i < index + 1; i++) {
+                const prevStep = document.getElementById(`step${i}`);
+                if (prevStep && i < index + 1) {
+                    prevStep.className = 'processing-step completed';
+                    prevStep.querySelector('i').className = 'fas fa-check-circle';
+                }
+            }
+        }, step.delay);
+    });
+}
+
+function hideProcessing() {
+    document.getElementById('processingCard').style.display = 'none';
+}
+
+function showResults(result) {
+    const resultsCard = document.getElementById('resultsCard');
+    const statusDiv = document.getElementById('resultsStatus');
+    const metricsDiv = document.getElementById('resultsMetrics');
+
+    // Check if this is bulk processing results
+    if (result.results && Array.isArray(result.results)) {
+        // Bulk processing results
+        showBulkResults(result);
+        return;
+    }
+
+    // Single file results
+    const hasDiscrepancy = result.discrepancy_detected;
+    statusDiv.innerHTML = `
+        <div class="status-badge ${hasDiscrepancy ? 'status-warning' : 'status-success'}">
+            <i class="fas ${hasDiscrepancy ? 'fa-exclamation-triangle' : 'fa-check-circle'}"></i>
+            ${hasDiscrepancy ? 'Discrepancy Detected' : 'All Verified'}
+        </div>
+    `;
+
+    // Metrics
+    metricsDiv.innerHTML = `
+        <div class="result-metric">
+            <div class="result-value">${result.consultant_name || 'N/A'}</div>
+            <div class="result-label">Consultant</div>
+        </div>
+        <div class="result-metric">
+            <div class="result-value">${result.total_entries || 0}</div>
+            <div class="result-label">Entries Found</div>
+        </div>
+        <div class="result-metric">
+            <div class="result-value">${result.screenshot_hours || 0}</div>
+            <div class="result-label">Screenshot Hours</div>
+        </div>
+        <div class="result-metric">
+            <div class="result-value">${result.system_hours || 0}</div>
+            <div class="result-label">System Hours</div>
+        </div>
+    `;
+
+    resultsCard.style.display = 'block';
+}
+
+function showBulkResults(result) {
+    const resultsCard = document.getElementById('resultsCard');
+    const statusDiv = document.getElementById('resultsStatus');
+    const metricsDiv = document.getElementById('resultsMetrics');
+
+    const summary = result.summary || {};
+    const discrepancies = summary.discrepancies_found || 0;
+
+    // Status for bulk processing
+    statusDiv.innerHTML = `
+        <div class="status-badge ${discrepancies > 0 ? 'status-warning' : 'status-success'}">
+            <i class="fas ${discrepancies > 0 ? 'fa-exclamation-triangle' : 'fa-check-circle'}"></i>
+            Bulk Processing: ${discrepancies > 0 ? `${discrepancies} Discrepancies Found` : 'All Verified'}
+        </div>
+    `;
+
+    // Bulk metrics
+    metricsDiv.innerHTML = `
+        <div class="result-metric">
+            <div class="result-value">${summary.successful_documents || 0}</div>
+            <div class="result-label">Documents Processed</div>
+        </div>
+        <div class="result-metric">
+            <div class="result-value">${summary.total_images || 0}</div>
+            <div class="result-label">Images Processed</div>
+        </div>
+        <div class="result-metric">
+            <div class="result-value">${summary.total_entries || 0}</div>
+            <div class="result-label">Total Entries</div>
+        </div>
+        <div class="result-metric">
+            <div class="result-value">${discrepancies}</div>
+            <div class="result-label">Discrepancies</div>
+        </div>
+    `;
+
+    resultsCard.style.display = 'block';
+}
+
+// Stored results are browsed through /api/results/<id>/entries: only the rows in view are
+// in the DOM, and pages of entries are fetched from the server as the table scrolls.
+const ROW_HEIGHT = 36;
+const PAGE_SIZE = 200;
+const OVERSCAN_ROWS = 10;
+let resultTable = null;
+
+function escapeHTML(value) {
+    return String(value).replace(/[&<>"']/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' })[c]);
+}
+
+function tableStatsHTML(summary) {
+    return `
+        <div class="table-stat">
+            <i class="fas fa-list"></i>
+            <span>Total Entries: ${summary.total_entries}</span>
+        </div>
+        <div class="table-stat">
+            <i class="fas fa-check-circle"></i>
+            <span>Valid Hours: ${summary.valid_hours}</span>
+        </div>
+        <div class="table-stat">
+            <i class="fas fa-exclamation-triangle"></i>
+            <span>Needs Review: ${summary.check_entries}</span>
+        </div>
+        <div class="table-stat">
+            <i class="fas fa-clock"></i>
+            <span>Total Hours: ${summary.total_hours}</span>
+        </div>
+    `;
+}
+
+function entryRowHTML(entry, showSource) {
+    const hoursClass = entry.Hours === "CHECK" ? "check-value" : "";
+    return `
+        <tr>
+            <td>${escapeHTML(entry.Name || 'N/A')}</td>
+            <td>${escapeHTML(entry.Date || 'N/A')}</td>
+            <td class="${hoursClass}">${escapeHTML(entry.Hours !== undefined ? entry.Hours : 'N/A')}</td>
+            ${showSource ? `<td style="font-size: 11px;">${escapeHTML(entry.source_file || 'Unknown')}</td>` : ''}
+        </tr>
+    `;
+}
+
+class ResultTable {
+    constructor(container, resultId, showSource) {
+        this.container = container;
+        this.resultId = resultId;
+        this.showSource = showSource;
+        this.sort = 'position';
+        this.order = 'asc';
+        this.filters = { consultant: '', check: '' };
+        this.pages = new Map();  // page index -> entries, or null while loading
+        this.total = 0;
+        this.generation = 0;     // Bumped on sort/filter changes so stale pages are dropped
+        this.render();
+        this.reload();
+    }
+
+    url(page) {
+        const params = new URLSearchParams({
+            offset: page * PAGE_SIZE, limit: PAGE_SIZE, sort: this.sort, order: this.order
+        });
+        if (this.filters.consultant) params.set('consultant', this.filters.consultant);
+        if (this.filters.check) params.set('check', this.filters.check);
+        return `/api/results/${encodeURIComponent(this.resultId)}/entries?${params}`;
+    }
+
+    render() {
+        const columns = [['consultant', 'Name'], ['date', 'Date'], ['hours', 'Hours']];
+        if (this.showSource) columns.push(['source_file', 'Source']);
+        this.container.classList.add('virtualized');
+        this.container.innerHTML = `
+            <div class="table-controls">
+                <input type="search" id="tableConsultantFilter" placeholder="Filter by consultant...">
+                <select id="tableCheckFilter">
+                    <option value="">All entries</option>
+                    <option value="1">Needs review</option>
+                    <option value="0">Valid hours</option>
+                </select>
+            </div>
+            <div class="virtual-scroll">
+                <table>
+                    <thead>
+                        <tr>${columns.map(([key, label]) => `<th data-sort="${key}">${label}</th>`).join('')}</tr>
+                    </thead>
+                    <tbody></tbody>
+                </table>
+            </div>
+            <div class="table-stats"></div>
+        `;
+        this.scroller = this.container.querySelector('.virtual-scroll');
+        this.body = this.container.querySelector('tbody');
+        this.stats = this.container.querySelector('.table-stats');
+
+        let frame = null;
+        this.scroller.addEventListener('scroll', () => {
+            if (frame === null) {
+                frame = requestAnimationFrame(() => { frame = null; this.renderRows(); });
+            }
+        });
+        this.container.querySelectorAll('th[data-sort]').forEach(th => {
+            th.addEventListener('click', () => {
+                this.order = this.sort === th.dataset.sort && this.order === 'asc' ? 'desc' : 'asc';
+                this.sort = th.dataset.sort;
+                this.container.querySelectorAll('th[data-sort]').forEach(other => {
+                    other.classList.toggle('sorted-asc', other === th && this.order === 'asc');
+                    other.classList.toggle('sorted-desc', other === th && this.order === 'desc');
+                });
+                this.reload();
+            });
+        });
+        let debounce = null;
+        this.container.querySelector('#tableConsultantFilter').addEventListener('input', e => {
+            clearTimeout(debounce);
+            debounce = setTimeout(() => { this.filters.consultant = e.target.value.trim(); this.reload(); }, 250);
+        });
+        this.container.querySelector('#tableCheckFilter').addEventListener('change', e => {
+            this.filters.check = e.target.value;
+            this.reload();
+        });
+    }
+
+    reload() {
+        this.generation++;
+        this.pages.clear();
+        this.total = 0;
+        this.scroller.scrollTop = 0;
+        this.body.innerHTML = '';
+        this.loadPage(0);
+    }
+
+    loadPage(page) {
+        if (this.pages.has(page)) return;
+        const generation = this.generation;
+        this.pages.set(page, null);
+        fetch(this.url(page))
+            .then(response => response.json())
+            .then(data => {
+                if (generation !== this.generation) return;
+                if (data.error) throw new Error(data.error);
+                this.pages.set(page, data.entries);
+                this.total = data.total;
+                this.stats.innerHTML = tableStatsHTML(data.summary);
+                this.renderRows();
+            })
+            .catch(error => {
+                if (generation !== this.generation) return;
+                this.pages.delete(page);
+                showError(error.message);
+            });
+    }
+
+    renderRows() {
+        if (this.total === 0) {
+            this.body.innerHTML = this.pages.get(0)
+                ? '<tr><td colspan="4" style="text-align: center; color: #8b949e; padding: 40px;">No timesheet entries found</td></tr>'
+                : '';
+            return;
+        }
+        const first = Math.max(0, Math.floor(this.scroller.scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+        const visible = Math.ceil(this.scroller.clientHeight / ROW_HEIGHT);
+        const last = Math.min(this.total, first + visible + 2 * OVERSCAN_ROWS);
+
+        let rows = `<tr class="spacer-row"><td colspan="4" style="height: ${first * ROW_HEIGHT}px"></td></tr>`;
+        for (let index = first; index < last; index++) {
+            const page = Math.floor(index / PAGE_SIZE);
+            const entries = this.pages.get(page);
+            if (!entries) {
+                this.loadPage(page);
+                rows += `<tr class="loading-row"><td colspan="4">Loading...</td></tr>`;
+            } else {
+                rows += entryRowHTML(entries[index - page * PAGE_SIZE], this.showSource);
+            }
+        }
+        rows += `<tr class="spacer-row"><td colspan="4" style="height: ${(this.total - last) * ROW_HEIGHT}px"></td></tr>`;
+        this.body.innerHTML = rows;
+    }
+}
+
+function showTable(result) {
+    const tableSection = document.getElementById('tableSection');
+    const dataTable = document.getElementById('dataTable');
+    const isMultipleFiles = Array.isArray(result.results);
+
+    if (result.result_id) {
+        resultTable = new ResultTable(dataTable, result.result_id, isMultipleFiles);
+        tableSection.style.display = 'block';
+        return;
+    }
+
+    // Results that weren't retained server-side have few (usually no) entries; render them directly
+    resultTable = null;
+    dataTable.classList.remove('virtualized');
+    const entries = result.entries || [];
+    if (entries.length === 0) {
+        dataTable.innerHTML = '<p style="text-align: center; color: #8b949e; padding: 40px;">No timesheet entries found</p>';
+        tableSection.style.display = 'block';
+        return;
+    }
+
+    const validHours = entries.filter(e => typeof e.Hours === 'number').length;
+    dataTable.innerHTML = `
+        <table>
+            <thead>
+                <tr>
+                    <th>Name</th>
+                    <th>Date</th>
+                    <th>Hours</th>
+                    ${isMultipleFiles ? '<th>Source</th>' : ''}
+                </tr>
+            </thead>
+            <tbody>
+                ${entries.map(entry => entryRowHTML(entry, isMultipleFiles)).join('')}
+            </tbody>
+        </table>
+        <div class="table-stats">
+            ${tableStatsHTML({
+                total_entries: entries.length,
+                valid_hours: validHours,
+                check_entries: entries.filter(e => e.Hours === 'CHECK').length,
+                total_hours: entries.reduce((sum, e) => sum + (typeof e.Hours === 'number' ? e.Hours : 0), 0)
+            })}
+        </div>
+    `;
+    tableSection.style.display = 'block';
+}
+
+function showError(message) {
+    document.getElementById('resultsCard').style.display = 'block';
+    document.getElementById('resultsStatus').innerHTML = `
+        <div class="status-badge status-warning">
+            <i class="fas fa-exclamation-triangle"></i>
+            Error: ${message}
+        </div>
+    `;
+    document.getElementById('resultsMetrics').innerHTML = '';
+}
+
+function updateSessionStats(result) {
+    sessionStats.processed++;
+
+    if (result.results && Array.isArray(result.results)) {
+        // Bulk processing
+        sessionStats.hours += result.summary?.total_entries || 0;
+        sessionStats.timeSaved += (result.results.length * 10);
+    } else {
+        // Single file
+        sessionStats.hours += result.screenshot_hours || 0;
+        sessionStats.timeSaved += 10;
+    }
+
+    document.getElementById('processedCount').textContent = sessionStats.processed;
+    document.getElementById('hoursCount').textContent = sessionStats.hours;
+    document.getElementById('timeSaved').textContent = sessionStats.timeSaved + 'min';
+}
+
+function updateLastUpdated() {
+    const now = new Date();
+    document.getElementById('lastUpdate').textContent = now.toLocaleTimeString();
+}
+
+async function downloadData(format) {
+    if (!currentResults) return;
+
+    try {
+        if (format === 'excel' && currentResults.result_id) {
+            // The server still has these results; export them by ID without re-uploading
+            window.location.href = `/api/results/${encodeURIComponent(currentResults.result_id)}/excel`;
+
+        } else if (format === 'excel') {
+            // Send data to backend for proper Excel generation
+            const response = await fetch('/api/download/excel', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(currentResults)
+            });
+
+            if (response.ok) {
+                const blob = await response.blob();
+                const url = URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.href = url;
+                a.download = `timesheet_${new Date().toISOString().split('T')[0]}.xlsx`;
+                document.body.appendChild(a);
+                a.click();
+                document.body.removeChild(a);
+                URL.revokeObjectURL(url);
+            } else {
+                throw new Error('Excel generation failed');
+            }
+
+        } else if (format === 'json') {
+            // Bulk responses are compact; the retained result has the full verbose shape
+            const data = currentResults.result_id
+                ? await (await fetch(`/api/results/${encodeURIComponent(currentResults.result_id)}`)).json()
+                : currentResults;
+            const jsonData = JSON.stringify(data, null, 2);
+            const blob = new Blob([jsonData], { type: 'application/json' });
+            const filename = `timesheet_${new Date().toISOString().split('T')[0]}.json`;
+
+            const url = URL.createObjectURL(blob);
+            const a = document.createElement('a');
+            a.href = url;
+            a.download = filename;
+            document.body.appendChild(a);
+            a.click();
+            document.body.removeChild(a);
+            URL.revokeObjectURL(url);
+        }
+
+    } catch (error) {
+        alert('Download failed: ' + error.message);
+    }
+}
+
+// Initialize dashboard
+updateLastUpdated();
@@ -0,0 +1,60 @@
+// Single document processing
+document.getElementById('uploadForm').onsubmit = async function(e) {
+    e.preventDefault();
+    await processDocuments(this, '/api/process-document', false);
+};
+
+// Bulk document processing
+document.getElementById('bulkUploadForm').onsubmit = async function(e) {
+    e.preventDefault();
+    await processDocuments(this, '/api/process-documents', true);
+};
+
+async function processDocuments(form, endpoint, isBulk) {
+    const formData = new FormData(form);
+    const resultsDiv = document.getElementById('results');
+    const resultData = document.getElementById('resultData');
+    const statusDiv = document.getElementById('processingStatus');
+
+    try {
+        const fileCount = isBulk ? form.documents.files.length : 1;
+        statusDiv.innerHTML = `<strong>Processing ${fileCount} document(s)...</strong><br>Extracting images and running OCR...`;
+        resultsDiv.style.display = 'block';
+        resultData.textContent = 'Processing...';
+
+        const response = await fetch(endpoint, {
+            method: 'POST',
+            body: formData
+        });
+
+        const result = await response.json();
+
+        statusDiv.innerHTML = `<strong>✅ Processing Complete!</strong><br>Found ${result.total_images || 0} images, ${result.total_entries || 0} timesheet entries`;
+        resultData.textContent = JSON.stringify(result, null, 2);
+    } catch (error) {
+        statusDiv.innerHTML = '<strong>❌ Error occurred</strong>';
+        resultData.textContent = 'Error: ' + error.message;
+    }
+}
+
+// Demo simulation
+async function runDemo() {
+    const resultsDiv = document.getElementById('results');
+    const resultData = document.getElementById('resultData');
+    const statusDiv = document.getElementById('processingStatus');
+
+    statusDiv.innerHTML = '<strong>🎯 Running Demo Simulation...</strong>';
+    resultsDiv.style.display = 'block';
+    resultData.textContent = 'Generating demo data...';
+
+    try {
+        const response = await fetch('/api/demo');
+        const result = await response.json();
+
+        statusDiv.innerHTML = '<strong>✅ Demo Complete!</strong><br>Simulated processing of 5 consultants';
+        resultData.textContent = JSON.stringify(result, null, 2);
+    } catch (error) {
+        statusDiv.innerHTML = '<strong>❌ Demo Error</strong>';
+        resultData.textContent = 'Error: ' + error.message;
+    }
+}
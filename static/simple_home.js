@@ -0,0 +1,40 @@
+// Real file upload processing
+document.getElementById('uploadForm').onsubmit = async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const resultsDiv = document.getElementById('results');
+    const resultData = document.getElementById('resultData');
+
+    try {
+        resultData.textContent = 'Processing with real OCR... This may take 2-3 seconds...';
+        resultsDiv.style.display = 'block';
+
+        const response = await fetch('/api/process-screenshot', {
+            method: 'POST',
+            body: formData
+        });
+
+        const result = await response.json();
+        resultData.textContent = JSON.stringify(result, null, 2);
+    } catch (error) {
+        resultData.textContent = 'Error: ' + error.message;
+    }
+};
+
+// Bulk demo simulation
+async function runBulkDemo() {
+    const resultsDiv = document.getElementById('results');
+    const resultData = document.getElementById('resultData');
+
+    resultData.textContent = 'Running bulk processing simulation...';
+    resultsDiv.style.display = 'block';
+
+    try {
+        const response = await fetch('/api/bulk-demo');
+        const result = await response.json();
+        resultData.textContent = JSON.stringify(result, null, 2);
+    } catch (error) {
+        resultData.textContent = 'Error: ' + error.message;
+    }
+}
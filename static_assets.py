@@ -0,0 +1,99 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, abort, render_template, request
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are skipped; gzip is always available
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Fingerprinted asset URLs never change content, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+# Compressing tiny bodies costs more in headers than it saves
+MIN_COMPRESS_BYTES = 512
+
+
+class _Asset:
+    """One response body with its precompressed variants and a content-hash ETag"""
+
+    def __init__(self, body, mimetype):
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = {'identity': body}
+        if len(body) >= MIN_COMPRESS_BYTES and mimetype.startswith(COMPRESSIBLE_TYPES):
+            self.variants['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants['br'] = brotli.compress(body, quality=11)
+
+    def response(self, cache_control):
+        """Serve the best encoding the client accepts, or 304 if its copy is current"""
+        if request.if_none_match.contains(self.etag):
+            response = Response(status=304)
+        else:
+            encoding = 'identity'
+            for candidate in ('br', 'gzip'):
+                if candidate in self.variants and request.accept_encodings[candidate]:
+                    encoding = candidate
+                    break
+            response = Response(self.variants[encoding], mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(self.etag)
+        response.headers['Cache-Control'] = cache_control
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+
+class StaticAssets:
+    """Serves static/ from memory with gzip/brotli variants built once at startup.
+
+    Templates link assets through asset_url(), which appends a content
+    fingerprint so the files can be cached as immutable. Pages whose templates
+    take no per-request context are rendered once and revalidated by ETag.
+    """
+
+    def __init__(self, app, directory=STATIC_DIR, url_path='/static'):
+        self.app = app
+        self.directory = directory
+        self.assets = {}
+        self._pages = {}
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, directory).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    body = f.read()
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                if mimetype.startswith('text/'):
+                    mimetype += '; charset=utf-8'
+                self.assets[filename] = _Asset(body, mimetype)
+        app.add_url_rule(f"{url_path}/<path:filename>", 'static', self.serve)
+        app.jinja_env.globals['asset_url'] = self.url
+        self.url_path = url_path
+
+    def url(self, filename):
+        """Fingerprinted URL of a static file for use in templates"""
+        return f"{self.url_path}/{filename}?v={self.assets[filename].etag}"
+
+    def serve(self, filename):
+        asset = self.assets.get(filename)
+        if asset is None:
+            abort(404)
+        # Only the exact fingerprinted URL is immutable; bare URLs revalidate
+        if request.args.get('v') == asset.etag:
+            return asset.response(IMMUTABLE_CACHE_CONTROL)
+        return asset.response(REVALIDATE_CACHE_CONTROL)
+
+    def page(self, template_name, **context):
+        """Response for a template whose context is fixed for the process, rendered and compressed once"""
+        asset = self._pages.get(template_name)
+        if asset is None:
+            body = render_template(template_name, **context).encode('utf-8')
+            asset = self._pages[template_name] = _Asset(body, 'text/html; charset=utf-8')
+        return asset.response(REVALIDATE_CACHE_CONTROL)
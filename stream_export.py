@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+
+# Rows are buffered into chunks of roughly this size before being yielded to the client
+STREAM_CHUNK_BYTES = 64 * 1024
+
+CSV_MIMETYPE = 'text/csv'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def csv_headers(include_source):
+    headers = ['Name', 'Date', 'Hours']
+    if include_source:
+        headers.append('Source File')
+    return headers
+
+
+def iter_csv(entries, include_source):
+    """Yield the entries as CSV text chunks, with a BOM so Excel opens it as UTF-8"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(csv_headers(include_source))
+    for entry in entries:
+        row = [entry.get('Name', ''), entry.get('Date', ''), entry.get('Hours', '')]
+        if include_source:
+            row.append(entry.get('source_file', ''))
+        writer.writerow(row)
+        if buffer.tell() >= STREAM_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(entries):
+    """Yield the entries as newline-delimited JSON chunks, one entry object per line"""
+    lines = []
+    size = 0
+    for entry in entries:
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= STREAM_CHUNK_BYTES:
+            yield ''.join(lines)
+            lines = []
+            size = 0
+    yield ''.join(lines)
@@ -0,0 +1,154 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'info').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # json | text
+# Fraction of per-line / per-attempt debug events kept when LOG_LEVEL=debug
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 0.01))
+# Records waiting for the writer thread; beyond this they are dropped rather than blocking OCR
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+ROOT_LOGGER = 'timeverify'
+
+# Request ID or job ID of the work the current thread is doing
+correlation_id = contextvars.ContextVar('correlation_id', default=None)
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def fields(**values):
+    """extra= for a log call, attaching structured fields to the record"""
+    return {'fields': values}
+
+
+def debug_sampled(logger, message, **values):
+    """High-volume debug event (one per parsed line, OCR attempt...), kept at LOG_SAMPLE_RATE.
+
+    Costs one level check when debug logging is off.
+    """
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < LOG_SAMPLE_RATE:
+        logger.debug(message, extra={'fields': dict(values, sampled=LOG_SAMPLE_RATE)})
+
+
+@contextmanager
+def correlation(value):
+    """Tag log records from this context with `value` (e.g. a job ID)"""
+    token = correlation_id.set(value)
+    try:
+        yield
+    finally:
+        correlation_id.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, correlation_id and any fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+        }
+        if getattr(record, 'correlation_id', None):
+            entry['correlation_id'] = record.correlation_id
+        entry.update(getattr(record, 'fields', None) or {})
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development (LOG_FORMAT=text)"""
+
+    def format(self, record):
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}"
+        if getattr(record, 'correlation_id', None):
+            line += f" [{record.correlation_id}]"
+        line += f" {record.getMessage()}"
+        values = getattr(record, 'fields', None)
+        if values:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in values.items())
+        return line
+
+
+class _CorrelationFilter(logging.Filter):
+    # Handler filters run in the thread that logged, before the record is queued
+    def filter(self, record):
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Hands records to the writer thread without ever blocking; counts what it had to drop"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_state = {'pid': None, 'listener': None, 'handler': None}
+
+
+def configure_logging():
+    """Route the app's loggers through a bounded queue to a background stdout writer.
+
+    Idempotent per process; a forked worker gets its own queue and writer thread.
+    """
+    if _state['pid'] == os.getpid():
+        return
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    handler = _DroppingQueueHandler(log_queue)
+    handler.addFilter(_CorrelationFilter())
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(TextFormatter() if LOG_FORMAT == 'text' else JsonFormatter())
+    listener = QueueListener(log_queue, output)
+    listener.start()
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.handlers = [handler]
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    _state.update(pid=os.getpid(), listener=listener, handler=handler)
+
+
+def logging_status():
+    handler = _state['handler']
+    return {
+        'level': logging.getLevelName(logging.getLogger(ROOT_LOGGER).level).lower(),
+        'format': LOG_FORMAT,
+        'sample_rate': LOG_SAMPLE_RATE,
+        'queued': handler.queue.qsize() if handler else 0,
+        'dropped': handler.dropped if handler else 0
+    }
+
+
+def _flush_on_exit():
+    if _state['pid'] == os.getpid() and _state['listener'] is not None:
+        _state['listener'].stop()
+
+
+def _reconfigure_after_fork():
+    # The writer thread does not survive fork(); give each gunicorn worker its own
+    if _state['pid'] is not None:
+        configure_logging()
+
+
+atexit.register(_flush_on_exit)
+os.register_at_fork(after_in_child=_reconfigure_after_fork)
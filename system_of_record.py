@@ -0,0 +1,295 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from metrics import cache_lookup
+from structured_logging import fields, get_logger
+
+log = get_logger('system_of_record')
+
+SYSTEM_OF_RECORD_URL = os.environ.get('SYSTEM_OF_RECORD_URL', '')
+SYSTEM_OF_RECORD_TIMEOUT = float(os.environ.get('SYSTEM_OF_RECORD_TIMEOUT', 5))
+SYSTEM_OF_RECORD_RETRIES = int(os.environ.get('SYSTEM_OF_RECORD_RETRIES', 3))
+SYSTEM_OF_RECORD_POOL_SIZE = int(os.environ.get('SYSTEM_OF_RECORD_POOL_SIZE', 20))
+SYSTEM_HOURS_CACHE_TTL = float(os.environ.get('SYSTEM_HOURS_CACHE_TTL', 900))
+SYSTEM_HOURS_BATCH_SIZE = int(os.environ.get('SYSTEM_HOURS_BATCH_SIZE', 25))
+SYSTEM_HOURS_BATCH_CONCURRENCY = int(os.environ.get('SYSTEM_HOURS_BATCH_CONCURRENCY', 4))
+# A partial chunk is sent this long after its first name arrives, so lookups overlap with the remaining OCR
+SYSTEM_HOURS_BATCH_DELAY = float(os.environ.get('SYSTEM_HOURS_BATCH_DELAY', 0.2))
+
+
+class SystemOfRecordError(Exception):
+    """Raised when the billing system can't be reached or returns an unusable response"""
+
+
+def normalize_consultant(consultant_name):
+    return consultant_name.lower().strip()
+
+
+# Entry dates are normalized to MM/DD/YYYY when parsed; dates OCR'd in other shapes are kept verbatim
+ENTRY_DATE_FORMATS = ('%m/%d/%Y', '%m/%d/%y', '%m-%d-%Y', '%m-%d-%y')
+
+
+def parse_entry_date(date_value):
+    """date of an MM/DD/YYYY (or MM/DD/YY, MM-DD-YYYY) entry date, or None if it doesn't parse"""
+    for date_format in ENTRY_DATE_FORMATS:
+        try:
+            return datetime.strptime(str(date_value), date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def iso_week(date_value):
+    """ISO week ('2024-W49') of an MM/DD/YYYY (or MM/DD/YY) entry date, or None if it doesn't parse"""
+    parsed = parse_entry_date(date_value)
+    if parsed is None:
+        return None
+    year, week, _ = parsed.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def timesheet_week(entries):
+    """ISO week most entries fall in, or None if no dates parse"""
+    weeks = Counter(iso_week(entry.get('Date', '')) for entry in entries)
+    weeks.pop(None, None)
+    return weeks.most_common(1)[0][0] if weeks else None
+
+
+class SystemHoursClient(ABC):
+    """Interface for looking up billed hours per consultant and ISO week"""
+
+    @abstractmethod
+    def get_hours(self, consultant_name, week=None):
+        """Billed hours, or None if the consultant is unknown"""
+
+    def get_hours_batch(self, consultant_names, week=None):
+        """{consultant_name: hours or None}; implementations may override with a single round-trip"""
+        return {name: self.get_hours(name, week) for name in consultant_names}
+
+    def status(self):
+        return {'client': type(self).__name__}
+
+
+class DemoSystemHoursClient(SystemHoursClient):
+    """Fixed demo data (used when SYSTEM_OF_RECORD_URL is not configured)"""
+
+    demo_data = {
+        'john smith': 38,
+        'jane doe': 40,
+        'mike johnson': 35,
+        'sarah wilson': 40,
+        'alex chen': 38
+    }
+
+    def get_hours(self, consultant_name, week=None):
+        return self.demo_data.get(normalize_consultant(consultant_name), 40)
+
+
+class HttpSystemHoursClient(SystemHoursClient):
+    """System-of-record client over HTTP with a pooled session, timeouts and retries.
+
+    Expects GET {base_url}/hours?consultant=<name>&week=<YYYY-Www> -> {"hours": 38}
+    (404 for unknown consultants) and POST {base_url}/hours/batch with
+    {"week": ..., "consultants": [...]} -> {"hours": {name: hours}}.
+    """
+
+    def __init__(self, base_url, timeout=None, retries=None, pool_size=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout or SYSTEM_OF_RECORD_TIMEOUT
+        pool_size = pool_size or SYSTEM_OF_RECORD_POOL_SIZE
+        retry = Retry(
+            total=SYSTEM_OF_RECORD_RETRIES if retries is None else retries,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=('GET', 'POST'),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._requests = requests
+
+    def get_hours(self, consultant_name, week=None):
+        params = {'consultant': consultant_name}
+        if week:
+            params['week'] = week
+        try:
+            response = self.session.get(f"{self.base_url}/hours", params=params, timeout=self.timeout)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json().get('hours')
+        except (self._requests.RequestException, ValueError) as e:
+            raise SystemOfRecordError(f"System hours lookup failed for {consultant_name}: {e}")
+
+    def get_hours_batch(self, consultant_names, week=None):
+        try:
+            response = self.session.post(
+                f"{self.base_url}/hours/batch",
+                json={'week': week, 'consultants': list(consultant_names)},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            hours = response.json().get('hours', {})
+        except (self._requests.RequestException, ValueError) as e:
+            raise SystemOfRecordError(f"Batched system hours lookup failed: {e}")
+        if not isinstance(hours, dict):
+            raise SystemOfRecordError(f"Batched system hours lookup returned {type(hours).__name__} hours")
+        return {name: hours.get(name) for name in consultant_names}
+
+    def status(self):
+        return {'client': type(self).__name__, 'base_url': self.base_url, 'timeout': self.timeout}
+
+
+class CachedSystemHoursClient(SystemHoursClient):
+    """TTL cache in front of another client, keyed by consultant and week"""
+
+    def __init__(self, client, ttl=None):
+        self.client = client
+        self.ttl = SYSTEM_HOURS_CACHE_TTL if ttl is None else ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_cached(self, key, now):
+        cached = self._cache.get(key)
+        hit = cached is not None and cached[1] > now
+        cache_lookup('system_hours', hit)
+        if hit:
+            self.hits += 1
+            return True, cached[0]
+        self.misses += 1
+        return False, None
+
+    def get_hours(self, consultant_name, week=None):
+        key = (normalize_consultant(consultant_name), week)
+        with self._lock:
+            found, hours = self._get_cached(key, time.monotonic())
+        if found:
+            return hours
+        hours = self.client.get_hours(consultant_name, week)
+        with self._lock:
+            self._cache[key] = (hours, time.monotonic() + self.ttl)
+        return hours
+
+    def get_hours_batch(self, consultant_names, week=None):
+        results = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for name in consultant_names:
+                found, hours = self._get_cached((normalize_consultant(name), week), now)
+                if found:
+                    results[name] = hours
+                else:
+                    missing.append(name)
+        if missing:
+            fetched = self.client.get_hours_batch(missing, week)
+            expires = time.monotonic() + self.ttl
+            with self._lock:
+                for name, hours in fetched.items():
+                    self._cache[(normalize_consultant(name), week)] = (hours, expires)
+            results.update(fetched)
+        return results
+
+    def status(self):
+        with self._lock:
+            entries = len(self._cache)
+        return dict(self.client.status(), cache_ttl=self.ttl, cache_entries=entries,
+                    cache_hits=self.hits, cache_misses=self.misses)
+
+
+class SystemHoursBatcher:
+    """Collects (consultant, week) lookups for a bulk job and resolves them in chunked concurrent batches.
+
+    Lookups are sent in the background as soon as a chunk fills up or
+    SYSTEM_HOURS_BATCH_DELAY after its first name arrives, whichever comes
+    first, so network latency overlaps with OCR of the remaining documents;
+    resolve() flushes the rest and waits for everything.
+    """
+
+    def __init__(self, client, chunk_size=None, max_concurrency=None, delay=None):
+        self.client = client
+        self.chunk_size = chunk_size or SYSTEM_HOURS_BATCH_SIZE
+        self.delay = SYSTEM_HOURS_BATCH_DELAY if delay is None else delay
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency or SYSTEM_HOURS_BATCH_CONCURRENCY, thread_name_prefix='system-hours'
+        )
+        self._lock = threading.Lock()
+        self._pending = {}   # week -> [consultant names]
+        self._timers = {}    # week -> Timer that flushes its partial chunk
+        self._requested = set()
+        self._batches = []   # (week, names, future)
+
+    def add(self, consultant_name, week):
+        key = (normalize_consultant(consultant_name), week)
+        with self._lock:
+            if key in self._requested:
+                return
+            self._requested.add(key)
+            names = self._pending.setdefault(week, [])
+            names.append(consultant_name)
+            if len(names) >= self.chunk_size:
+                self._flush(week)
+            elif week not in self._timers:
+                timer = threading.Timer(self.delay, self._flush_due, (week,))
+                timer.daemon = True
+                self._timers[week] = timer
+                timer.start()
+
+    def _flush_due(self, week):
+        with self._lock:
+            self._flush(week)
+
+    def _flush(self, week):
+        # Called with the lock held
+        timer = self._timers.pop(week, None)
+        if timer is not None:
+            timer.cancel()
+        names = self._pending.pop(week, [])
+        if names:
+            self._batches.append((week, names, self._executor.submit(self.client.get_hours_batch, names, week)))
+
+    def resolve(self):
+        """{(normalized consultant, week): hours or None} for every lookup added"""
+        hours = {}
+        try:
+            with self._lock:
+                for week in list(self._pending):
+                    self._flush(week)
+                batches = list(self._batches)
+            for week, names, future in batches:
+                try:
+                    batch = future.result()
+                except Exception as e:
+                    # Unreachable or malformed responses leave these consultants unchecked, not the job failed
+                    log.warning("System of record lookup failed", extra=fields(week=week, error=str(e)))
+                    batch = {}
+                for name in names:
+                    hours[(normalize_consultant(name), week)] = batch.get(name)
+        finally:
+            self._executor.shutdown(wait=False)
+        log.info("System hours fetched", extra=fields(lookups=len(hours), requests=len(batches)))
+        return hours
+
+
+def create_system_hours_client():
+    """HTTP client when SYSTEM_OF_RECORD_URL is set, demo data otherwise; always cached"""
+    if SYSTEM_OF_RECORD_URL:
+        log.info("Using system of record", extra=fields(url=SYSTEM_OF_RECORD_URL))
+        client = HttpSystemHoursClient(SYSTEM_OF_RECORD_URL)
+    else:
+        log.warning("SYSTEM_OF_RECORD_URL not set - using demo system hours")
+        client = DemoSystemHoursClient()
+    return CachedSystemHoursClient(client)
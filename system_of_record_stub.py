@@ -0,0 +1,97 @@
+"""Local stub of the billing system-of-record API, for tests and local development.
+
+    python system_of_record_stub.py --port 8099 --latency 0.05
+    SYSTEM_OF_RECORD_URL=http://localhost:8099 python app.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STUB_HOURS = {
+    'john smith': 38,
+    'jane doe': 40,
+    'mike johnson': 35,
+    'sarah wilson': 40,
+    'alex chen': 38
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    hours = STUB_HOURS
+    request_count = 0
+    # Answer this many requests with 503 before serving normally (exercises client retries)
+    fail_first = 0
+    _count_lock = threading.Lock()
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self):
+        """Count the request; returns False if it should fail with 503"""
+        with self._count_lock:
+            type(self).request_count += 1
+            failing = type(self).request_count <= self.fail_first
+        if self.latency:
+            time.sleep(self.latency)
+        return not failing
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/hours':
+            return self._send(404, {'error': 'not found'})
+        if not self._count():
+            return self._send(503, {'error': 'unavailable'})
+        consultant = parse_qs(url.query).get('consultant', [''])[0]
+        hours = self.hours.get(consultant.lower().strip())
+        if hours is None:
+            return self._send(404, {'error': f"unknown consultant {consultant}"})
+        self._send(200, {'consultant': consultant, 'hours': hours})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/hours/batch':
+            return self._send(404, {'error': 'not found'})
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self._count():
+            return self._send(503, {'error': 'unavailable'})
+        consultants = payload.get('consultants', [])
+        self._send(200, {
+            'week': payload.get('week'),
+            'hours': {name: self.hours.get(name.lower().strip()) for name in consultants}
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, latency=0.0, fail_first=0):
+    """Start the stub in a background thread; returns (server, base_url)
+
+    server.RequestHandlerClass.request_count counts the API requests served.
+    """
+    handler = type('ConfiguredStubHandler', (StubHandler,),
+                   {'latency': latency, 'request_count': 0, 'fail_first': fail_first})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='System-of-record stub server')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', type=float, default=0.0, help='artificial delay per request (seconds)')
+    args = parser.parse_args()
+    server, url = start_stub_server(args.port, args.latency)
+    print(f"🚀 System-of-record stub listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
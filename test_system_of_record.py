@@ -0,0 +1,121 @@
+"""System-of-record client tests against the local stub server (python -m pytest)"""
+import time
+
+import pytest
+
+from system_of_record import (CachedSystemHoursClient, HttpSystemHoursClient, SystemHoursBatcher,
+                              SystemHoursClient, SystemOfRecordError)
+from system_of_record_stub import start_stub_server
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**kwargs):
+        server, url = start_stub_server(**kwargs)
+        servers.append(server)
+        return server.RequestHandlerClass, url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_incomplete_client_fails_at_construction():
+    class NoLookups(SystemHoursClient):
+        pass
+
+    with pytest.raises(TypeError):
+        NoLookups()
+
+
+def test_get_hours_and_unknown_consultant(stub):
+    handler, url = stub()
+    client = HttpSystemHoursClient(url)
+    assert client.get_hours('John Smith', '2024-W03') == 38
+    assert client.get_hours('Nobody Known', '2024-W03') is None
+
+
+def test_batch_lookup_is_one_request(stub):
+    handler, url = stub()
+    client = HttpSystemHoursClient(url)
+    hours = client.get_hours_batch(['Jane Doe', 'Mike Johnson', 'Nobody Known'], '2024-W03')
+    assert hours == {'Jane Doe': 40, 'Mike Johnson': 35, 'Nobody Known': None}
+    assert handler.request_count == 1
+
+
+def test_timeout_raises_system_of_record_error(stub):
+    handler, url = stub(latency=0.5)
+    client = HttpSystemHoursClient(url, timeout=0.1, retries=0)
+    started = time.monotonic()
+    with pytest.raises(SystemOfRecordError):
+        client.get_hours('John Smith')
+    assert time.monotonic() - started < 0.5
+
+
+def test_retries_transient_failures(stub):
+    handler, url = stub(fail_first=2)
+    client = HttpSystemHoursClient(url, retries=2)
+    assert client.get_hours('John Smith') == 38
+    assert handler.request_count == 3
+
+
+def test_gives_up_after_retries(stub):
+    handler, url = stub(fail_first=5)
+    client = HttpSystemHoursClient(url, retries=1)
+    with pytest.raises(SystemOfRecordError):
+        client.get_hours_batch(['John Smith'])
+    assert handler.request_count == 2
+
+
+def test_ttl_cache_serves_repeats_until_expiry(stub):
+    handler, url = stub()
+    client = CachedSystemHoursClient(HttpSystemHoursClient(url), ttl=0.2)
+    assert client.get_hours('John Smith', '2024-W03') == 38
+    assert client.get_hours('john smith ', '2024-W03') == 38
+    assert handler.request_count == 1
+    assert (client.hits, client.misses) == (1, 1)
+
+    # A different week is a different key
+    client.get_hours('John Smith', '2024-W04')
+    assert handler.request_count == 2
+
+    time.sleep(0.25)
+    client.get_hours('John Smith', '2024-W03')
+    assert handler.request_count == 3
+
+
+def test_cached_batch_only_fetches_missing_names(stub):
+    handler, url = stub()
+    client = CachedSystemHoursClient(HttpSystemHoursClient(url))
+    client.get_hours('Jane Doe', '2024-W03')
+    hours = client.get_hours_batch(['Jane Doe', 'Alex Chen'], '2024-W03')
+    assert hours == {'Jane Doe': 40, 'Alex Chen': 38}
+    assert handler.request_count == 2
+    client.get_hours_batch(['Jane Doe', 'Alex Chen'], '2024-W03')
+    assert handler.request_count == 2
+
+
+def test_batcher_sends_partial_chunks_before_resolve(stub):
+    handler, url = stub()
+    batcher = SystemHoursBatcher(HttpSystemHoursClient(url), chunk_size=25, delay=0.05)
+    batcher.add('John Smith', '2024-W03')
+    batcher.add('Jane Doe', '2024-W03')
+    time.sleep(0.3)
+    assert handler.request_count == 1
+    batcher.add('Alex Chen', '2024-W03')
+    hours = batcher.resolve()
+    assert hours == {('john smith', '2024-W03'): 38, ('jane doe', '2024-W03'): 40, ('alex chen', '2024-W03'): 38}
+    assert handler.request_count == 2
+
+
+def test_batcher_survives_any_lookup_failure():
+    class Broken(SystemHoursClient):
+        def get_hours(self, consultant_name, week=None):
+            raise AttributeError("'list' object has no attribute 'get'")
+
+    batcher = SystemHoursBatcher(Broken(), delay=0)
+    batcher.add('John Smith', '2024-W03')
+    assert batcher.resolve() == {('john smith', '2024-W03'): None}
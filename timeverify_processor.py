@@ -158,16 +158,3 @@ class TimesheetProcessor:
                     entries.append(entry)
         
         return entries
-
-    def simulate_ibm_system_check(self, consultant_name):
-        """Simulate IBM system lookup for demo purposes"""
-        demo_data = {
-            'john smith': 38,   # Screenshot might show 40, system shows 38
-            'jane doe': 40,     # Perfect match
-            'mike johnson': 35, # Perfect match
-            'sarah wilson': 40, # Screenshot might show 42, system shows 40
-            'alex chen': 38     # Slight discrepancy
-        }
-        
-        name_key = consultant_name.lower().strip()
-        return demo_data.get(name_key, 40)  # Default to 40 if not found
\ No newline at end of file
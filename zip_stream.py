@@ -0,0 +1,123 @@
+import struct
+import zlib
+
+LOCAL_FILE_HEADER = b'PK\x03\x04'
+DATA_DESCRIPTOR = b'PK\x07\x08'
+# Any of these means every member has been read and the central directory follows
+CENTRAL_DIRECTORY_SIGNATURES = (b'PK\x01\x02', b'PK\x05\x06', b'PK\x06\x06', b'PK\x06\x07')
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ZipStreamError(Exception):
+    """Raised for archives that can't be read sequentially (corrupt, encrypted, unsupported)"""
+
+
+class _StreamBuffer:
+    """Read-exact helper over a file-like stream with push-back"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.pending = b''
+
+    def read_some(self, size=CHUNK_SIZE):
+        if self.pending:
+            data, self.pending = self.pending[:size], self.pending[size:]
+            return data
+        return self.stream.read(size)
+
+    def read_exact(self, size):
+        parts = []
+        remaining = size
+        while remaining > 0:
+            data = self.read_some(min(remaining, CHUNK_SIZE))
+            if not data:
+                raise ZipStreamError("Unexpected end of archive")
+            parts.append(data)
+            remaining -= len(data)
+        return b''.join(parts)
+
+    def push_back(self, data):
+        self.pending = data + self.pending
+
+
+def iter_zip_members(stream, max_member_size=50 * 1024 * 1024):
+    """Yield (name, bytes) for each file in a zip as soon as it has been read from `stream`.
+
+    Uses the local file headers, so the archive never has to be fully buffered.
+    Supports stored and deflated members, with or without data descriptors.
+    """
+    buf = _StreamBuffer(stream)
+    while True:
+        try:
+            signature = buf.read_exact(4)
+        except ZipStreamError:
+            return  # Truncated after the last member - nothing more to read
+        if signature in CENTRAL_DIRECTORY_SIGNATURES:
+            return
+        if signature != LOCAL_FILE_HEADER:
+            raise ZipStreamError("Not a zip archive (bad local file header)")
+
+        (_, flags, method, _, _, crc, compressed_size, size,
+         name_length, extra_length) = struct.unpack('<HHHHHIIIHH', buf.read_exact(26))
+        raw_name = buf.read_exact(name_length)
+        name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+        buf.read_exact(extra_length)
+
+        if flags & 0x1:
+            raise ZipStreamError(f"Encrypted member not supported: {name}")
+        has_descriptor = bool(flags & 0x8)
+        if compressed_size == 0xFFFFFFFF or size == 0xFFFFFFFF:
+            raise ZipStreamError(f"ZIP64 member not supported: {name}")
+
+        if method == 0:
+            if has_descriptor:
+                raise ZipStreamError(f"Stored member with unknown size not supported: {name}")
+            if size > max_member_size:
+                raise ZipStreamError(f"Member {name} exceeds {max_member_size:,} bytes")
+            data = buf.read_exact(compressed_size)
+        elif method == 8:
+            data = _inflate(buf, name, None if has_descriptor else compressed_size, max_member_size)
+        else:
+            raise ZipStreamError(f"Unsupported compression method {method} for {name}")
+
+        if has_descriptor:
+            descriptor = buf.read_exact(4)
+            if descriptor == DATA_DESCRIPTOR:
+                descriptor = buf.read_exact(4)
+            crc = struct.unpack('<I', descriptor)[0]
+            buf.read_exact(8)  # compressed and uncompressed sizes
+
+        if zlib.crc32(data) & 0xFFFFFFFF != crc:
+            raise ZipStreamError(f"CRC mismatch for {name}")
+
+        if name.endswith('/'):
+            continue  # Directory entry
+        yield name, data
+
+
+def _inflate(buf, name, compressed_size, max_member_size):
+    """Inflate one raw-deflate member; stops at the end of the deflate stream if size is unknown"""
+    decompressor = zlib.decompressobj(-15)
+    output = []
+    output_size = 0
+    remaining = compressed_size
+    while not decompressor.eof:
+        if remaining is not None and remaining <= 0:
+            break
+        chunk = buf.read_some(CHUNK_SIZE if remaining is None else min(remaining, CHUNK_SIZE))
+        if not chunk:
+            raise ZipStreamError(f"Unexpected end of archive in {name}")
+        if remaining is not None:
+            remaining -= len(chunk)
+        # Bound the output so a zip bomb is caught before it is fully inflated
+        data = decompressor.decompress(chunk, max_member_size + 1 - output_size)
+        output_size += len(data)
+        if output_size > max_member_size or decompressor.unconsumed_tail:
+            raise ZipStreamError(f"Member {name} exceeds {max_member_size:,} bytes when decompressed")
+        output.append(data)
+    if decompressor.unused_data:
+        buf.push_back(decompressor.unused_data)
+    if not decompressor.eof:
+        raise ZipStreamError(f"Truncated deflate data in {name}")
+    return b''.join(output)